@@ -1,616 +1,932 @@
+# pandas, streamlit_agraph and streamlit.components are imported where they
+# are used, so a new server process starts without loading them
 import streamlit as st
-import networkx as nx
-import pandas as pd
-from streamlit_agraph import agraph, Node, Edge, Config
-import heapq  # Imported at top level for better practice
+import numpy as np
+import json
+import os
+import threading
+import time
+import uuid
+import weakref
+
+from graph_engine import (
+    ALGORITHMS, INCREMENTAL_ALGOS, SHORTEST_PATH_ALGOS, CSRGraph, GraphAlgorithms, GraphBuilder, LazyTrace,
+    BoundedLRUCache, PerfLog, estimate_trace_bytes, estimate_tree_bytes, remap_tree, replay_log, start_algorithm,
+    update_steps
+)
+from graph_io import read_edge_list, read_edge_text
+from layout import estimate_layout_bytes, layout_positions
+from testcases import TESTCASES, generator_params, load_testcase, testcase_names
+from trace_format import CompactTrace, record_trace
 
 # --------------------------
-# 1. Testcase Definitions
+# 1. Rendering Helpers
 # --------------------------
-SCALE = 200 
-
-TESTCASES = {
-    "DFS/BFS: 3x3 Grid": {
-        "nodes": ["a", "b", "c", "d", "e", "f", "g", "h", "i"],
-        "edges": [
-            # แนวนอน
-            ("a", "b", 1), ("b", "c", 1),
-            ("h", "i", 1), ("i", "d", 1),
-            ("g", "f", 1), ("f", "e", 1),
-            # แนวตั้ง
-            ("a", "h", 1), ("h", "g", 1),
-            ("b", "i", 1), ("i", "f", 1),
-            ("c", "d", 1), ("d", "e", 1)
-        ],
-        "pos": {
-            # แถวบน
-            "a": (-2*SCALE, -2*SCALE), "b": (0, -2*SCALE), "c": (2*SCALE, -2*SCALE),
-            # แถวกลาง
-            "h": (-2*SCALE, 0),        "i": (0, 0),        "d": (2*SCALE, 0),
-            # แถวล่าง
-            "g": (-2*SCALE, 2*SCALE),  "f": (0, 2*SCALE),  "e": (2*SCALE, 2*SCALE)
-        }
-    },
-    "DFS/BFS: Hexagon/Grid": {
-        "nodes": ["a", "b", "c", "d", "e", "f", "g"],
-        "edges": [
-            ("a", "b", 1), ("a", "f", 1),
-            ("b", "c", 1), ("b", "g", 1), ("b", "f", 1),
-            ("c", "d", 1), ("c", "g", 1), ("c", "e", 1),
-            ("d", "e", 1),
-            ("e", "f", 1), ("e", "g", 1),
-            ("f", "g", 1)
-        ],
-        "pos": {
-            "a": (-2*SCALE, 0), "b": (-1*SCALE, -1*SCALE), "f": (-1*SCALE, 1*SCALE),
-            "g": (0, 0),
-            "c": (1*SCALE, -1*SCALE), "e": (1*SCALE, 1*SCALE), "d": (2*SCALE, 0)
-        }
-    },
-    "DFS/BFS: Pentagon Star": {
-        "nodes": ["A", "B", "C", "D", "E"],
-        "edges": [
-            ("A", "B", 1), ("A", "C", 1), ("A", "D", 1), ("A", "E", 1),
-            ("B", "C", 1), ("B", "D", 1), ("B", "E", 1),
-            ("C", "D", 1), ("C", "E", 1),
-            ("D", "E", 1)
-        ],
-        "pos": {
-            "A": (0, -2*SCALE), "B": (1.9*SCALE, -0.6*SCALE), "C": (1.2*SCALE, 1.5*SCALE),
-            "D": (-1.2*SCALE, 1.5*SCALE), "E": (-1.9*SCALE, -0.6*SCALE)
-        }
-    },
-    "DFS/BFS: Composite (Square + Rect)": {
-        "nodes": ["a", "b", "c", "d", "e", "f", "g", "h", "i", "j", "k"],
-        "edges": [
-            ("a", "b", 1), ("b", "c", 1), ("c", "d", 1), ("d", "a", 1), ("b", "d", 1), 
-            ("c", "e", 1), ("c", "g", 1), ("e", "f", 1), ("f", "g", 1), ("e", "g", 1), 
-            ("g", "j", 1), ("j", "i", 1), ("i", "h", 1), ("h", "g", 1), 
-            ("g", "k", 1), ("j", "k", 1), ("i", "k", 1), ("h", "k", 1)  
-        ],
-        "pos": {
-            "a": (-3*SCALE, -1*SCALE), "b": (-1*SCALE, -1*SCALE), 
-            "d": (-3*SCALE, 1*SCALE), "c": (-1*SCALE, 1*SCALE),
-            "e": (-1*SCALE, 3*SCALE), "f": (1*SCALE, 3*SCALE), "g": (1*SCALE, 1*SCALE),
-            "j": (1*SCALE, -1*SCALE), "i": (3*SCALE, -1*SCALE), "h": (3*SCALE, 1*SCALE),
-            "k": (2*SCALE, 0)
-        }
-    },
-      "DFS/BFS: Start A to K": {
-        "nodes": ["A", "B", "C", "D", "E", "F", "G", "H", "I", "J", "K"],
-        "edges": [
-            # --- แก้ไขเส้นเชื่อมให้ตรงภาพซ้ายเป๊ะๆ ---
-            ("A", "B", 3), ("A", "C", 4), ("A", "F", 5), # A ไป F (ไม่ใช่ D)
-            
-            ("B", "D", 6), ("B", "J", 8),
-            ("C", "F", 3),
-            
-            ("D", "E", 3), ("D", "G", 5), ("D", "H", 6),
-            ("E", "G", 4),
-            
-            ("F", "H", 8), ("F", "K", 7),
-            
-            ("G", "J", 8), ("G", "I", 2),
-            ("H", "I", 7),
-            
-            ("I", "J", 6),
-            ("J", "K", 8)
-        ],
-        "pos": {
-            # ยอด A (กลางบน)
-            "A": (0.5*SCALE, -3.0*SCALE),
-            
-            # ปีกซ้าย (B และ J เฉียงออกไปทางซ้าย)
-            "B": (-2.5*SCALE, -1.5*SCALE), 
-            "J": (-2.8*SCALE, 3.0*SCALE),
-            
-            # ปีกขวา (C, F, K เฉียงออกไปทางขวา)
-            "C": (3.0*SCALE, -1.5*SCALE),
-            "F": (3.5*SCALE, 0.5*SCALE),   # F ขยับออกขวาให้เส้น A->F เฉียงสวยๆ
-            "K": (3.5*SCALE, 3.0*SCALE),
-            
-            # โซนกลาง (D, E)
-            "D": (0.2*SCALE, -0.5*SCALE),  # D อยู่ต่ำกว่า B นิดหน่อย
-            "E": (-1.5*SCALE, 0.2*SCALE),  # E อยู่ซ้าย D
-            
-            # โซนล่างใน (G, H, I)
-            "G": (-0.8*SCALE, 1.8*SCALE),  # G อยู่ระหว่าง E กับ I
-            "H": (1.8*SCALE, 1.5*SCALE),   # H อยู่ขวา
-            "I": (0.8*SCALE, 2.5*SCALE)    # I อยู่เหนือเส้น J-K นิดนึง
-        }
-    },
-    "Dijkstra: Start a to e": {
-        "nodes": ["a", "b", "c", "d", "e"],
-        "edges": [
-            ("a", "b", 4), ("a", "c", 2),
-            ("b", "c", 1), ("b", "d", 5),
-            ("c", "d", 8), ("c", "e", 10),
-            ("d", "e", 2)
-        ],
-        "pos": {
-            "a": (-2*SCALE, 0),
-            "b": (0, 1*SCALE), "c": (0, -1*SCALE),
-            "d": (2*SCALE, 1*SCALE), "e": (2*SCALE, -1*SCALE)
-        }
-    },
-    "Dijkstra: Start a to d": {
-        "nodes": ["a", "b", "c", "d", "e"],
-        "edges": [
-            ("a", "b", 6), ("a", "c", 7), ("a", "e", 5),
-            ("b", "c", 2),
-            ("c", "e", 1), ("c", "d", 3),
-            ("e", "d", 2)
-        ],
-        "pos": {
-            "b": (0, -2.5*SCALE),          
-            "a": (-2.5*SCALE, 0),          
-            "c": (2.5*SCALE, 0),           
-            "e": (-1.5*SCALE, 2.5*SCALE),  
-            "d": (1.5*SCALE, 2.5*SCALE)    
-        }
-    },
-    "Dijkstra: Start a to f": {
-        "nodes": ["a", "b", "c", "d", "e", "f"],
-        "edges": [
-            ("a", "b", 10), ("a", "c", 5),
-            ("b", "c", 3), ("b", "d", 2),
-            ("c", "e", 9),
-            ("d", "e", 4), ("d", "f", 6),
-            ("e", "f", 7)
-        ],
-        "pos": {
-            "a": (-3*SCALE, 0),            
-            "b": (-1*SCALE, -2*SCALE),     
-            "c": (-1*SCALE, 2*SCALE),      
-            "d": (1*SCALE, -0.5*SCALE),    
-            "f": (3*SCALE, -0.5*SCALE),    
-            "e": (3*SCALE, 2*SCALE)        
-        }
-    },
-    "Dijkstra: Weighted Shortest Path": {
-        "nodes": ["S", "A", "B", "C", "D", "E", "F", "T"],
-        "edges": [
-            ("S", "A", 2), ("S", "B", 5), ("S", "C", 3),
-            ("A", "B", 2), ("A", "D", 6),
-            ("B", "D", 3), ("B", "E", 3), ("B", "C", 2), ("B", "F", 6),
-            ("C", "F", 7),
-            ("D", "E", 3), ("D", "T", 6),
-            ("E", "F", 3), ("E", "T", 2),
-            ("F", "T", 4)
-        ],
-        "pos": {
-            "S": (-3*SCALE, 0),
-            "A": (-1*SCALE, -2*SCALE), "B": (-1*SCALE, 0), "C": (-1*SCALE, 2*SCALE),
-            "D": (1*SCALE, -2*SCALE), "E": (1*SCALE, 0), "F": (1*SCALE, 2*SCALE),
-            "T": (3*SCALE, 0)
-        }
-    },
-    "MST: Hexagon & Center": {
-        "nodes": ["a", "b", "c", "d", "e", "f", "g"],
-        "edges": [
-            # รอบนอก
-            ("a", "b", 2), ("b", "c", 3), ("c", "d", 5),
-            ("d", "e", 4), ("e", "f", 2), ("f", "a", 3),
-            # เส้นผ่าศูนย์กลางแนวตั้ง
-            ("b", "f", 4), ("c", "e", 3),
-            # จุดศูนย์กลาง g
-            ("g", "b", 3), ("g", "c", 4), ("g", "e", 3), ("g", "f", 5)
-        ],
-        "pos": {
-            "g": (0, 0),                # กลาง
-            "a": (-3*SCALE, 0),         # ซ้ายสุด
-            "d": (3*SCALE, 0),          # ขวาสุด
-            "b": (-1.5*SCALE, -2*SCALE), # บนซ้าย
-            "c": (1.5*SCALE, -2*SCALE),  # บนขวา
-            "f": (-1.5*SCALE, 2*SCALE),  # ล่างซ้าย
-            "e": (1.5*SCALE, 2*SCALE)    # ล่างขวา
-        }
-    },
-    "MST: Pentagon Star": {
-        "nodes": ["a", "b", "c", "d", "e"],
-        "edges": [
-            # รอบนอก
-            ("a", "b", 3), ("b", "c", 5), ("c", "d", 5),
-            ("d", "e", 6), ("e", "a", 4),
-            # ดาวภายใน (Star)
-            ("b", "e", 8), ("b", "d", 11),
-            ("c", "a", 4), ("c", "e", 8),
-            ("d", "a", 9)
-        ],
-        "pos": {
-            # c: ยอดบนสุด (ในรูปเขียน b แต่แก้เป็น c)
-            "c": (0, -2.5*SCALE),           
-            
-            # b: ปีกซ้าย
-            "b": (-2.5*SCALE, -0.8*SCALE), 
-            
-            # d: ปีกขวา
-            "d": (2.5*SCALE, -0.8*SCALE),   
-            
-            # a: ล่างซ้าย
-            "a": (-1.5*SCALE, 2.5*SCALE),   
-            
-            # e: ล่างขวา
-            "e": (1.5*SCALE, 2.5*SCALE)     
-        }
-    },
-    "MST: Rectangle & Cross": {
-        "nodes": ["a", "b", "c", "d", "e"], # d คือ D ในรูป
-        "edges": [
-            # กรอบสี่เหลี่ยม
-            ("a", "b", 1), # บน
-            ("b", "c", 2), # ขวา
-            ("c", "d", 3), # ล่าง
-            ("d", "a", 2), # ซ้าย
-            # เส้นทแยงมุมเข้าหา e
-            ("a", "e", 3), 
-            ("b", "e", 2),
-            ("c", "e", 4),
-            ("d", "e", 1)
-        ],
-        "pos": {
-            "e": (0, 0),               # e: จุดกึ่งกลาง
-            
-            "a": (-2*SCALE, -1.5*SCALE), # a: บนซ้าย
-            "b": (2*SCALE, -1.5*SCALE),  # b: บนขวา
-            
-            "d": (-2*SCALE, 1.5*SCALE),  # D: ล่างซ้าย
-            "c": (2*SCALE, 1.5*SCALE)    # c: ล่างขวา
-        }
-    },
-    "MST: House Shape": {
-        "nodes": ["a", "b", "c", "d", "e"],
-        "edges": [
-            # หลังคา
-            ("a", "b", 1), ("a", "e", 2),
-            # คานขวาง
-            ("b", "e", 3),
-            # กำแพง/พื้น
-            ("b", "c", 3), ("c", "d", 3), ("d", "e", 1),
-            # เส้นกากบาทภายใน
-            ("b", "d", 4), 
-            ("c", "e", 2)
-        ],
-        "pos": {
-            "a": (0, -3*SCALE),          # a: ยอดหลังคา
-            
-            "b": (-2*SCALE, -1*SCALE),   # b: มุมหลังคาซ้าย
-            "e": (2*SCALE, -1*SCALE),    # e: มุมหลังคาขวา
-            
-            "c": (-2*SCALE, 2*SCALE),    # c: ฐานซ้าย
-            "d": (2*SCALE, 2*SCALE)      # d: ฐานขวา
-        }
-    },
-    "MST: Complex Bridge": {
-        "nodes": ["L", "A1", "A2", "A3", "B1", "B2", "B3", "C1", "C2", "C3", "R"],
-        "edges": [
-            # --- ซ้ายสุด (L) ---
-            ("L", "A1", 1), ("L", "A2", 2), ("L", "A3", 3),
-
-            # --- แถวตั้ง 1 (A) ---
-            ("A1", "A2", 3), ("A2", "A3", 5),
-
-            # --- เชื่อม A ไป B ---
-            ("A1", "B1", 4), # บน-บน
-            ("A2", "B2", 2), # กลาง-กลาง
-            ("A3", "B3", 5), # ล่าง-ล่าง
-            ("A1", "B2", 5), # ทแยงลง (บนไปกลาง)
-            ("A3", "B2", 4), # ทแยงขึ้น (ล่างไปกลาง)
-
-            # --- แถวตั้ง 2 (B) ---
-            ("B1", "B2", 3), ("B2", "B3", 3),
-
-            # --- เชื่อม B ไป C ---
-            ("B1", "C1", 4), # บน-บน
-            ("B2", "C2", 3), # กลาง-กลาง
-            ("B3", "C3", 4), # ล่าง-ล่าง
-            ("B2", "C1", 2), # ทแยงลง (บนไปกลาง)
-            
-            # >>> บรรทัดนี้ครับที่น่าจะหายไปในรอบก่อน <<<
-            ("B2", "C3", 2), # ทแยงลง (กลางไปล่าง) 
-            # >>>>>>>>>>>>>>>><<<<<<<<<<<<<<<<<
 
-            # --- แถวตั้ง 3 (C) ---
-            ("C1", "C2", 5), ("C2", "C3", 4),
+# With more drawn elements than this the view counts as "zoomed out":
+# edge weight labels / node names are dropped (names stay as hover titles)
+EDGE_LABEL_MAX = 300
+NODE_LABEL_MAX = 500
 
-            # --- ขวาสุด (R) ---
-            ("C1", "R", 4), ("C2", "R", 3), ("C3", "R", 4)
-        ],
-        "pos": {
-            # ใช้สเกลกว้าง เพื่อให้เห็นเส้นชัดเจน
-            "L": (-4.5*SCALE, 0),
+class AgraphRenderer:
+    # agraph Node/Edge objects for one graph. The static part (ids, labels,
+    # positions, weights) is built once; after that only colors and widths
+    # are rewritten, and sync() touches just the nodes/edges whose highlight
+    # state changed since the previous step.
+    def __init__(self, G, pos_fixed=None):
+        from streamlit_agraph import Node, Edge
+        self.labels = G.labels
+        self.node_index = G.index
+        node_labels = G.number_of_nodes() <= NODE_LABEL_MAX
+        edge_labels = G.number_of_edges() <= EDGE_LABEL_MAX
+        self.nodes = []
+        for n in G.labels:
+            x, y = 0, 0
+            if pos_fixed and n in pos_fixed:
+                x, y = pos_fixed[n]
+            self.nodes.append(Node(
+                id=n, 
+                label=str(n) if node_labels else "", 
+                title=str(n),
+                shape="circle" if node_labels else "dot",
+                size=25 if node_labels else 8, 
+                color="#FFFFFF",
+                font={'color': "black"},
+                x=x, y=y,
+                fixed=True if pos_fixed else False
+            ))
 
-            "A1": (-2.5*SCALE, -1.5*SCALE), "A2": (-2.5*SCALE, 0), "A3": (-2.5*SCALE, 1.5*SCALE),
+        # (u, v) and (v, u) both map to the edge's index: one lookup per edge
+        self.edge_ends = []
+        self.edge_index = {}
+        self.edges = []
+        for k, (u, v, w) in enumerate(G.edges()):
+            self.edge_ends.append((u, v))
+            self.edge_index[(u, v)] = k
+            self.edge_index[(v, u)] = k
+            self.edges.append(Edge(
+                source=u, 
+                target=v, 
+                color="#CCCCCC",
+                width=2,
+                **({"label": str(w)} if edge_labels else {})
+            ))
 
-            "B1": (0, -1.5*SCALE),          "B2": (0, 0),          "B3": (0, 1.5*SCALE),
+        self._replay = None  # weakref to the StepReplayer last synced with
+        self._log_pos = 0
+        self._current = None
+        self._check = None
 
-            "C1": (2.5*SCALE, -1.5*SCALE),  "C2": (2.5*SCALE, 0),  "C3": (2.5*SCALE, 1.5*SCALE),
+    def _paint_node(self, i, highlighted, current):
+        node = self.nodes[i]
+        if current:
+            node.color = "#FFA500"  # Orange
+            node.font = {'color': "white"}
+        elif highlighted:
+            node.color = "#006400"  # Dark Green
+            node.font = {'color': "white"}
+        else:
+            node.color = "#FFFFFF"
+            node.font = {'color': "black"}
 
-            "R": (4.5*SCALE, 0)
-        }
-    }
-}
+    def _paint_edge(self, k, highlighted):
+        edge = self.edges[k]
+        if highlighted:
+            edge.color = "#228B22"  # Green
+            edge.width = 4
+        else:
+            edge.color = "#CCCCCC"
+            edge.width = 2
 
+    def paint(self, highlight_nodes=(), highlight_edges=(), current_node=None):
+        # Full repaint from explicit highlight sets: O(nodes + edges)
+        for i, n in enumerate(self.labels):
+            self._paint_node(i, n in highlight_nodes, n == current_node)
+        lit = {self.edge_index[e] for e in highlight_edges if e in self.edge_index}
+        for k in range(len(self.edges)):
+            self._paint_edge(k, k in lit)
+        self._replay = None
+        return self.nodes, self.edges
+
+    def sync(self, replay):
+        # Bring colors in line with a StepReplayer. The first call for a
+        # replayer (or a jump over more log entries than there are nodes and
+        # edges) repaints everything; later calls only repaint the nodes and
+        # edges named in its change log since the last sync, plus the old/new
+        # current node and check edge. Only a weak reference to the replayer
+        # is kept, so a renderer never holds an evicted trace.
+        if self._replay is None or replay is not self._replay() or abs(replay.log_position - self._log_pos) > len(self.nodes) + len(self.edges):
+            self.paint(replay.highlight_nodes, replay.highlight_edges, replay.current_node)
+        else:
+            touched_nodes = {self._current, replay.current_node}
+            touched_edges = {self._check, replay.check_edge}
+            for _, kind, item, _, _ in replay.changes_between(self._log_pos, replay.log_position):
+                if kind == "n":
+                    touched_nodes.add(item)
+                elif kind == "e":
+                    touched_edges.add(item)
+            for n in touched_nodes:
+                if n in self.node_index:
+                    self._paint_node(self.node_index[n], n in replay.highlight_nodes, n == replay.current_node)
+            for e in touched_edges:
+                k = self.edge_index.get(e)
+                if k is not None:
+                    u, v = self.edge_ends[k]
+                    self._paint_edge(k, (u, v) in replay.trail_edges or (v, u) in replay.trail_edges
+                                     or replay.check_edge in ((u, v), (v, u)))
+        self._replay = weakref.ref(replay)
+        self._log_pos = replay.log_position
+        self._current = replay.current_node
+        self._check = replay.check_edge
+        return self.nodes, self.edges
+
+def convert_to_agraph(G, highlight_nodes=None, highlight_edges=None, current_node=None, pos_fixed=None):
+    # One-off conversion; the app keeps an AgraphRenderer per graph instead
+    renderer = AgraphRenderer(G, pos_fixed)
+    return renderer.paint(highlight_nodes or set(), highlight_edges or set(), current_node)
 
 # --------------------------
-# 2. Helper Classes & Functions
+# 2. Main Streamlit App
 # --------------------------
 
-class GraphAlgorithms:
-    def __init__(self, G):
-        self.G = G
+TRACE_CACHE_MAX_BYTES = 512 * 1024 * 1024
 
-    def get_dfs_steps(self, start_node):
-        steps = []
-        visited = set()
-        traversal_order = [] 
-        def dfs(u):
-            visited.add(u) #  ประทับตราว่า "ถึงโหนด u แล้วนะ" ลงในสมุดบันทึก visited
-            traversal_order.append(u) #  เพิ่ม u เข้าไปในลิสต์สรุปผล
-            steps.append(("node", u, f"Visit Node {u}")) 
-            for v in self.G.neighbors(u): #  Loop เพื่อนบ้าน: วนลูปเช็กเพื่อนบ้าน (v) ทุกคนที่เชื่อมกับ u
-                if v not in visited: #  ถ้าเพื่อนคนนี้ (v) ยังไม่เคยไปหา (ไม่อยู่ใน visited)
-                    steps.append(("edge", (u, v), f"Explore Edge {u}-{v}")) #  บันทึก Step: บอกระบบกราฟว่า "กำลังจะวิ่งผ่านเส้น u->v" (เส้นจะไฮไลต์)
-                    dfs(v) # เรียกฟังก์ชัน dfs(v) ซ้ำ! (กระโดดไปที่ v แล้วทำข้อ 4 ใหม่)
-        if start_node: #  เริ่มต้นกระบวนการทั้งหมด โดยเรียก dfs ใส่จุดเริ่มต้นเข้าไป
-            dfs(start_node)
-        return steps, traversal_order 
-
-    def get_bfs_steps(self, start_node):
-        steps = []
-        visited = set()
-        traversal_order = []
-        queue = [start_node] #สร้างคิว และใส่จุดเริ่มต้นเข้าไปเป็นคนแรก
-        visited.add(start_node) # ประทับตราทันทีว่าจุดเริ่มต้น "จองแล้ว" (กันคนอื่นใส่ซ้ำเข้าคิว)
-        steps.append(("node", start_node, f"Start at {start_node}")) 
-        
-        while queue: #วนลูป "ตราบใดที่ในคิวยังมีโหนดเหลืออยู่" (ถ้าคิวว่างคือจบ)
-            u = queue.pop(0) #  ดึงโหนด "คนแรกสุด" ออกจากคิว (First-In, First-Out) มาเป็น u
-            traversal_order.append(u) #  บันทึกว่าเรา process โหนด u แล้ว
-            for v in self.G.neighbors(u): # Loop เพื่อนบ้าน: ดูเพื่อน (v) ทุกคนของ u
-                if v not in visited: #  ถ้าเพื่อนคนนี้ (v) ยังไม่เคยถูกจอง (ไม่อยู่ใน visited)
-                    visited.add(v) # (Mark visited) เพื่อไม่ให้โหนดอื่นใส่ v เข้าคิวซ้ำ
-                    steps.append(("edge", (u, v), f"Discover Edge {u}-{v}")) 
-                    steps.append(("node", v, f"Visit Node {v}")) 
-                    queue.append(v) # 15. เอา v ไปต่อท้ายแถวในคิว (รอรอบถัดไป)
-        return steps, traversal_order
-
-    def get_dijkstra_steps(self, start, end):
-        # Dijkstra implementation that logs steps for visualization
-        steps = []
-        pq = [(0, start)]
-        distances = {node: float('inf') for node in self.G.nodes()}
-        distances[start] = 0
-        visited = set()
-        prev = {node: None for node in self.G.nodes()}
-        
-        steps.append(("node", start, f"Start at {start}, Dist: 0", distances.copy()))
-        
-        while pq:
-            d, u = heapq.heappop(pq)
-            
-            if u in visited:
-                continue
-            visited.add(u)
-            steps.append(("current", u, f"Processing Node {u} (Dist: {d})", distances.copy()))
-            
-            if u == end:
-                steps.append(("finished", u, f"Reached Target {u}!", distances.copy()))
-                break
-            
-            for v in self.G.neighbors(u):
-                weight = self.G[u][v]['weight']
-                steps.append(("check_edge", (u, v), f"Check neighbor {v} via {u} (Weight: {weight})", distances.copy()))
-                
-                if distances[u] + weight < distances[v]:
-                    distances[v] = distances[u] + weight
-                    prev[v] = u
-                    heapq.heappush(pq, (distances[v], v))
-                    steps.append(("update", v, f"Update {v} Distance: {distances[v]}", distances.copy()))
-        
-        # --- Reconstruct Shortest Path ---
-        path_nodes = []
-        if distances[end] != float('inf'):
-            cur = end
-            while cur is not None:
-                path_nodes.append(cur)
-                if cur == start:
-                    break
-                cur = prev[cur]
-            path_nodes.reverse()
-            
-            if path_nodes and path_nodes[0] == start:
-                for i in range(len(path_nodes) - 1):
-                    u = path_nodes[i]
-                    v = path_nodes[i + 1]
-                    steps.append((
-                        "edge",
-                        (u, v),
-                        f"Shortest Path Edge: {u}-{v}",
-                        distances.copy()
-                    ))
-                for n in path_nodes:
-                    steps.append((
-                        "node",
-                        n,
-                        f"On Shortest Path: {n}",
-                        distances.copy()
-                    ))
-        
-        return steps, distances[end], path_nodes
+@st.cache_resource
+def get_trace_cache():
+    # One trace cache per server process, shared by every session.
+    # Keys are (graph fingerprint, algorithm, start node, end node) and
+    # values are LazyTrace objects.
+    return BoundedLRUCache(TRACE_CACHE_MAX_BYTES, estimate_trace_bytes)
 
-    def get_mst_steps(self, algo="kruskal", start_node=None):
-        steps = []
-        mst_edges = []
-        
-        if algo == "kruskal":
-            edges = sorted(self.G.edges(data=True), key=lambda x: x[2]['weight']) #นำทุกเส้นมาเรียงจากน้อยไปมาก
-            parent = {n: n for n in self.G.nodes()} #การกำหนดค่าเริ่มต้นให้แต่ละโหนดเป็นเซตอิสระ
-            def find(n): #หาว่าอยู่กลุ่มไหน
-                if parent[n] != n: #ถ้าชื่อรากไม่ใช่ชื่อตัวเองตัวแสดงว่าเคยถูกเชื่อมแล้ว
-                    parent[n] = find(parent[n]) #หาตัวราก
-                return parent[n] #ส่งค่ารากหรือตัวแรกกลับ
-            def union(n1, n2):  
-                root1, root2 = find(n1), find(n2)
-                if root1 != root2: #ถ้ารากของ n1 กับ n2 ไม่เหมือนกันเชื่อมกันได้
-                    parent[root1] = root2
-                    return True
-                return False 
-            
-            mst_weight = 0
-            for u, v, d in edges:
-                w = d['weight']
-                steps.append(("check_edge", (u, v), f"Checking Edge {u}-{v} (W: {w})")) ##visual
-                if union(u, v):
-                    mst_weight += w #บวกน้ำหนัก
-                    mst_edges.append((u, v, w)) #เส้นที่ถูกเลือกจริง
-                    steps.append(("add_edge", (u, v), f"Added Edge {u}-{v} to MST")) #visual
-                    steps.append(("node", u, ""))
-                    steps.append(("node", v, ""))
-                else:
-                    steps.append(("skip", (u, v), f"Skipped {u}-{v} (Cycle detected)")) #visual
-            return steps, mst_weight, mst_edges
-            
-        elif algo == "prim":
-            # Manual Prim Implementation for Step Visualization
-            if not start_node: #ถ้าไม่ได้เลือกโหนด strat ให้เลือกตัวแรก
-                if self.G.number_of_nodes() > 0:
-                    start_node = list(self.G.nodes())[0]
-                else:
-                    return [], 0, []
+SPT_CACHE_MAX_BYTES = 128 * 1024 * 1024
 
-            visited = {start_node} #เอาstart โหนดเข้า visted 
-            steps.append(("node", start_node, f"Start Prim at {start_node}")) # visual
-            
-            # PQ stores (weight, u, v) where u is in MST, v is candidate
-            pq = [] #เก็บเส้นที่รอดำเนินการ
-            for v in self.G.neighbors(start_node): #วนลูปดูโหนดที่เชื่อมกับ startโหนด
-                w = self.G[start_node][v]['weight'] #ดึงค่าน้ำหนัดที่เส้นเชื่อมนั้น
-                heapq.heappush(pq, (w, start_node, v))#เอาเข้า pq เรียงโดยดุจาก w ที่น้อยที่สุด
-                steps.append(("check_edge", (start_node, v), f"Add potential edge {start_node}-{v} (W: {w})")) #บันทึกประวัติการเพิ่มเส้นเชื่อมทางเลือก visual
-            
-            mst_weight = 0
-            
-            while pq and len(visited) < self.G.number_of_nodes():
-                w, u, v = heapq.heappop(pq)
-                
-                if v in visited:
-                    # Edge goes to already visited node -> Skip (Cycle)
-                    continue
-                
-                # Add v to MST
-                visited.add(v)
-                mst_weight += w
-                mst_edges.append((u, v, w))
-                
-                steps.append(("add_edge", (u, v), f"Select Edge {u}-{v} (W: {w})"))
-                steps.append(("node", v, f"Visit Node {v}"))
-                
-                # Add neighbors of v to PQ
-                for neighbor in self.G.neighbors(v):
-                    if neighbor not in visited:
-                        new_w = self.G[v][neighbor]['weight']
-                        heapq.heappush(pq, (new_w, v, neighbor))
-                        steps.append(("check_edge", (v, neighbor), f"Add potential edge {v}-{neighbor} (W: {new_w})"))
-            
-            return steps, mst_weight, mst_edges
+@st.cache_resource
+def get_spt_cache():
+    # Shortest-path trees keyed by (graph fingerprint, start node), shared by
+    # every session, so a new End Node only needs the path walk.
+    return BoundedLRUCache(SPT_CACHE_MAX_BYTES, estimate_tree_bytes)
 
-def convert_to_agraph(G, highlight_nodes=None, highlight_edges=None, current_node=None, pos_fixed=None):
-    if highlight_nodes is None:
-        highlight_nodes = set()
-    if highlight_edges is None:
-        highlight_edges = set()
+def load_shortest_path_tree(G, start_node, spt_cache=None):
+    # spt_cache: pass the cache in when calling from a background thread
+    if spt_cache is None:
+        spt_cache = get_spt_cache()
+    key = (G.fingerprint(), start_node)
+    tree = spt_cache.get(key)
+    if tree is None:
+        tree = GraphAlgorithms(G).shortest_path_tree(start_node)
+        spt_cache.put(key, tree)
+    return tree
+
+def get_or_start_trace(G, key):
+    # Shared trace for key = (fingerprint, algorithm, start, end). A new trace
+    # is filled on a background thread; the cache re-measures it once complete.
+    trace_cache = get_trace_cache()
+    trace = trace_cache.get(key)
+    if trace is None:
+        trace = start_algorithm(G, *key[1:], load_tree=load_shortest_path_tree)
+        trace_cache.put(key, trace)
+        trace.start_background_fill(on_complete=lambda: trace_cache.refresh(key))
+    return trace
+
+def load_session_trace(G):
+    # The session only holds the trace key; the steps live in the shared cache.
+    # An evicted trace is recomputed if the graph is unchanged, else dropped.
+    # Incremental update traces and imported traces are held by the session
+    # itself ("local_trace"), so other sessions never get them from the cache.
+    key = st.session_state["trace_key"]
+    if key is None:
+        return None
+    local = st.session_state.get("local_trace")
+    if local is not None and local[0] == key:
+        trace = local[1]
+    else:
+        trace = get_trace_cache().get(key)
+    if trace is None and key[0] == G.fingerprint():
+        trace = get_or_start_trace(G, key)
+    if trace is None:
+        st.session_state["trace_key"] = None
+        st.session_state["step_idx"] = -1
+        return None
+    return trace
+
+def session_replayer(trace, pane="main"):
+    # This session's StepReplayer on a trace. It is kept by the trace's shared
+    # ReplayLog (a cursor), not by the session, which only stores its id:
+    # replay state never keeps an evicted trace alive.
+    if "replay_owner" not in st.session_state:
+        st.session_state["replay_owner"] = uuid.uuid4().hex
+    return replay_log(trace).cursor((st.session_state["replay_owner"], pane))
+
+def seek_replayer(key, replay, idx):
+    # Move a replayer to step idx. When that records new steps into the
+    # trace's replay log, the shared cache re-measures the trace.
+    recorded = len(replay.log)
+    replay.seek(idx)
+    if len(replay.log) > recorded:
+        get_trace_cache().refresh(key)
+
+def record_edit(G, edit):
+    # Called before an edge edit (u, v, w, old_w) is applied to the graph
+    # data: remembers the finished result of the session trace so the next
+    # run can repair it on the edited graph (apply_pending_edit)
+    key = st.session_state["trace_key"]
+    if key is None or key[0] != G.fingerprint() or key[1] not in INCREMENTAL_ALGOS:
+        return
+    trace = load_session_trace(G)
+    if trace is None or not trace.complete:
+        return
+    tree = None
+    if key[1] == "Dijkstra (Shortest-Path Tree)":
+        tree = get_spt_cache().get((key[0], key[2]))
+        if tree is None:
+            return
+    st.session_state["pending_edit"] = (key, G.labels, trace.result, tree, edit)
+
+def apply_pending_edit(G):
+    # Replace the session trace with a short update trace on the edited graph
+    # G, or with a full run when the edit cannot be repaired in place
+    pending = st.session_state.pop("pending_edit", None)
+    if pending is None:
+        return
+    key, labels, result, tree, edit = pending
+    new_key = (G.fingerprint(),) + key[1:]
+    if tree is not None:
+        tree = remap_tree(tree, labels, G)
+    algo = GraphAlgorithms(G)
+    step_iter, summarize = update_steps(G, *key[1:], result, edit, tree, algo)
+    if summarize is None:
+        trace = get_or_start_trace(G, new_key)
+    else:
+        with get_perf().timer("incremental update"):
+            trace = LazyTrace(step_iter, summarize, stats=lambda: algo.stats)
+            trace.drain()
+        st.session_state["local_trace"] = (new_key, trace)
+        if tree is not None:
+            # the repaired tree answers later End Nodes on the edited graph;
+            # the update steps are replayed over the tree before the edit
+            get_spt_cache().put((new_key[0], key[2]), algo.tree)
+            st.session_state["distance_base"] = (new_key, tree[0])
+    st.session_state["trace_key"] = new_key
+    st.session_state["step_idx"] = 0
+
+def import_trace(path):
+    # Load a saved trace folder (memory-mapped) together with its graph, make
+    # that graph the current one and select the trace without recomputing it
+    trace = CompactTrace.load(path)
+    graph = trace.graph()
+    pos = None
+    if graph.coords is not None:
+        pos = {n: (x, y) for n, (x, y) in zip(graph.labels, graph.coords.tolist()) if x == x and y == y}
+    graph_data = {
+        "nodes": list(graph.labels),
+        "edges": [{"u": u, "v": v, "w": w} for u, v, w in graph.edges()],
+        "pos": pos,
+    }
+    key = (CSRGraph.from_graph_data(graph_data).fingerprint(), trace.algorithm, trace.start, trace.end)
+    st.session_state["local_trace"] = (key, trace)
+    st.session_state["graph_data"] = graph_data
+    st.session_state["graph_rev"] += 1
+    st.session_state["trace_key"] = key
+    st.session_state["step_idx"] = 0
+
+PLAYBACK_TEMPLATE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "components", "playback.html")
+# vis-network's standalone build, shipped with the app so the player needs no CDN
+VIS_NETWORK_JS = os.path.join(os.path.dirname(PLAYBACK_TEMPLATE), "vis-network.min.js")
+
+def build_playback_payload(G, steps, summary, pos_fixed, base=None):
+    # Compact JSON-able form of a finished trace for the browser player:
+    # node/edge references become CSR ids and step types become small codes.
+    # base: distances by node id the trace starts from (see distance_base)
+    index = G.index
+    types, type_code = [], {}
+    out_steps, messages, levels, distances = [], [], [], []
+    if base is not None:
+        # step -1: in effect from the first step on, never marked as changed
+        distances = [[-1, i, d] for i, d in enumerate(base) if d != float('inf')]
+    for i, step in enumerate(steps):
+        s_type, val = step[0], step[1]
+        if s_type not in type_code:
+            type_code[s_type] = len(types)
+            types.append(s_type)
+        code = type_code[s_type]
+        if s_type == "level":
+            level_nodes, level_edges = val
+            out_steps.append([code, len(levels)])
+            levels.append([
+                [index.get(n, -1) for n in level_nodes],
+                [[index.get(u, -1), index.get(v, -1)] for u, v in level_edges]
+            ])
+        elif isinstance(val, tuple):
+            out_steps.append([code, index.get(val[0], -1), index.get(val[1], -1)])
+        else:
+            out_steps.append([code, index.get(val, -1)])
+        messages.append(step[2] if len(step) > 2 else "")
+        if len(step) > 3:
+            for n, d in step[3].items():
+                if n in index:
+                    distances.append([i, index[n], None if d == float('inf') else d])
 
     nodes = []
-    edges = []
+    for n in G.labels:
+        x, y = pos_fixed[n] if pos_fixed and n in pos_fixed else (0, 0)
+        nodes.append([n, x, y])
+    edges = [list(e) for e in zip(G.edge_u.tolist(), G.edge_v.tolist(), G.edge_w.tolist())]
+    return {
+        "nodes": nodes,
+        "edges": edges,
+        "order": G.sorted_ids,
+        "physics": not pos_fixed,
+        "types": types,
+        "steps": out_steps,
+        "messages": messages,
+        "levels": levels,
+        "distances": distances,
+        "summary": summary.replace("**", ""),
+    }
 
-    for n in G.nodes():
-        color = "#FFFFFF" 
-        font_color = "black"
-        
-        if n == current_node:
-            color = "#FFA500"  # Orange
-            font_color = "white"
-        elif n in highlight_nodes:
-            color = "#006400"  # Dark Green
-            font_color = "white"
-        
-        x, y = 0, 0
-        if pos_fixed and n in pos_fixed:
-            x, y = pos_fixed[n]
-        
-        nodes.append(Node(
-            id=n, 
-            label=str(n), 
-            shape="circle",
-            size=25, 
-            color=color,
-            font={'color': font_color},
-            x=x, y=y,
-            fixed=True if pos_fixed else False
-        ))
-
-    for u, v, d in G.edges(data=True):
-        edge_color = "#CCCCCC"
-        width = 2
-        
-        if (u, v) in highlight_edges or (v, u) in highlight_edges:
-            edge_color = "#228B22"  # Green
-            width = 4
-            
-        edges.append(Edge(
-            source=u, 
-            target=v, 
-            label=str(d.get('weight', '')),
-            color=edge_color,
-            width=width
-        ))
-        
-    return nodes, edges
+def render_playback(payload):
+    # The whole trace is shipped once; stepping, autoplay and speed run in the
+    # browser. None when the player files cannot be read.
+    try:
+        with open(PLAYBACK_TEMPLATE, encoding="utf-8") as f:
+            template = f.read()
+        with open(VIS_NETWORK_JS, encoding="utf-8") as f:
+            vis_js = f.read()
+    except OSError:
+        return None
+    data = json.dumps(payload, separators=(",", ":")).replace("</", "<\\/")
+    return template.replace("__VIS_NETWORK_JS__", vis_js).replace("__PLAYBACK_PAYLOAD__", data)
+
+def testcase_graph_data(tc):
+    return {
+        "nodes": tc["nodes"][:],
+        "edges": [{"u": u, "v": v, "w": w} for u, v, w in tc["edges"]],
+        "pos": tc.get("pos"),
+    }
+
+def trace_keys(G):
+    # Every (fingerprint, algorithm, start, end) the sidebar can ask for on G
+    # with the default End Node (the last node), as main() builds them
+    nodes = list(G.nodes())
+    for algo_choice in ALGORITHMS:
+        starts = [None] if algo_choice == "MST (Kruskal)" or not nodes else nodes
+        end_node = nodes[-1] if algo_choice in SHORTEST_PATH_ALGOS and nodes else None
+        for start_node in starts:
+            yield (G.fingerprint(), algo_choice, start_node, end_node)
+
+PREWARM_ENV = "GRAPH_APP_PREWARM"
+
+@st.cache_resource
+def start_prewarm():
+    # Optional startup stage (set GRAPH_APP_PREWARM=1): once per server
+    # process, a background thread fills the shared caches with the layouts,
+    # shortest-path trees and finished traces of every testcase x algorithm x
+    # start node. It starts with the first session, since Streamlit has no
+    # server-start hook; a readiness check that opens the app triggers it.
+    status = {"traces": 0, "seconds": 0.0, "done": False}
+    trace_cache, spt_cache, layout_cache = get_trace_cache(), get_spt_cache(), get_layout_cache()
+
+    def load_tree(G, start_node):
+        return load_shortest_path_tree(G, start_node, spt_cache)
+
+    def run():
+        started = time.perf_counter()
+        for tc in TESTCASES.values():
+            G = CSRGraph.from_graph_data(testcase_graph_data(tc))
+            if not tc.get("pos"):
+                cached_layout(G, layout_cache)
+            for key in trace_keys(G):
+                if trace_cache.get(key) is None:
+                    trace = start_algorithm(G, *key[1:], load_tree=load_tree)
+                    trace.drain()
+                    trace_cache.put(key, trace)
+                status["traces"] += 1
+        status["seconds"] = time.perf_counter() - started
+        status["done"] = True
+
+    threading.Thread(target=run, name="prewarm", daemon=True).start()
+    return status
+
+def get_perf():
+    # Per-session timers shown in the Performance panel
+    if "perf" not in st.session_state:
+        st.session_state["perf"] = PerfLog()
+    return st.session_state["perf"]
+
+def load_graph_core():
+    # Build the CSRGraph once per graph edit; every edit bumps "graph_rev"
+    cached = st.session_state.get("graph_core")
+    if cached is None or cached[0] != st.session_state["graph_rev"]:
+        with get_perf().timer("graph build (CSR)"):
+            G = CSRGraph.from_graph_data(st.session_state["graph_data"])
+        cached = (st.session_state["graph_rev"], G)
+        st.session_state["graph_core"] = cached
+    return cached[1]
+
+LAYOUT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+@st.cache_resource
+def get_layout_cache():
+    # Computed node positions keyed by graph fingerprint, shared by every session
+    return BoundedLRUCache(LAYOUT_CACHE_MAX_BYTES, estimate_layout_bytes)
+
+def load_positions(G):
+    # Testcase positions if the graph has them, otherwise a server-side layout
+    # (computed once per graph), so the browser never runs physics
+    pos = st.session_state["graph_data"]["pos"]
+    if pos:
+        return pos
+    if G.coords is not None and not np.isnan(G.coords).all():
+        # generated graphs carry their positions (nodes added later have none)
+        return {n: (x, y) for n, (x, y) in zip(G.labels, G.coords.tolist()) if x == x and y == y}
+    with get_perf().timer("layout (cached per graph)"):
+        return cached_layout(G, get_layout_cache())
+
+def cached_layout(G, layout_cache):
+    key = G.fingerprint()
+    pos = layout_cache.get(key)
+    if pos is None:
+        pos = layout_positions(G)
+        layout_cache.put(key, pos)
+    return pos
+
+def load_renderer(G, slot="renderer"):
+    # One AgraphRenderer per graph edit, like load_graph_core(); every drawn
+    # pane has its own slot, since a renderer tracks one replayer at a time
+    cached = st.session_state.get(slot)
+    if cached is None or cached[0] != st.session_state["graph_rev"]:
+        pos = load_positions(G)
+        with get_perf().timer("agraph objects build"):
+            cached = (st.session_state["graph_rev"], AgraphRenderer(G, pos))
+        st.session_state[slot] = cached
+    return cached[1]
+
+# Above this size the whole graph is not drawn (agraph / vis-network would
+# stall); a level-of-detail view around the current step is drawn instead
+MAX_DRAW_NODES = 2000
+MAX_DRAW_EDGES = 5000
+LOD_MAX_NODES = 250
+
+# Above this many nodes a Start / End Node selectbox would ship every label
+# to the browser on each rerun; a text box is used instead
+NODE_SELECT_MAX = 5000
+
+def node_picker(G, label, default):
+    # Sidebar node choice: a selectbox for small graphs, a checked text box
+    # for large ones (the first / last node until a valid name is typed)
+    if len(G.labels) <= NODE_SELECT_MAX:
+        return st.sidebar.selectbox(label, G.labels, index=default)
+    name = st.sidebar.text_input(label, value=str(G.labels[default]), help=f"{len(G.labels):,} nodes: type a node name")
+    if name not in G.index:
+        st.sidebar.warning(f"No node named {name!r}; using {G.labels[default]!r}.")
+        return G.labels[default]
+    return name
+
+def graph_too_large(G):
+    return G.number_of_nodes() > MAX_DRAW_NODES or G.number_of_edges() > MAX_DRAW_EDGES
+
+def step_focus(steps, idx):
+    # Node labels the view should center on: the current step's node, the
+    # ends of its edge, or the nodes of its BFS level
+    if idx < 0 or not steps:
+        key = st.session_state["trace_key"]
+        return [key[2]] if key and key[2] is not None else []
+    step = steps[idx]
+    if step[0] == "level":
+        return list(step[1][0])
+    return list(step[1]) if isinstance(step[1], tuple) else [step[1]]
+
+def load_lod_view(G, focus, hops):
+    # Neighborhood of the focus nodes (at most LOD_MAX_NODES) with its own
+    # renderer. The view is kept while the focus stays inside its inner
+    # rings, so stepping through nearby nodes does not move the picture.
+    view = st.session_state.get("lod_view")
+    focus_ids = [G.index[n] for n in focus if n in G.index] or [0]
+    if (view is None or view["rev"] != st.session_state["graph_rev"] or view["hops"] != hops
+            or any(view["rings"].get(i, hops) >= max(hops, 1) for i in focus_ids)):
+        started = time.perf_counter()
+        from streamlit_agraph import Node, Edge
+        rings = G.neighborhood([G.labels[i] for i in focus_ids], LOD_MAX_NODES, hops)
+        ids = list(rings)
+        sub = G.subgraph(ids)
+        pos = load_lod_positions(G, sub, ids)
+        get_perf().add_time("level-of-detail view build", time.perf_counter() - started)
+        # Each drawn node with undrawn neighbors gets a "+N" super-node that
+        # stands for them, pushed outward from the view's center
+        hidden = (np.diff(G.offsets)[ids] - np.diff(sub.offsets)).tolist()
+        cx, cy = np.mean([pos[n] for n in sub.labels], axis=0).tolist()
+        more_nodes, more_edges = [], []
+        for n, count in zip(sub.labels, hidden):
+            if count <= 0:
+                continue
+            x, y = pos[n]
+            dx, dy = x - cx, y - cy
+            norm = max((dx * dx + dy * dy) ** 0.5, 1e-9)
+            more_id = f"__more__{n}"
+            more_nodes.append(Node(
+                id=more_id, label=f"+{count}", title=f"{count} more neighbor(s) of {n}",
+                shape="box", size=10, color="#EEEEEE", font={'color': "#666666"},
+                x=x + dx / norm * 60, y=y + dy / norm * 60, fixed=True
+            ))
+            more_edges.append(Edge(source=n, target=more_id, color="#DDDDDD", width=1, dashes=True))
+        view = {
+            "rev": st.session_state["graph_rev"], "hops": hops, "rings": rings,
+            "renderer": AgraphRenderer(sub, pos), "more": (more_nodes, more_edges),
+        }
+        st.session_state["lod_view"] = view
+    return view
+
+def load_lod_positions(G, sub, ids):
+    # Given positions if the graph has them, else a layout of just the
+    # drawn neighborhood (a layout of the whole graph says little locally)
+    pos = st.session_state["graph_data"]["pos"]
+    if pos and all(n in pos for n in sub.labels):
+        return pos
+    if G.coords is not None:
+        coords = G.coords[list(ids)]
+        if not np.isnan(coords).any():
+            return dict(zip(sub.labels, map(tuple, coords.tolist())))
+    return layout_positions(sub)
+
+def render_step_controls(G, steps, replay):
+    # Server-side playback: every button press reruns the script
+    b1, b2, b3 = st.columns([1, 1, 2])
+    if b1.button("◀ Prev Step"):
+        if st.session_state["step_idx"] > 0:
+            st.session_state["step_idx"] -= 1
+            st.rerun()
+
+    if b2.button("Next Step ▶"):
+        if steps and steps.ensure(st.session_state["step_idx"] + 2) > st.session_state["step_idx"] + 1:
+            st.session_state["step_idx"] += 1
+            st.rerun()
+
+    if b3.button("Instant Skip ⏩"):
+        if steps:
+            steps.drain()
+            st.session_state["step_idx"] = len(steps) - 1
+            st.rerun()
+
+    if len(steps) > 1:
+        # Scrub slider: jump straight to any step (1-based like the caption)
+        st.session_state["scrub_step"] = st.session_state["step_idx"] + 1
+        st.slider(
+            "Jump to Step",
+            min_value=1,
+            max_value=len(steps),
+            key="scrub_step",
+            on_change=lambda: st.session_state.update(step_idx=st.session_state["scrub_step"] - 1),
+        )
+
+    total = len(steps) if not steps or steps.complete else f"{len(steps)}+ (generating...)"
+    st.caption(f"Step: {st.session_state['step_idx'] + 1} / {total}")
+    more_nodes, more_edges = [], []
+    if graph_too_large(G):
+        hops = st.select_slider("Level of detail (hops around the current step)", options=[1, 2, 3, 4], value=2)
+        view = load_lod_view(G, step_focus(steps, st.session_state["step_idx"]), hops)
+        renderer = view["renderer"]
+        more_nodes, more_edges = view["more"]
+        st.caption(f"Level-of-detail view: {len(renderer.nodes):,} of {G.number_of_nodes():,} nodes "
+                   f"(graph has {G.number_of_edges():,} edges); '+N' boxes stand for undrawn neighbors.")
+    else:
+        renderer = load_renderer(G)
+    with get_perf().timer("agraph recolor (convert_to_agraph)"):
+        if replay is not None and st.session_state["step_idx"] >= 0:
+            nodes_data, edges_data = renderer.sync(replay)
+        else:
+            nodes_data, edges_data = renderer.paint()
+    if more_nodes:
+        nodes_data, edges_data = nodes_data + more_nodes, edges_data + more_edges
+
+    from streamlit_agraph import agraph, Config
+    config = Config(
+        width=700, 
+        height=500, 
+        directed=False, 
+        physics=False,
+        hierarchical=False
+    )
+    with get_perf().timer("agraph send"):
+        agraph(nodes=nodes_data, edges=edges_data, config=config)
 
 # --------------------------
-# 3. Main Streamlit App
+# Comparison mode: several algorithms on the same graph, stepped together
 # --------------------------
 
+COMPARE_MAX = 4
+
+@st.cache_resource
+def get_compare_pool():
+    # Worker processes shared by every session (threads would take turns on
+    # the GIL). "spawn" starts clean interpreters that import only the engine.
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    return ProcessPoolExecutor(max_workers=min(COMPARE_MAX, os.cpu_count() or 1),
+                               mp_context=multiprocessing.get_context("spawn"))
+
+def compare_trace_key(G, algo_choice, start_node, end_node):
+    # Trace key for one compared algorithm, with the sidebar's defaults
+    # (first node as start, last node as end) where it asks for none
+    nodes = G.labels
+    if algo_choice == "MST (Kruskal)" or not nodes:
+        start_node = None
+    elif start_node is None:
+        start_node = nodes[0]
+    if algo_choice not in SHORTEST_PATH_ALGOS or not nodes:
+        end_node = None
+    elif end_node is None:
+        end_node = nodes[-1]
+    return (G.fingerprint(), algo_choice, start_node, end_node)
+
+def start_comparison(G, algos, start_node, end_node):
+    # Submit every trace that is not finished in the shared cache to the
+    # worker processes at once; they run in parallel and come back as
+    # CompactTrace columns
+    pool = get_compare_pool()
+    keys = [compare_trace_key(G, a, start_node, end_node) for a in algos]
+    jobs = []
+    for key in keys:
+        trace = get_trace_cache().get(key)
+        if trace is None or not trace.complete:
+            trace = pool.submit(record_trace, G.labels, G.offsets, G.targets, G.weights, G.coords, *key[1:])
+        jobs.append(trace)
+    st.session_state["compare"] = {"keys": keys, "jobs": jobs, "step_idx": 0}
+
+def collect_comparison(G, compare):
+    # Wait for the worker processes (the slowest one sets the time) and keep
+    # their traces in the shared cache; the traces, or None if a worker failed.
+    # After that the session keeps only the keys, like the main trace.
+    from concurrent.futures import Future
+    traces = []
+    with st.spinner(f"Running {len(compare['keys'])} algorithm(s) in worker processes..."):
+        for key, job in zip(compare["keys"], compare["jobs"]):
+            if isinstance(job, Future):
+                try:
+                    job = CompactTrace.from_columns(*job.result(), G)
+                except Exception as e:
+                    st.error(f"{key[1]} failed in its worker process: {e}")
+                    return None
+                get_trace_cache().put(key, job)
+            traces.append(job)
+    compare["jobs"] = None
+    return traces
+
+def comparison_traces(G, compare):
+    # The compared traces from the shared cache; an evicted one is recomputed
+    if compare["jobs"] is not None:
+        return collect_comparison(G, compare)
+    traces = []
+    for key in compare["keys"]:
+        trace = get_trace_cache().get(key)
+        if trace is None or not trace.complete:
+            with st.spinner(f"Recomputing {key[1]}..."):
+                trace = get_or_start_trace(G, key)
+                trace.drain()
+        traces.append(trace)
+    return traces
+
+def render_comparison(G, compare):
+    # Synchronized panes: one step index for all traces (a shorter trace
+    # stays on its last step) with each algorithm's timing and counters
+    traces = comparison_traces(G, compare)
+    if traces is None:
+        del st.session_state["compare"]
+        return
+    longest = max(len(t) for t in traces)
+
+    st.subheader("⚖ Comparison")
+    b1, b2, b3 = st.columns([1, 1, 2])
+    if b1.button("◀ Prev", key="compare_prev") and compare["step_idx"] > 0:
+        compare["step_idx"] -= 1
+    if b2.button("Next ▶", key="compare_next") and compare["step_idx"] < longest - 1:
+        compare["step_idx"] += 1
+    if b3.button("Skip to End ⏩", key="compare_end"):
+        compare["step_idx"] = longest - 1
+    if longest > 1:
+        st.session_state["compare_scrub"] = min(compare["step_idx"], longest - 1) + 1
+        st.slider(
+            "Jump to Step (all panes)", min_value=1, max_value=longest, key="compare_scrub",
+            on_change=lambda: compare.update(step_idx=st.session_state["compare_scrub"] - 1),
+        )
+    st.caption(f"Step: {compare['step_idx'] + 1} / {longest}")
+
+    draw = not graph_too_large(G)
+    if not draw:
+        st.caption("The graph is too large to draw in every pane; only the counters are shown.")
+    from streamlit_agraph import agraph, Config
+    for i, (col, key, trace) in enumerate(zip(st.columns(len(traces)), compare["keys"], traces)):
+        with col:
+            _, algo_choice, start_node, end_node = key
+            title = algo_choice
+            if start_node is not None:
+                title += f" ({start_node} → {end_node})" if end_node is not None else f" ({start_node})"
+            st.markdown(f"**{title}**")
+            idx = min(compare["step_idx"], len(trace) - 1)
+            with get_perf().timer("comparison pane"):
+                replay = session_replayer(trace, f"compare_{i}")
+                seek_replayer(key, replay, idx)
+                if draw:
+                    nodes_data, edges_data = load_renderer(G, f"compare_renderer_{i}").sync(replay)
+                    # agraph() takes no widget key: a per-pane group name keeps
+                    # two panes with the same picture from clashing
+                    config = Config(width=700 // len(traces) + 100, height=350, directed=False, physics=False,
+                                    hierarchical=False, groups={f"pane-{i}": {}})
+                    agraph(nodes=nodes_data, edges=edges_data, config=config)
+            if idx >= 0 and len(trace[idx]) > 2 and trace[idx][2]:
+                st.caption(trace[idx][2])
+            st.caption(f"{len(trace):,} steps · {trace.elapsed * 1000:.1f} ms CPU")
+            if trace.summary:
+                st.success(trace.summary)
+            stats = trace.stats()
+            if stats:
+                st.markdown("  \n".join(f"{name}: **{value:,}**" for name, value in stats.items()))
+
+DISTANCE_PAGE_SIZE = 50
+
+def distance_base(G, key):
+    # Distances a trace starts from, by node id, or None. Shortest-path tree
+    # traces only carry the path (or the repaired nodes) in their steps; the
+    # rest of the table comes from the tree itself.
+    if key is None or key[1] != "Dijkstra (Shortest-Path Tree)" or key[0] != G.fingerprint():
+        return None
+    base = st.session_state.get("distance_base")
+    if base is not None and base[0] == key:
+        return base[1]  # update trace: the tree before the edit
+    return load_shortest_path_tree(G, key[2])[0]
+
+def sync_distance_column(G, replay, base=None):
+    # Distances of every node in sorted label order (G.sorted_ids) as one
+    # float array, starting from `base` (see distance_base). It is kept
+    # between reruns and, like AgraphRenderer.sync(), only the distance
+    # changes logged since the last step are applied, unless the jump spans
+    # more log entries than there are nodes.
+    cached = st.session_state.get("distance_column")
+    pos = replay.log_position
+    if (cached is None or cached["replay"]() is not replay or cached["base"] is not base
+            or len(cached["dist"]) != G.number_of_nodes() or abs(pos - cached["pos"]) > G.number_of_nodes()):
+        if base is None:
+            start = np.full(G.number_of_nodes(), np.inf)
+        else:
+            start = np.asarray(base, dtype=np.float64)[G.sorted_ids]
+        dist = start.copy()
+        if replay.distances:
+            ranks = [G.rank[G.index[n]] for n in replay.distances]
+            dist[ranks] = [np.inf if d is None else d for d in replay.distances.values()]
+        cached = {"replay": weakref.ref(replay), "base": base, "start": start, "pos": pos, "dist": dist}
+        st.session_state["distance_column"] = cached
+    elif cached["pos"] != pos:
+        dist = cached["dist"]
+        changes = replay.changes_between(cached["pos"], pos)
+        forward = pos > cached["pos"]
+        for _, kind, item, old, new in changes if forward else reversed(changes):
+            if kind == "d":
+                d = new if forward else old
+                r = G.rank[G.index[item]]
+                dist[r] = cached["start"][r] if d is None else d
+        cached["pos"] = pos
+    return cached["dist"]
+
+def render_distance_table(G, replay, step, base=None):
+    # One page of the distance table: reached nodes, the nodes this step
+    # changed, or all nodes, in sorted label order. Rows changed by the
+    # current step are highlighted.
+    with get_perf().timer("distance table (lookup)"):
+        dist = sync_distance_column(G, replay, base)
+    changed = sorted(G.rank[G.index[n]] for n in step[3])
+    show = st.radio("Show", ["Reached", "Changed this step", "All nodes"], horizontal=True, key="distance_filter")
+    if show == "Reached":
+        rows = np.flatnonzero(np.isfinite(dist))
+    elif show == "Changed this step":
+        rows = np.asarray(changed, dtype=np.int64)
+    else:
+        rows = np.arange(len(dist))
+    pages = max(1, -(-len(rows) // DISTANCE_PAGE_SIZE))
+    page = 1
+    if pages > 1:
+        page = st.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, value=1, key="distance_page")
+    rows = rows[(page - 1) * DISTANCE_PAGE_SIZE:page * DISTANCE_PAGE_SIZE]
+
+    with get_perf().timer("distance table (DataFrame)"):
+        import pandas as pd
+        values = dist[rows]
+        finite = np.isfinite(values)
+        # integer weights give integer distances: show them without ".0"
+        if np.issubdtype(G.weights.dtype, np.integer):
+            shown = values[finite].astype(np.int64)
+        else:
+            shown = values[finite]
+        text = np.full(len(rows), "∞", dtype=object)
+        text[finite] = shown.astype(str)
+        df = pd.DataFrame({
+            "Node": [str(G.labels[G.sorted_ids[r]]) for r in rows.tolist()],
+            "Dist": text,
+        })
+        marked = np.isin(rows, changed)
+        styled = df.style.apply(
+            lambda col: np.where(marked, "background-color: #FFE0B2", ""), axis=0
+        )
+    st.dataframe(styled, hide_index=True)
+    st.caption(f"{len(changed)} node(s) changed by this step · {int(np.isfinite(dist).sum()):,} reached")
+
+def render_perf_panel(G, steps):
+    # Timers of this session plus counters of the graph, the current trace
+    # and the algorithm run that produced it
+    import pandas as pd
+    perf = get_perf()
+    perf.set("graph nodes", G.number_of_nodes())
+    perf.set("graph edges", G.number_of_edges())
+    for name in [name for name in perf.values if name.startswith("algorithm: ")]:
+        del perf.values[name]  # counters of the previous algorithm
+    if steps:
+        perf.set("trace steps", len(steps))
+        perf.set("trace bytes (estimated)", estimate_trace_bytes(steps))
+        perf.set("trace generation ms", round(steps.elapsed * 1000, 3))
+        for name, value in steps.stats().items():
+            perf.set(f"algorithm: {name}", value)
+    perf.set("trace cache bytes (all sessions)", get_trace_cache().total_bytes)
+    if os.environ.get(PREWARM_ENV) == "1":
+        status = start_prewarm()
+        perf.set("prewarmed traces", status["traces"])
+        perf.set("prewarm seconds", round(status["seconds"], 3) if status["done"] else "running")
+
+    st.markdown("---")
+    st.subheader("⏱ Performance")
+    rows = perf.timer_rows()
+    if rows:
+        st.dataframe(
+            pd.DataFrame(rows, columns=["Timer", "Calls", "Last ms", "Mean ms", "Max ms", "Total ms"]).round(3),
+            hide_index=True,
+        )
+    counters = [(name, str(value)) for name, value in perf.values.items() if value is not None]
+    st.dataframe(pd.DataFrame(counters, columns=["Counter", "Value"]), hide_index=True)
+    p1, p2 = st.columns(2)
+    p1.download_button("Export JSON", json.dumps(perf.to_dict(), default=str, indent=1),
+                       file_name="perf.json", mime="application/json")
+    if p2.button("Reset Timers"):
+        perf.reset()
+        st.rerun()
+
 def main():
+    run_started = time.perf_counter()
     st.set_page_config(page_title="Interactive Graph Algo", layout="wide")
+    if os.environ.get(PREWARM_ENV) == "1":
+        start_prewarm()
     
     # Init Session State
     if "graph_data" not in st.session_state:
         st.session_state["graph_data"] = {"nodes": [], "edges": [], "pos": None}
     if "step_idx" not in st.session_state:
         st.session_state["step_idx"] = -1
-    if "algo_steps" not in st.session_state:
-        st.session_state["algo_steps"] = []
-    if "final_result" not in st.session_state:
-        st.session_state["final_result"] = ""
+    if "trace_key" not in st.session_state:
+        st.session_state["trace_key"] = None
+    if "graph_rev" not in st.session_state:
+        st.session_state["graph_rev"] = 0
     
     st.title("Graph Algorithms: :orange[Step-by-Step Learning]")
 
     # --- Sidebar: Configuration ---
     st.sidebar.header("1. Graph Setup")
-    selected_testcase = st.sidebar.selectbox("Load Testcase", ["Custom"] + list(TESTCASES.keys()))
+    selected_testcase = st.sidebar.selectbox("Load Testcase", ["Custom"] + testcase_names())
+    params = generator_params(selected_testcase)
+    if params is not None:
+        # Generated on Reset / Load; the same values always give the same graph
+        params = {name: st.sidebar.number_input(name.replace("_", " ").capitalize(), min_value=0, value=value, step=1)
+                  for name, value in params.items()}
     
     if st.sidebar.button("Reset / Load Graph"):
-        st.session_state["step_idx"] = -1
-        st.session_state["algo_steps"] = []
-        st.session_state["final_result"] = ""
-        if selected_testcase != "Custom":
-            tc = TESTCASES[selected_testcase]
-            st.session_state["graph_data"]["nodes"] = tc["nodes"][:]
-            st.session_state["graph_data"]["edges"] = [{"u": u, "v": v, "w": w} for u, v, w in tc["edges"]]
-            st.session_state["graph_data"]["pos"] = tc.get("pos")
+        if selected_testcase in TESTCASES:
+            graph_data = testcase_graph_data(TESTCASES[selected_testcase])
+        elif selected_testcase != "Custom":
+            # Graph files and generators are only read / built here
+            try:
+                with get_perf().timer("testcase load"):
+                    core = load_testcase(selected_testcase, **(params or {}))
+            except (OSError, ValueError) as e:
+                st.sidebar.error(f"Could not load {selected_testcase}: {e}")
+                graph_data = None
+            else:
+                graph_data = {"nodes": [], "edges": [], "core": core, "pos": None}
         else:
-            st.session_state["graph_data"] = {"nodes": [], "edges": [], "pos": None}
-        st.rerun()
+            graph_data = {"nodes": [], "edges": [], "pos": None}
+        if graph_data is not None:
+            st.session_state["graph_data"] = graph_data
+            st.session_state["step_idx"] = -1
+            st.session_state["trace_key"] = None
+            st.session_state["graph_rev"] += 1
+            st.rerun()
+
+    # Graph Object (compact CSR form, rebuilt only after a graph edit)
+    G = load_graph_core()
+    apply_pending_edit(G)
 
-    # Manual Edit
+    # Manual Edit (node / edge lookups go through the CSR graph's hash index)
     with st.sidebar.expander("📝 Edit Graph (Add Node/Edge)"):
         c1, c2 = st.columns(2)
         new_n = c1.text_input("New Node Name")
         if c2.button("Add Node"):
-            if new_n and new_n not in st.session_state["graph_data"]["nodes"]:
+            if new_n and new_n not in G.index:
                 st.session_state["graph_data"]["nodes"].append(new_n)
+                st.session_state["graph_rev"] += 1
                 st.rerun()
         
         st.write("---")
@@ -618,163 +934,192 @@ def main():
         u = cc1.text_input("From")
         v = cc2.text_input("To")
         w = cc3.number_input("Weight", 1)
+        incremental = st.checkbox(
+            "Update the finished result incrementally", value=True,
+            help="After an MST or shortest-path tree run, an edge edit repairs the result and shows only what changed."
+        )
         if st.button("Add Edge"):
             if u and v:
-                if u not in st.session_state["graph_data"]["nodes"]:
-                    st.session_state["graph_data"]["nodes"].append(u)
-                if v not in st.session_state["graph_data"]["nodes"]:
-                    st.session_state["graph_data"]["nodes"].append(v)
-                st.session_state["graph_data"]["edges"].append({"u": u, "v": v, "w": w})
+                for n in (u, v):
+                    if n not in G.index:
+                        st.session_state["graph_data"]["nodes"].append(n)
+                edges = st.session_state["graph_data"]["edges"]
+                existing = None
+                if G.has_edge(u, v):
+                    existing = next((e for e in edges if {e["u"], e["v"]} == {u, v}), None)
+                if incremental:
+                    record_edit(G, (u, v, w, G.edge_weight(u, v)))
+                if existing is not None:
+                    existing["w"] = w  # same edge again: only its weight changes
+                else:
+                    edges.append({"u": u, "v": v, "w": w})
+                st.session_state["graph_rev"] += 1
+                st.rerun()
+
+    # Bulk Import: edge-list / CSV text, parsed in chunks into a CSR graph
+    with st.sidebar.expander("📥 Bulk Import (Edge List / CSV)"):
+        st.caption("One edge per line: `u v [weight]`, separated by spaces, commas, semicolons or tabs.")
+        upload = st.file_uploader("Edge-list file", type=["txt", "csv", "tsv", "edges"])
+        pasted = st.text_area("...or paste edges")
+        header = st.radio("First line is a header", ["Detect", "Yes", "No"], horizontal=True)
+        header = {"Detect": None, "Yes": True, "No": False}[header]
+        merge = st.checkbox("Add to the current graph")
+        if st.button("Import Edges"):
+            builder = GraphBuilder()
+            if merge:
+                builder.add_nodes(G.labels)
+                builder.add_edges(G.edges())
+            try:
+                if upload is not None:
+                    core = read_edge_list(upload, builder, header=header)
+                else:
+                    core = read_edge_text(pasted, builder, header)
+            except ValueError as e:
+                st.error(f"Could not import edges: {e}")
+            else:
+                st.session_state["graph_data"] = {
+                    "nodes": [], "edges": [], "core": core,
+                    "pos": st.session_state["graph_data"]["pos"] if merge else None,
+                }
+                st.session_state["step_idx"] = -1
+                st.session_state["trace_key"] = None
+                st.session_state["graph_rev"] += 1
                 st.rerun()
 
     # --- Sidebar: Algorithm Control ---
     st.sidebar.header("2. Algorithm Control")
     
-    # Construct Graph Object
-    G = nx.Graph()
-    for n in st.session_state["graph_data"]["nodes"]:
-        G.add_node(n)
-    for e in st.session_state["graph_data"]["edges"]:
-        G.add_edge(e['u'], e['v'], weight=e['w'])
-    
     algo_choice = st.sidebar.selectbox(
         "Algorithm",
-        ["DFS", "BFS", "Dijkstra", "MST (Kruskal)", "MST (Prim)"]
+        list(ALGORITHMS)
     )
     
     start_node = None
     end_node = None
-    if list(G.nodes()):
+    if G.labels:
         # FIX: Allow start_node selection for Prim as well
         if algo_choice != "MST (Kruskal)":
-            start_node = st.sidebar.selectbox("Start Node", list(G.nodes()))
-        if algo_choice == "Dijkstra":
-            end_node = st.sidebar.selectbox("End Node", list(G.nodes()), index=len(G.nodes())-1)
-            
-    if st.sidebar.button("Initialize Algorithm"):
-        algo = GraphAlgorithms(G)
-        steps = []
-        result_text = ""
-        
-        if algo_choice == "DFS" and start_node:
-            steps, order = algo.get_dfs_steps(start_node)
-            result_text = f"**Traversal Order:**\n{' -> '.join(map(str, order))}"
+            start_node = node_picker(G, "Start Node", 0)
+        if algo_choice in SHORTEST_PATH_ALGOS:
+            end_node = node_picker(G, "End Node", len(G.labels) - 1)
             
-        elif algo_choice == "BFS" and start_node:
-            steps, order = algo.get_bfs_steps(start_node)
-            result_text = f"**Traversal Order:**\n{' -> '.join(map(str, order))}"
-            
-        elif algo_choice == "Dijkstra" and start_node and end_node:
-            steps, dist, path = algo.get_dijkstra_steps(start_node, end_node)
-            if dist == float('inf'):
-                result_text = f"**Target unreachable!** (Dist: ∞)"
-            else:
-                result_text = f"**Shortest Path:** {' -> '.join(map(str, path))}\n\n**Total Distance:** {dist}"
-                
-        elif algo_choice == "MST (Kruskal)":
-            steps, weight, mst_edges = algo.get_mst_steps("kruskal")
-            edge_str = ", ".join([f"({u}-{v})" for u, v, w in mst_edges])
-            result_text = f"**Total MST Weight:** {weight}\n\n**Edges:** {edge_str}"
-            
-        elif algo_choice == "MST (Prim)":
-            # FIX: Pass start_node to manual Prim
-            steps, weight, mst_edges = algo.get_mst_steps("prim", start_node=start_node)
-            edge_str = ", ".join([f"({u}-{v})" for u, v, w in mst_edges])
-            result_text = f"**Total MST Weight:** {weight}\n\n**Edges:** {edge_str}"
+    playback_mode = st.sidebar.radio(
+        "Playback",
+        ["Server (Step Buttons)", "Browser (Autoplay)"],
+        help="Browser mode sends the whole trace once and steps through it without server round-trips."
+    )
+    show_perf = st.sidebar.checkbox("⏱ Performance panel", help="Timers and counters for each action, exportable as JSON.")
+    compare_mode = st.sidebar.checkbox("⚖ Compare algorithms", help="Run several algorithms on this graph together and step through them side by side.")
+    if compare_mode:
+        compare_algos = st.sidebar.multiselect(
+            "Algorithms to compare", list(ALGORITHMS), default=[algo_choice], max_selections=COMPARE_MAX
+        )
+        if st.sidebar.button("Run Comparison", disabled=not compare_algos or not G.labels):
+            start_comparison(G, compare_algos, start_node, end_node)
+            st.rerun()
+    
+    # Shortest-path tree mode answers a new End Node from the cached tree,
+    # so switching the target re-initializes right away
+    key = st.session_state["trace_key"]
+    retarget = (
+        algo_choice == "Dijkstra (Shortest-Path Tree)" and key is not None
+        and key[:3] == (G.fingerprint(), algo_choice, start_node) and key[3] != end_node
+    )
+    
+    if st.sidebar.button("Initialize Algorithm") or retarget:
+        key = (G.fingerprint(), algo_choice, start_node, end_node)
+        trace = get_or_start_trace(G, key)
+        trace.ensure(1)  # step 1 is ready right away, the rest fills in the background
         
-        st.session_state["algo_steps"] = steps
+        st.session_state["trace_key"] = key
+        st.session_state["local_trace"] = None
         st.session_state["step_idx"] = 0
-        st.session_state["final_result"] = result_text
         st.rerun()
 
+    steps = load_session_trace(G)
+    if steps is None:
+        steps = []
+
+    with st.sidebar.expander("💾 Export / Import Trace"):
+        trace_dir = st.text_input("Trace folder", "trace")
+        e1, e2 = st.columns(2)
+        if e1.button("Export Trace", disabled=not steps):
+            key = st.session_state["trace_key"]
+            steps.drain()
+            CompactTrace.from_trace(steps, G, *key[1:]).save(trace_dir)
+            st.success(f"Saved {len(steps)} steps to {trace_dir}")
+        if e2.button("Import Trace"):
+            try:
+                import_trace(trace_dir)
+            except (OSError, ValueError, KeyError) as e:
+                st.error(f"Could not load trace: {e}")
+            else:
+                st.rerun()
+
     # --- Main Area ---
+    compare = st.session_state.get("compare")
+    if compare_mode and compare is not None and compare["keys"][0][0] == G.fingerprint():
+        render_comparison(G, compare)
+        st.markdown("---")
+
     col_vis, col_info = st.columns([3, 1])
+    browser_playback = playback_mode == "Browser (Autoplay)" and bool(steps) and not graph_too_large(G)
+    if browser_playback:
+        # Built once per trace; reruns for other widgets reuse the same page
+        playback_html = st.session_state.get("playback_html")
+        if playback_html is None or playback_html[0] != st.session_state["trace_key"]:
+            steps.drain()
+            payload = build_playback_payload(
+                G, steps, steps.summary, load_positions(G), distance_base(G, st.session_state["trace_key"])
+            )
+            playback_html = (st.session_state["trace_key"], render_playback(payload))
+            if playback_html[1] is not None:
+                st.session_state["playback_html"] = playback_html
+        if playback_html[1] is None:
+            st.warning("The browser player could not be loaded; showing server playback instead.")
+            browser_playback = False
     
-    highlight_nodes = set()
-    highlight_edges = set()
-    current_node_vis = None
+    replay = None
     log_msg = "Ready to start."
-    distances_data = {}
+    distance_step = None
     
-    if st.session_state["step_idx"] >= 0 and st.session_state["algo_steps"]:
+    if st.session_state["step_idx"] >= 0 and steps and not browser_playback:
         idx = st.session_state["step_idx"]
-        current_step = st.session_state["algo_steps"][idx]
-        
-        s_type = current_step[0]
-        val = current_step[1]
+        current_step = steps[idx]
         log_msg = current_step[2] if len(current_step) > 2 else ""
-        
+
+        replay = session_replayer(steps)
+        with get_perf().timer("step replay (seek)"):
+            seek_replayer(st.session_state["trace_key"], replay, idx)
+
         if len(current_step) > 3:
-            distances_data = current_step[3]
-
-        for i in range(idx + 1):
-            s = st.session_state["algo_steps"][i]
-            if s[0] in ["node", "update", "finished"]:
-                highlight_nodes.add(s[1])
-            elif s[0] in ["edge", "add_edge"]:
-                highlight_edges.add(s[1])
-            elif s[0] == "current":
-                current_node_vis = s[1]
-                highlight_nodes.add(s[1])
-            
-            if i == idx and s[0] == "check_edge":
-                highlight_edges.add(s[1])
+            distance_step = current_step
     
     with col_vis:
-        b1, b2, b3 = st.columns([1, 1, 2])
-        if b1.button("◀ Prev Step"):
-            if st.session_state["step_idx"] > 0:
-                st.session_state["step_idx"] -= 1
-                st.rerun()
-        
-        if b2.button("Next Step ▶"):
-            if st.session_state["step_idx"] < len(st.session_state["algo_steps"]) - 1:
-                st.session_state["step_idx"] += 1
-                st.rerun()
-
-        if b3.button("Instant Skip ⏩"):
-            if st.session_state["algo_steps"]:
-                st.session_state["step_idx"] = len(st.session_state["algo_steps"]) - 1
-                st.rerun()
-                
-        nodes_data, edges_data = convert_to_agraph(
-            G, 
-            highlight_nodes=highlight_nodes,
-            highlight_edges=highlight_edges,
-            current_node=current_node_vis,
-            pos_fixed=st.session_state["graph_data"]["pos"]
-        )
-        
-        config = Config(
-            width=700, 
-            height=500, 
-            directed=False, 
-            physics=True if not st.session_state["graph_data"]["pos"] else False,
-            hierarchical=False
-        )
-        
-        st.caption(f"Step: {st.session_state['step_idx'] + 1} / {len(st.session_state['algo_steps'])}")
-        agraph(nodes=nodes_data, edges=edges_data, config=config)
+        if browser_playback:
+            import streamlit.components.v1 as components
+            components.html(playback_html[1], height=640, scrolling=True)
+        else:
+            render_step_controls(G, steps, replay)
 
     with col_info:
         st.subheader("🔍 Status Panel")
         
         # --- Display Final Result ---
-        if st.session_state["final_result"]:
-            st.success(st.session_state["final_result"])
+        if steps and steps.complete:
+            if steps.summary:
+                st.success(steps.summary)
+            st.caption(f"Trace: {len(steps)} steps generated in {steps.elapsed * 1000:.1f} ms")
+        elif steps:
+            st.info("Generating steps in the background... press Instant Skip ⏩ to finish now.")
         
-        st.info(f"**Action:** {log_msg}")
+        if not browser_playback:
+            st.info(f"**Action:** {log_msg}")
         
-        if algo_choice == "Dijkstra" and distances_data:
+        if algo_choice in SHORTEST_PATH_ALGOS and distance_step is not None:
             st.markdown("---")
             st.write("📊 **Distance Table**")
-            df = pd.DataFrame(list(distances_data.items()), columns=["Node", "Dist"])
-            
-            # --- FIX: Ensure consistent type (string) for the column to avoid PyArrow errors ---
-            df['Dist'] = df['Dist'].apply(lambda x: "∞" if x == float('inf') else str(x))
-            
-            df = df.sort_values(by="Node")
-            st.dataframe(df, hide_index=True)
+            render_distance_table(G, replay, distance_step, distance_base(G, st.session_state["trace_key"]))
             
         st.markdown("---")
         st.caption("**Legend:**")
@@ -782,5 +1127,10 @@ def main():
         st.markdown("🟠 Orange: Processing")
         st.markdown("🟢 Green: Visited / Path")
 
+        if show_perf:
+            render_perf_panel(G, steps)
+
+    get_perf().add_time("script run (total)", time.perf_counter() - run_started)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
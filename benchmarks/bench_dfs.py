@@ -0,0 +1,79 @@
+# Benchmark: iterative get_dfs_steps on graphs of 10^5 - 10^6 nodes.
+#
+#   python benchmarks/bench_dfs.py            # 10^5 and 10^6 nodes
+#   python benchmarks/bench_dfs.py 200000     # custom sizes
+#
+# Before timing, the trace is checked against the old recursive DFS on small
+# random graphs (where recursion still fits in the default limit).
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from graph_engine import CSRGraph, GraphAlgorithms
+
+
+def recursive_dfs_steps(G, start_node):
+    # Reference: the original recursive implementation
+    steps = []
+    labels = G.labels
+    visited = [False] * len(labels)
+    traversal_order = []
+    def dfs(u):
+        visited[u] = True
+        traversal_order.append(labels[u])
+        steps.append(("node", labels[u], f"Visit Node {labels[u]}"))
+        for k in range(G.adj_offsets[u], G.adj_offsets[u + 1]):
+            v = G.adj_targets[k]
+            if not visited[v]:
+                steps.append(("edge", (labels[u], labels[v]), f"Explore Edge {labels[u]}-{labels[v]}"))
+                dfs(v)
+    dfs(G.index[start_node])
+    return steps, traversal_order
+
+
+def path_graph(n):
+    ids = np.arange(n - 1)
+    return CSRGraph.from_edges(range(n), zip(ids.tolist(), (ids + 1).tolist(), [1] * (n - 1)))
+
+
+def random_graph(n, avg_degree=4, seed=0):
+    rng = np.random.default_rng(seed)
+    m = n * avg_degree // 2
+    u = rng.integers(0, n, m).tolist()
+    v = rng.integers(0, n, m).tolist()
+    return CSRGraph.from_edges(range(n), zip(u, v, [1] * m))
+
+
+def check_against_recursive(trials=200):
+    rng = random.Random(0)
+    for _ in range(trials):
+        n = rng.randint(1, 60)
+        edges = [(rng.randrange(n), rng.randrange(n), 1) for _ in range(rng.randint(0, 3 * n))]
+        G = CSRGraph.from_edges(range(n), edges)
+        start = rng.randrange(n)
+        assert GraphAlgorithms(G).get_dfs_steps(start) == recursive_dfs_steps(G, start)
+    print(f"identical to recursive DFS on {trials} random graphs")
+
+
+def run(name, G, start):
+    t0 = time.perf_counter()
+    steps, order = GraphAlgorithms(G).get_dfs_steps(start)
+    elapsed = time.perf_counter() - t0
+    print(f"{name:<22} nodes={G.number_of_nodes():>9,} edges={G.number_of_edges():>9,} "
+          f"visited={len(order):>9,} steps={len(steps):>10,} time={elapsed:8.3f}s")
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [10**5, 10**6]
+    check_against_recursive()
+    for n in sizes:
+        run(f"path({n:,})", path_graph(n), 1)
+        run(f"random({n:,}, deg=4)", random_graph(n), 1)
+
+
+if __name__ == "__main__":
+    main()
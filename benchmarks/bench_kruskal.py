@@ -0,0 +1,95 @@
+# Benchmark: Kruskal (DisjointSet + NumPy argsort) on graphs of millions of edges.
+#
+#   python benchmarks/bench_kruskal.py                 # 10^6 and 3*10^6 edges
+#   python benchmarks/bench_kruskal.py 500000 2000000  # custom edge counts
+#
+# The trace is first checked against the previous implementation (Python
+# sort with a lambda key + recursive find without union by rank) on small
+# random graphs, then both are timed on the large graphs.
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from graph_engine import CSRGraph, GraphAlgorithms
+
+
+def previous_kruskal_steps(G):
+    # Reference: the implementation this engine replaced
+    steps = []
+    mst_edges = []
+    labels = G.labels
+    edges = sorted(
+        zip(G.edge_u.tolist(), G.edge_v.tolist(), G.edge_w.tolist()),
+        key=lambda x: x[2]
+    )
+    parent = list(range(len(labels)))
+    def find(n):
+        if parent[n] != n:
+            parent[n] = find(parent[n])
+        return parent[n]
+    def union(n1, n2):
+        root1, root2 = find(n1), find(n2)
+        if root1 != root2:
+            parent[root1] = root2
+            return True
+        return False
+    mst_weight = 0
+    for a, b, w in edges:
+        u, v = labels[a], labels[b]
+        steps.append(("check_edge", (u, v), f"Checking Edge {u}-{v} (W: {w})"))
+        if union(a, b):
+            mst_weight += w
+            mst_edges.append((u, v, w))
+            steps.append(("add_edge", (u, v), f"Added Edge {u}-{v} to MST"))
+            steps.append(("node", u, ""))
+            steps.append(("node", v, ""))
+        else:
+            steps.append(("skip", (u, v), f"Skipped {u}-{v} (Cycle detected)"))
+    return steps, mst_weight, mst_edges
+
+
+def random_weighted_graph(num_nodes, num_edges, max_weight=100, seed=0):
+    rng = np.random.default_rng(seed)
+    u = rng.integers(0, num_nodes, num_edges).tolist()
+    v = rng.integers(0, num_nodes, num_edges).tolist()
+    w = rng.integers(1, max_weight + 1, num_edges).tolist()
+    return CSRGraph.from_edges(range(num_nodes), zip(u, v, w))
+
+
+def check_against_previous(trials=200):
+    rng = random.Random(0)
+    for _ in range(trials):
+        n = rng.randint(1, 60)
+        edges = [(rng.randrange(n), rng.randrange(n), rng.randint(1, 5)) for _ in range(rng.randint(0, 4 * n))]
+        G = CSRGraph.from_edges(range(n), edges)
+        assert GraphAlgorithms(G).get_mst_steps("kruskal") == previous_kruskal_steps(G)
+    print(f"identical to previous Kruskal on {trials} random graphs")
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - t0
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [10**6, 3 * 10**6]
+    check_against_previous()
+    # The recursive find can need deep recursion on long parent chains
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10**6))
+    for m in sizes:
+        G = random_weighted_graph(m // 4, m)
+        (steps, weight, _), t_new = timed(lambda: GraphAlgorithms(G).get_mst_steps("kruskal"))
+        (old_steps, old_weight, _), t_old = timed(lambda: previous_kruskal_steps(G))
+        assert weight == old_weight and len(steps) == len(old_steps)
+        print(f"nodes={G.number_of_nodes():>9,} edges={G.number_of_edges():>10,} steps={len(steps):>10,} "
+              f"new={t_new:7.2f}s previous={t_old:7.2f}s")
+
+
+if __name__ == "__main__":
+    main()
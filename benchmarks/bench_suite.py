@@ -0,0 +1,244 @@
+# Benchmark suite: DFS, BFS, Dijkstra, Kruskal and Prim on synthetic graphs.
+#
+#   python benchmarks/bench_suite.py                         # 10^3 .. 10^6 edges
+#   python benchmarks/bench_suite.py --max-edges 100000      # quicker run
+#   python benchmarks/bench_suite.py --algos dijkstra prim --generators grid road path
+#   python benchmarks/bench_suite.py --out new.json --compare old.json
+#
+# Every algorithm runs in three modes on each graph:
+#   steps     get_*_steps: the full step trace is built and kept (what the app does)
+#   result    the engine's method without step logging (dfs_order, bfs_order,
+#             shortest_path_tree, minimum_spanning_tree): no step tuples or
+#             messages are built at all. Dijkstra here is the full tree from
+#             the start node, without the early stop at the target.
+#   networkx  the networkx built-in on the same graph (conversion not timed)
+# and reports wall time (best of --repeat), peak traced memory (a separate
+# tracemalloc run, several times slower; skip with --no-memory) and steps
+# emitted. The result and networkx runs are checked against the steps run. Results go to a
+# JSON file; --compare prints the time ratio against an earlier file and exits
+# with status 1 when any run is slower than --tolerance allows.
+import argparse
+import gc
+import json
+import math
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import networkx as nx
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import graph_generators
+from graph_engine import CSRGraph, GraphAlgorithms, collect_steps
+
+# --- Graph generators: each builds a weighted CSRGraph with about m edges ---
+# grid, geometric, road and scale_free size the app's testcase generators
+# (graph_generators, "Generator: ..." in the app and CLI), so the benchmark
+# runs on the same graphs; path, random and complete are extra shapes.
+
+def _graph(n, u, v, seed):
+    w = np.random.default_rng(seed).integers(1, 101, len(u))
+    return CSRGraph.from_id_edges(range(n), np.asarray(u, dtype=np.int64), np.asarray(v, dtype=np.int64), w)
+
+def path_graph(m, seed):
+    ids = np.arange(m)
+    return _graph(m + 1, ids, ids + 1, seed)
+
+def random_graph(m, seed):
+    # Erdos-Renyi style multigraph draw (average degree 4); repeats are merged
+    rng = np.random.default_rng(seed)
+    n = max(2, m // 2)
+    return _graph(n, rng.integers(0, n, m), rng.integers(0, n, m), seed + 1)
+
+def complete_graph(m, seed):
+    n = max(2, math.ceil((1 + math.sqrt(1 + 8 * m)) / 2))
+    u, v = np.triu_indices(n, 1)
+    return _graph(n, u, v, seed)
+
+def _side(m):
+    # rows = cols of a lattice with about m edges (2 per node)
+    return max(2, round(math.sqrt(m / 2)))
+
+GENERATORS = {
+    "path": path_graph,
+    "grid": lambda m, seed: graph_generators.grid_graph(_side(m), _side(m), seed),
+    "geometric": lambda m, seed: graph_generators.geometric_graph(max(2, m // 3), 6, seed),
+    "road": lambda m, seed: graph_generators.road_graph(_side(m), _side(m), seed),
+    "random": random_graph,
+    "scale_free": lambda m, seed: graph_generators.scale_free_graph(max(5, m // 4), 4, seed),
+    "complete": complete_graph,
+}
+
+# --- Algorithms: (engine step generator, engine without logging, networkx equivalent) ---
+
+def _nx_dijkstra(H, s, t):
+    try:
+        return nx.single_source_dijkstra(H, s, t)
+    except nx.NetworkXNoPath:
+        return None
+
+def _tree_distance(A, s, t):
+    distances, _ = A.shortest_path_tree(s)
+    return distances[A.G.index[t]]
+
+ALGORITHMS = {
+    "dfs": (lambda A, s, t: A.iter_dfs_steps(s),
+            lambda A, s, t: A.dfs_order(s),
+            lambda H, s, t: list(nx.dfs_edges(H, s))),
+    "bfs": (lambda A, s, t: A.iter_bfs_steps(s),
+            lambda A, s, t: A.bfs_order(s),
+            lambda H, s, t: list(nx.bfs_edges(H, s))),
+    "dijkstra": (lambda A, s, t: A.iter_dijkstra_steps(s, t), _tree_distance, _nx_dijkstra),
+    "kruskal": (lambda A, s, t: A.iter_mst_steps("kruskal"),
+                lambda A, s, t: A.minimum_spanning_tree("kruskal"),
+                lambda H, s, t: list(nx.minimum_spanning_edges(H, algorithm="kruskal", data=False))),
+    "prim": (lambda A, s, t: A.iter_mst_steps("prim", start_node=s),
+             lambda A, s, t: A.minimum_spanning_tree("prim", start_node=s),
+             lambda H, s, t: list(nx.minimum_spanning_edges(H, algorithm="prim", data=False))),
+}
+
+def measure(fn, repeat, memory):
+    # (best wall time, peak traced bytes or None, last return value)
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        result = None
+        gc.collect()
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    peak = None
+    if memory:
+        result = None
+        gc.collect()
+        tracemalloc.start()
+        result = fn()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return best, peak, result
+
+def check_result(algo, steps_result, result):
+    # The non-logging method must compute what the step generator returned:
+    # the order, the target distance, or (MST weight, MST edges)
+    expected = steps_result[1:] if algo in ("kruskal", "prim") else steps_result[1]
+    assert result == expected, algo
+
+def check_against_networkx(algo, H, s, steps_result, nx_result):
+    # The engine and networkx must agree on what they computed
+    if algo in ("dfs", "bfs"):
+        assert len(steps_result[1]) == len(nx_result) + 1
+    elif algo == "dijkstra":
+        dist = steps_result[1]
+        assert (nx_result is None and dist == float("inf")) or nx_result[0] == dist
+    else:
+        # networkx returns a spanning forest; the engine's Prim only grows
+        # the tree of the start node's component
+        keep = nx.node_connected_component(H, s) if algo == "prim" else H
+        weight = sum(H[u][v]["weight"] for u, v in nx_result if u in keep)
+        assert steps_result[1] == weight, (steps_result[1], weight)
+
+def run_graph(name, m, G, algos, repeat, memory, with_networkx):
+    s, t = G.labels[0], G.labels[-1]
+    H = G.to_networkx() if with_networkx else None
+    records = []
+    for algo in algos:
+        engine, plain, reference = ALGORITHMS[algo]
+        runs = [
+            ("steps", lambda: collect_steps(engine(GraphAlgorithms(G), s, t))),
+            ("result", lambda: plain(GraphAlgorithms(G), s, t)),
+        ]
+        if with_networkx:
+            runs.append(("networkx", lambda: reference(H, s, t)))
+        steps_result = None
+        for mode, fn in runs:
+            seconds, peak, result = measure(fn, repeat, memory)
+            if mode == "steps":
+                steps = len(result[0])
+                steps_result = (None,) + result[1:]
+            elif mode == "result":
+                steps = None
+                check_result(algo, steps_result, result)
+            else:
+                steps = None
+                check_against_networkx(algo, H, s, steps_result, result)
+            record = {
+                "generator": name, "target_edges": m,
+                "nodes": G.number_of_nodes(), "edges": G.number_of_edges(),
+                "algo": algo, "mode": mode,
+                "seconds": round(seconds, 6), "peak_bytes": peak, "steps": steps,
+            }
+            records.append(record)
+            print(f"{name:<11} {G.number_of_nodes():>9,} {G.number_of_edges():>10,}  {algo:<9} {mode:<9} "
+                  f"{seconds:9.4f}s  {_mb(peak):>10}  {'' if steps is None else f'{steps:,}':>11}")
+            result = None
+    return records
+
+def _mb(nbytes):
+    return "-" if nbytes is None else f"{nbytes / 2**20:.1f} MB"
+
+def compare(records, baseline_path, tolerance):
+    # Prints current/baseline time per matching run; returns the regressions
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    key = lambda r: (r["generator"], r["target_edges"], r["algo"], r["mode"])
+    old = {key(r): r for r in baseline}
+    regressions = []
+    print(f"\nCompared with {baseline_path} (tolerance {tolerance:.0%}):")
+    for r in records:
+        o = old.get(key(r))
+        if o is None or not o["seconds"]:
+            continue
+        ratio = r["seconds"] / o["seconds"]
+        flag = ""
+        if ratio > 1 + tolerance:
+            flag = "  <-- slower"
+            regressions.append((r, ratio))
+        print(f"  {r['generator']:<11} {r['target_edges']:>9,}  {r['algo']:<9} {r['mode']:<9} x{ratio:5.2f}{flag}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the step-trace engines against networkx.")
+    parser.add_argument("--generators", nargs="+", choices=GENERATORS, default=list(GENERATORS))
+    parser.add_argument("--algos", nargs="+", choices=ALGORITHMS, default=list(ALGORITHMS))
+    parser.add_argument("--sizes", nargs="+", type=int, help="target edge counts (default 10^3 .. --max-edges)")
+    parser.add_argument("--max-edges", type=int, default=10**6)
+    parser.add_argument("--repeat", type=int, default=1, help="timed runs per measurement (best is kept)")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak-memory runs")
+    parser.add_argument("--no-networkx", action="store_true", help="skip the networkx reference runs")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="bench_results.json", help="JSON results file")
+    parser.add_argument("--compare", help="earlier JSON results file to compare times with")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown for --compare (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    sizes = args.sizes or [10**k for k in range(3, 7) if 10**k <= args.max_edges]
+    print(f"{'generator':<11} {'nodes':>9} {'edges':>10}  {'algo':<9} {'mode':<9} {'time':>10}  {'peak':>10}  {'steps':>11}")
+    records = []
+    for name in args.generators:
+        for m in sizes:
+            G = GENERATORS[name](m, args.seed)
+            records += run_graph(name, m, G, args.algos, args.repeat, not args.no_memory, not args.no_networkx)
+
+    meta = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "networkx": nx.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "args": vars(args),
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "results": records}, f, indent=1)
+    print(f"\n{len(records)} results written to {args.out}")
+
+    if args.compare:
+        return 1 if compare(records, args.compare, args.tolerance) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,239 @@
+# Command-line entry point for the graph engine (no Streamlit needed).
+#
+#   python cli.py run graph.json --algo Dijkstra --start a --end e --out trace.jsonl
+#   python cli.py run --testcase "DFS/BFS: 3x3 Grid" --algo BFS --start a
+#   python cli.py run --testcase "Generator: Road Network" --param rows=500 --param cols=500 --algo "A* (Euclidean)" --start 0 --end 249999
+#   python cli.py batch jobs.json --workers 4 --out-dir traces
+#   python cli.py run graph.json --algo BFS --start a --format compact --out bfs.trace
+#   python cli.py show bfs.trace --first 0 --count 20
+#
+# A graph file is JSON: {"nodes": [...], "edges": [[u, v, w], ...], "pos": {...}}
+# ("pos" is optional; edges may also be {"u", "v", "w"} objects like the
+# app's graph_data). Any other file is read as an edge list / CSV by graph_io.
+#
+# A trace file is JSON Lines:
+#   - a header object,
+#   - one [type, value, message, delta] array per step (delta as [node, dist] pairs),
+#   - a final {"result", "summary"} object.
+# With --format compact the trace is written as a trace_format.CompactTrace
+# folder instead (columnar .npy files, memory-mapped when loaded).
+#
+# A jobs file is a JSON list of objects with these keys:
+#   {"graph": path | "testcase": name, "params": {...}, "algo", "start", "end", "out"}
+# "start" may be a list, which runs one job per source node.
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from graph_engine import ALGORITHMS, SHORTEST_PATH_ALGOS, LazyTrace, algorithm_steps
+from graph_io import load_graph_file
+from testcases import load_testcase
+from trace_format import CompactTrace
+
+def load_graph(path=None, testcase=None, params=None, header=None):
+    # testcase: any registry name (built-in, "File: ..." or "Generator: ...");
+    # params: generator parameters such as {"rows": 100, "seed": 1};
+    # header: True / False / None (detect) for an edge-list file
+    if testcase is not None:
+        return load_testcase(testcase, **(params or {}))
+    return load_graph_file(path, header)
+
+def parse_params(pairs):
+    # ["rows=100", "seed=1"] -> {"rows": 100, "seed": 1}
+    params = {}
+    for pair in pairs:
+        name, sep, value = pair.partition("=")
+        if not sep:
+            raise ValueError(f"expected NAME=VALUE, got {pair!r}")
+        params[name] = int(value)
+    return params
+
+def resolve_node(G, name):
+    # Node names from the command line are strings; graph files may use numbers
+    if name is None or name in G.index:
+        return name
+    for cast in (int, float):
+        try:
+            if cast(name) in G.index:
+                return cast(name)
+        except ValueError:
+            pass
+    raise ValueError(f"node not in graph: {name}")
+
+def encode_step(step):
+    # JSON form of a step: tuples become arrays, the delta dict becomes pairs
+    out = [step[0], step[1], step[2] if len(step) > 2 else ""]
+    if len(step) > 3:
+        out.append(list(step[3].items()))
+    return out
+
+def _algorithm_steps(G, algo, start, end):
+    step_iter, summarize = algorithm_steps(G, algo, start, end)
+    if summarize is None:
+        raise ValueError(f"{algo} needs a start node" + (" and an end node" if algo in SHORTEST_PATH_ALGOS else ""))
+    return step_iter, summarize
+
+def write_trace(G, algo, start, end, f):
+    # Streams the steps to f as they are produced; returns (steps, result, summary)
+    step_iter, summarize = _algorithm_steps(G, algo, start, end)
+    f.write(json.dumps({"graph": G.fingerprint(), "algorithm": algo, "start": start, "end": end}, ensure_ascii=False) + "\n")
+    count = 0
+    while True:
+        try:
+            step = next(step_iter)
+        except StopIteration as stop:
+            result = stop.value
+            break
+        f.write(json.dumps(encode_step(step), ensure_ascii=False) + "\n")
+        count += 1
+    summary = summarize(*result)
+    f.write(json.dumps({"result": result, "summary": summary}, ensure_ascii=False) + "\n")
+    return count, result, summary
+
+def write_compact_trace(G, algo, start, end, path):
+    # Runs to completion, then saves a CompactTrace folder at path
+    trace = LazyTrace(*_algorithm_steps(G, algo, start, end))
+    trace.drain()
+    CompactTrace.from_trace(trace, G, algo, start, end).save(path)
+    return len(trace), trace.result, trace.summary
+
+# --- Batch jobs (one process per worker, graphs loaded once per process) ---
+
+_graphs = {}
+
+def _job_graph(job):
+    if "testcase" in job:
+        key = ("testcase", job["testcase"], json.dumps(job.get("params"), sort_keys=True))
+    else:
+        key = ("graph", job["graph"])
+    if key not in _graphs:
+        _graphs[key] = load_graph(job.get("graph"), job.get("testcase"), job.get("params"))
+    return _graphs[key]
+
+def run_job(job):
+    G = _job_graph(job)
+    start = resolve_node(G, job.get("start"))
+    end = resolve_node(G, job.get("end"))
+    began = time.perf_counter()
+    if job.get("format") == "compact":
+        count, _, _ = write_compact_trace(G, job["algo"], start, end, job["out"])
+    else:
+        with open(job["out"], "w", encoding="utf-8") as f:
+            count, _, _ = write_trace(G, job["algo"], start, end, f)
+    return job["out"], count, time.perf_counter() - began
+
+def expand_jobs(jobs, out_dir, trace_format="jsonl"):
+    # One job per source node; fills in "out" paths and formats not given
+    expanded = []
+    for job in jobs:
+        starts = job.get("start")
+        for start in starts if isinstance(starts, list) else [starts]:
+            expanded.append({"format": trace_format, **job, "start": start})
+    for i, job in enumerate(expanded):
+        if "algo" not in job or job["algo"] not in ALGORITHMS:
+            raise ValueError(f"job {i}: unknown algorithm {job.get('algo')!r}")
+        if "out" not in job:
+            slug = re.sub(r"[^A-Za-z0-9]+", "-", job["algo"]).strip("-").lower()
+            ext = ".trace" if job["format"] == "compact" else ".jsonl"
+            job["out"] = os.path.join(out_dir, f"{i:05d}-{slug}-{job.get('start')}-{job.get('end')}{ext}")
+    return expanded
+
+def run_batch(jobs, workers=None):
+    # Yields (job, (out path, step count, seconds) or the exception) as jobs finish
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run_job, job): job for job in jobs}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result()
+            except Exception as e:
+                yield futures[future], e
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate graph algorithm step traces without the UI.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="run one algorithm and write its trace")
+    run.add_argument("graph", nargs="?", help="graph JSON or edge-list / CSV file")
+    run.add_argument("--testcase", help="use a testcase (built-in, \"File: ...\" or \"Generator: ...\") instead of a file")
+    run.add_argument("--param", action="append", default=[], metavar="NAME=VALUE",
+                     help="generator parameter, e.g. rows=1000 or seed=3 (repeatable)")
+    run.add_argument("--header", choices=("auto", "yes", "no"), default="auto",
+                     help="whether an edge-list file starts with a header line (default: detect)")
+    run.add_argument("--algo", required=True, choices=ALGORITHMS)
+    run.add_argument("--start")
+    run.add_argument("--end")
+    run.add_argument("--out", default="-", help="trace file (default: stdout)")
+    run.add_argument("--format", choices=("jsonl", "compact"), default="jsonl",
+                     help="compact: columnar trace folder (needs --out)")
+
+    batch = sub.add_parser("batch", help="run a jobs file across a process pool")
+    batch.add_argument("jobs", help="JSON list of jobs")
+    batch.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    batch.add_argument("--out-dir", default=".", help="where traces without an explicit \"out\" go")
+    batch.add_argument("--format", choices=("jsonl", "compact"), default="jsonl",
+                       help="format of jobs that do not set their own \"format\"")
+
+    show = sub.add_parser("show", help="print steps of a compact trace folder as JSON lines")
+    show.add_argument("trace", help="compact trace folder")
+    show.add_argument("--first", type=int, default=0)
+    show.add_argument("--count", type=int, default=20)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        if (args.graph is None) == (args.testcase is None):
+            parser.error("give either a graph file or --testcase")
+        if args.format == "compact" and args.out == "-":
+            parser.error("--format compact needs --out FOLDER")
+        try:
+            header = {"auto": None, "yes": True, "no": False}[args.header]
+            G = load_graph(args.graph, args.testcase, parse_params(args.param), header)
+            start, end = resolve_node(G, args.start), resolve_node(G, args.end)
+            if args.format == "compact":
+                count, _, summary = write_compact_trace(G, args.algo, start, end, args.out)
+            elif args.out == "-":
+                count, _, summary = write_trace(G, args.algo, start, end, sys.stdout)
+            else:
+                with open(args.out, "w", encoding="utf-8") as f:
+                    count, _, summary = write_trace(G, args.algo, start, end, f)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+        print(f"{count} steps\n{summary}", file=sys.stderr)
+        return 0
+
+    if args.command == "show":
+        try:
+            trace = CompactTrace.load(args.trace)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+        print(json.dumps({"algorithm": trace.algorithm, "start": trace.start, "end": trace.end,
+                          "steps": len(trace)}, ensure_ascii=False))
+        for i in range(max(args.first, 0), min(args.first + args.count, len(trace))):
+            print(json.dumps(encode_step(trace[i]), ensure_ascii=False))
+        print(trace.summary)
+        return 0
+
+    try:
+        with open(args.jobs, encoding="utf-8") as f:
+            jobs = expand_jobs(json.load(f), args.out_dir, args.format)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    os.makedirs(args.out_dir, exist_ok=True)
+    failed = 0
+    began = time.perf_counter()
+    for job, outcome in run_batch(jobs, args.workers):
+        if isinstance(outcome, Exception):
+            failed += 1
+            print(f"{job['out']}\tFAILED: {outcome}", file=sys.stderr)
+        else:
+            out, count, seconds = outcome
+            print(f"{out}\t{count} steps\t{seconds:.2f}s")
+    print(f"{len(jobs) - failed}/{len(jobs)} job(s) done in {time.perf_counter() - began:.2f}s", file=sys.stderr)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
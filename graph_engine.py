@@ -0,0 +1,1862 @@
+# Graph algorithm engine: compact graph storage, step-trace generators,
+# trace replay and caches. It has no Streamlit / UI imports, so the CLI,
+# batch jobs and benchmarks can use it as well as app.py.
+import bisect
+import heapq
+import hashlib
+import sys
+import threading
+import time
+from array import array
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+
+import numpy as np
+
+# --------------------------
+# 1. Graph Storage & Traces
+# --------------------------
+
+class CSRGraph:
+    # Compact undirected graph: node labels are mapped to ids 0..n-1 and the
+    # neighbors of id u are targets[offsets[u]:offsets[u+1]] (weights alongside),
+    # in the same order networkx would report them. Each undirected edge is
+    # also listed once in edge_u / edge_v / edge_w (networkx edge order).
+    def __init__(self, labels, offsets, targets, weights):
+        self.labels = labels
+        self.index = {label: i for i, label in enumerate(labels)}
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+
+        sources = np.repeat(np.arange(len(labels), dtype=np.int64), np.diff(offsets))
+        once = targets >= sources
+        self.edge_u = sources[once]
+        self.edge_v = targets[once]
+        self.edge_w = weights[once]
+
+        # Plain-list views for the per-step Python loops of GraphAlgorithms
+        self.adj_offsets = offsets.tolist()
+        self.adj_targets = targets.tolist()
+        self.adj_weights = weights.tolist()
+
+        # rank[u] = position of labels[u] in sorted label order. Heaps use it
+        # to break ties exactly like comparing the labels themselves would.
+        try:
+            order = sorted(range(len(labels)), key=labels.__getitem__)
+        except TypeError:
+            order = sorted(range(len(labels)), key=lambda i: str(labels[i]))
+        self.sorted_ids = order
+        self.rank = [0] * len(labels)
+        for r, i in enumerate(order):
+            self.rank[i] = r
+
+        # (n, 2) float coordinates from the testcase "pos", or None
+        self.coords = None
+
+    @classmethod
+    def from_edges(cls, nodes, edges):
+        # nodes: iterable of labels, edges: iterable of (u, v, weight).
+        # A repeated edge keeps its first position and takes the last weight.
+        builder = GraphBuilder()
+        builder.add_nodes(nodes)
+        builder.add_edges(edges)
+        return builder.build()
+
+    @classmethod
+    def from_id_edges(cls, labels, src, dst, weights):
+        # Edges given as id arrays into `labels` (weights as an array or a
+        # list), e.g. from a generator; no per-edge Python work. A repeated
+        # edge keeps its first position and takes the last weight.
+        return cls(list(labels), *GraphBuilder._csr_arrays(len(labels), src, dst, weights))
+
+    @classmethod
+    def from_graph_data(cls, graph_data):
+        # graph_data["core"] (optional) is a bulk-imported CSRGraph; "nodes"
+        # and "edges" then hold the manual additions made on top of it
+        core = graph_data.get("core")
+        builder = GraphBuilder()
+        if core is not None:
+            if not graph_data["nodes"] and not graph_data["edges"] and not graph_data.get("pos"):
+                return core
+            builder.add_nodes(core.labels)
+            builder.add_edges(core.edges())
+        builder.add_nodes(graph_data["nodes"])
+        builder.add_edges((e['u'], e['v'], e['w']) for e in graph_data["edges"])
+        G = builder.build()
+        if core is not None and core.coords is not None and not graph_data.get("pos"):
+            # generated graphs keep their positions on the core; core nodes
+            # come first, added nodes have no position
+            G.coords = np.full((len(G.labels), 2), np.nan)
+            G.coords[:len(core.labels)] = core.coords
+        else:
+            G.set_positions(graph_data.get("pos"))
+        return G
+
+    @classmethod
+    def from_networkx(cls, G):
+        labels = list(G.nodes())
+        index = {n: i for i, n in enumerate(labels)}
+        offsets = [0]
+        targets = []
+        weights = []
+        for u in labels:
+            for v, d in G.adj[u].items():
+                targets.append(index[v])
+                weights.append(d['weight'])
+            offsets.append(len(targets))
+        return cls(
+            labels,
+            np.array(offsets, dtype=np.int64),
+            np.array(targets, dtype=np.int64),
+            np.array(weights) if weights else np.zeros(0, dtype=np.int64)
+        )
+
+    def set_positions(self, pos):
+        # pos: {label: (x, y)}. Nodes without a position get NaN coordinates.
+        if not pos:
+            self.coords = None
+        else:
+            nan = (float("nan"), float("nan"))
+            self.coords = np.array([pos.get(n, nan) for n in self.labels], dtype=np.float64).reshape(-1, 2)
+        self._fingerprint = None
+
+    def fingerprint(self):
+        # Content hash of labels, adjacency, weights and positions (computed once)
+        if getattr(self, "_fingerprint", None) is None:
+            h = hashlib.blake2b(digest_size=16)
+            h.update("\x00".join(map(repr, self.labels)).encode("utf-8"))
+            arrays = (self.offsets, self.targets, self.weights)
+            if self.coords is not None:
+                arrays += (self.coords,)
+            for arr in arrays:
+                h.update(str(arr.dtype).encode("ascii"))
+                h.update(np.ascontiguousarray(arr).tobytes())
+            self._fingerprint = h.hexdigest()
+        return self._fingerprint
+
+    def to_networkx(self):
+        import networkx as nx  # only needed here; keeps engine imports light
+        G = nx.Graph()
+        G.add_nodes_from(self.labels)
+        G.add_weighted_edges_from(self.edges())
+        return G
+
+    def has_edge(self, u, v):
+        if u not in self.index or v not in self.index:
+            return False
+        a, b = self.index[u], self.index[v]
+        return b in self.adj_targets[self.adj_offsets[a]:self.adj_offsets[a + 1]]
+
+    def edge_weight(self, u, v):
+        # Weight of edge u-v, or None if there is no such edge
+        a, b = self.index.get(u), self.index.get(v)
+        if a is None or b is None:
+            return None
+        for k in range(self.adj_offsets[a], self.adj_offsets[a + 1]):
+            if self.adj_targets[k] == b:
+                return self.adj_weights[k]
+        return None
+
+    def neighborhood(self, sources, max_nodes, max_hops):
+        # {node id: hop count} for the nodes within max_hops of the source
+        # labels, filled in BFS order and cut off at max_nodes
+        offsets, targets = self.adj_offsets, self.adj_targets
+        hops = {}
+        queue = deque()
+        for s in sources:
+            i = self.index.get(s)
+            if i is not None and i not in hops and len(hops) < max_nodes:
+                hops[i] = 0
+                queue.append(i)
+        while queue:
+            u = queue.popleft()
+            if hops[u] >= max_hops:
+                continue
+            for v in targets[offsets[u]:offsets[u + 1]]:
+                if v not in hops:
+                    if len(hops) >= max_nodes:
+                        return hops
+                    hops[v] = hops[u] + 1
+                    queue.append(v)
+        return hops
+
+    def subgraph(self, ids):
+        # CSRGraph on the given node ids (kept in that order) and the edges
+        # between them (kept in this graph's edge order)
+        keep = np.zeros(len(self.labels), dtype=bool)
+        keep[list(ids)] = True
+        mask = keep[self.edge_u] & keep[self.edge_v]
+        labels = self.labels
+        builder = GraphBuilder()
+        builder.add_nodes([labels[i] for i in ids])
+        builder.add_edge_columns(
+            [labels[u] for u in self.edge_u[mask].tolist()],
+            [labels[v] for v in self.edge_v[mask].tolist()],
+            self.edge_w[mask].tolist(),
+        )
+        return builder.build()
+
+    def number_of_nodes(self):
+        return len(self.labels)
+
+    def number_of_edges(self):
+        return len(self.edge_u)
+
+    def nodes(self):
+        return self.labels
+
+    def edges(self):
+        labels = self.labels
+        return [
+            (labels[u], labels[v], w)
+            for u, v, w in zip(self.edge_u.tolist(), self.edge_v.tolist(), self.edge_w.tolist())
+        ]
+
+
+class GraphBuilder:
+    # Streaming version of CSRGraph.from_edges: nodes and edges can be added
+    # in any number of batches (e.g. chunks of a large edge-list file) before
+    # build(). Labels get ids from a hash index; repeated edges are merged in
+    # build(), where each keeps its first position and takes its last weight.
+    def __init__(self):
+        self.index = {}
+        self.labels = []
+        self._src, self._dst, self._wts = [], [], []
+
+    def __len__(self):
+        return len(self._src)
+
+    def add_nodes(self, nodes):
+        index, labels = self.index, self.labels
+        for n in nodes:
+            if n not in index:
+                index[n] = len(labels)
+                labels.append(n)
+
+    def add_edges(self, edges):
+        # edges: iterable of (u, v, weight)
+        edges = list(edges)
+        if edges:
+            us, vs, ws = zip(*edges)
+            self.add_edge_columns(us, vs, ws)
+
+    def add_edge_columns(self, us, vs, ws):
+        # Same as add_edges(zip(us, vs, ws)), with the id lookups done in bulk
+        index, labels = self.index, self.labels
+        a = list(map(index.get, us))
+        b = list(map(index.get, vs))
+        if None in a or None in b:
+            # New labels get ids in order of first appearance (u before v)
+            missing = [i for i, (x, y) in enumerate(zip(a, b)) if x is None or y is None]
+            for i in missing:
+                if a[i] is None:
+                    x = index.get(us[i])
+                    if x is None:
+                        x = index[us[i]] = len(labels)
+                        labels.append(us[i])
+                    a[i] = x
+                if b[i] is None:
+                    x = index.get(vs[i])
+                    if x is None:
+                        x = index[vs[i]] = len(labels)
+                        labels.append(vs[i])
+                    b[i] = x
+        self._src.extend(a)
+        self._dst.extend(b)
+        self._wts.extend(ws)
+
+    def build(self):
+        return CSRGraph.from_id_edges(
+            self.labels, np.array(self._src, dtype=np.int64), np.array(self._dst, dtype=np.int64), self._wts
+        )
+
+    @staticmethod
+    def _csr_arrays(n, src, dst, wts):
+        # (offsets, targets, weights) from id columns, with repeats merged
+        if len(src):
+            # One row per undirected edge: first position, last weight
+            key = (np.minimum(src, dst) << 32) | np.maximum(src, dst)
+            by_key = np.argsort(key, kind="stable")
+            sorted_key = key[by_key]
+            starts = np.flatnonzero(np.r_[True, sorted_key[1:] != sorted_key[:-1]])
+            ends = np.r_[starts[1:], len(key)] - 1
+            first, last = by_key[starts], by_key[ends]
+            order = np.argsort(first)
+            first, last = first[order], last[order]
+            src, dst = src[first], dst[first]
+            if isinstance(wts, np.ndarray):
+                wts = wts[last]
+            else:
+                wts = np.array([wts[i] for i in last.tolist()])
+                if wts.dtype.kind == "f" and np.all(np.isfinite(wts)) and np.all(wts == np.rint(wts)):
+                    # e.g. ints mixed with floats like 2.0: keep an int column
+                    wts = wts.astype(np.int64)
+        else:
+            wts = np.zeros(0, dtype=np.int64)
+        # Two half-edges per edge (one for a self-loop), kept in insertion order
+        loop = src == dst
+        half_src = np.column_stack((src, dst)).ravel()
+        half_dst = np.column_stack((dst, src)).ravel()
+        half_w = np.repeat(wts, 2)
+        keep = ~np.repeat(loop, 2) | (np.arange(2 * len(src)) % 2 == 0)
+        half_src, half_dst, half_w = half_src[keep], half_dst[keep], half_w[keep]
+
+        order = np.argsort(half_src, kind="stable")
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(half_src, minlength=n), out=offsets[1:])
+        return offsets, half_dst[order], half_w[order]
+
+def collect_steps(step_iter):
+    # Run a step generator to the end and return (steps, *result)
+    steps = []
+    append = steps.append
+    try:
+        while True:
+            append(next(step_iter))
+    except StopIteration as stop:
+        return (steps,) + tuple(stop.value or ())
+
+class LazyTrace:
+    # A step list backed by a step generator. Steps are produced only as far
+    # as they are read (or by ensure/drain/background fill), so the first
+    # steps are available before the whole trace exists. Once the generator
+    # finishes, `result` holds its return value and `summary` the text from
+    # `summarize(*result)`. `stats()` gives the algorithm's operation counters
+    # so far (heap pushes, relaxations, ...). Safe to share between threads.
+    def __init__(self, step_iter, summarize=None, stats=None):
+        self._iter = step_iter
+        self._steps = []
+        self._lock = threading.Lock()
+        self._summarize = summarize
+        self._stats = stats
+        self.complete = False
+        self.result = None
+        self.summary = ""
+        # CPU seconds spent producing steps (time.thread_time of the thread
+        # that ran them, so waiting for the GIL or other threads is not counted)
+        self.elapsed = 0.0
+
+    def stats(self):
+        return dict(self._stats()) if self._stats is not None else {}
+
+    def __len__(self):
+        # Number of steps produced so far
+        return len(self._steps)
+
+    def __getitem__(self, i):
+        if i < 0:
+            self.drain()
+        elif i >= len(self._steps):
+            self.ensure(i + 1)
+        return self._steps[i]
+
+    def ensure(self, count):
+        # Produce steps until there are `count` of them (or the trace ends);
+        # returns how many steps are available.
+        if len(self._steps) >= count or self.complete:
+            return len(self._steps)
+        with self._lock:
+            append = self._steps.append
+            started = time.thread_time()
+            try:
+                while not self.complete and len(self._steps) < count:
+                    append(next(self._iter))
+            except StopIteration as stop:
+                self.elapsed += time.thread_time() - started
+                self._finish(stop.value)
+            else:
+                self.elapsed += time.thread_time() - started
+        return len(self._steps)
+
+    def drain(self):
+        self.ensure(float('inf'))
+        return self._steps
+
+    def _finish(self, result):
+        self.result = tuple(result or ())
+        if self._summarize is not None:
+            self.summary = self._summarize(*self.result)
+        self._iter = None
+        self.complete = True
+
+    def fill(self, chunk=5000, on_complete=None):
+        # Produce the rest of the trace, `chunk` steps per lock hold so
+        # readers on other threads are never blocked for long
+        while not self.complete:
+            self.ensure(len(self._steps) + chunk)
+        if on_complete is not None:
+            on_complete()
+
+    def start_background_fill(self, chunk=5000, on_complete=None):
+        # fill() on a daemon thread
+        thread = threading.Thread(target=self.fill, args=(chunk, on_complete), name="trace-fill", daemon=True)
+        thread.start()
+        return thread
+
+class DisjointSet:
+    # Array-backed union-find over ids 0..n-1 with union by rank and
+    # iterative path compression (no recursion, so long chains are fine)
+    def __init__(self, n):
+        self.parent = list(range(n))
+        self.rank = [0] * n
+
+    def find(self, x): #หาว่าอยู่กลุ่มไหน
+        parent = self.parent
+        root = x
+        while parent[root] != root: #เดินขึ้นไปจนเจอราก
+            root = parent[root]
+        while parent[x] != root: #ชี้ทุกโหนดบนเส้นทางไปที่รากโดยตรง
+            parent[x], x = root, parent[x]
+        return root
+
+    def union(self, a, b):
+        root1, root2 = self.find(a), self.find(b)
+        if root1 == root2: #อยู่กลุ่มเดียวกันแล้ว เชื่อมจะเกิด cycle
+            return False
+        rank = self.rank
+        if rank[root1] < rank[root2]: #เอาต้นไม้ที่เตี้ยกว่าไปต่อใต้ต้นที่สูงกว่า
+            root1, root2 = root2, root1
+        self.parent[root2] = root1
+        if rank[root1] == rank[root2]:
+            rank[root1] += 1
+        return True
+
+class IndexedMinPQ:
+    # Binary min-heap over ids 0..n-1 with one entry per id and decrease-key.
+    # heap holds ids, pos[i] is the heap slot of id i (-1 if absent), and
+    # ties on key are broken by tiebreak[i].
+    def __init__(self, n, tiebreak):
+        self.heap = []
+        self.pos = [-1] * n
+        self.keys = [None] * n
+        self.tiebreak = tiebreak
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, i):
+        return self.pos[i] >= 0
+
+    def _less(self, a, b):
+        ka, kb = self.keys[a], self.keys[b]
+        return ka < kb or (ka == kb and self.tiebreak[a] < self.tiebreak[b])
+
+    def _swap(self, x, y):
+        heap, pos = self.heap, self.pos
+        heap[x], heap[y] = heap[y], heap[x]
+        pos[heap[x]] = x
+        pos[heap[y]] = y
+
+    def _up(self, x):
+        while x > 0:
+            parent = (x - 1) // 2
+            if not self._less(self.heap[x], self.heap[parent]):
+                break
+            self._swap(x, parent)
+            x = parent
+
+    def _down(self, x):
+        n = len(self.heap)
+        while True:
+            child = 2 * x + 1
+            if child >= n:
+                break
+            if child + 1 < n and self._less(self.heap[child + 1], self.heap[child]):
+                child += 1
+            if not self._less(self.heap[child], self.heap[x]):
+                break
+            self._swap(x, child)
+            x = child
+
+    def push(self, i, key):
+        self.keys[i] = key
+        self.pos[i] = len(self.heap)
+        self.heap.append(i)
+        self._up(self.pos[i])
+
+    def decrease_key(self, i, key):
+        self.keys[i] = key
+        self._up(self.pos[i])
+
+    def pop(self):
+        top = self.heap[0]
+        last = self.heap.pop()
+        self.pos[top] = -1
+        if self.heap:
+            self.heap[0] = last
+            self.pos[last] = 0
+            self._down(0)
+        return top, self.keys[top]
+
+class GraphAlgorithms:
+    def __init__(self, G):
+        # Algorithms run on the compact CSRGraph; a networkx graph is converted once
+        if not isinstance(G, CSRGraph):
+            G = CSRGraph.from_networkx(G)
+        self.G = G
+        self.stats = {}  # operation counts of the last run (e.g. heap sizes)
+
+    # Each iter_*_steps method is a generator: it yields the steps one at a
+    # time and returns the result tuple at the end. The get_*_steps methods
+    # run it to completion and return (steps, *result).
+
+    def get_dfs_steps(self, start_node):
+        return collect_steps(self.iter_dfs_steps(start_node))
+
+    def get_bfs_steps(self, start_node):
+        return collect_steps(self.iter_bfs_steps(start_node))
+
+    def get_bfs_level_steps(self, start_node):
+        return collect_steps(self.iter_bfs_level_steps(start_node))
+
+    def get_dijkstra_steps(self, start, end):
+        return collect_steps(self.iter_dijkstra_steps(start, end))
+
+    def get_spt_path_steps(self, start, end, tree):
+        return collect_steps(self.iter_spt_path_steps(start, end, tree))
+
+    def get_astar_steps(self, start, end):
+        return collect_steps(self.iter_astar_steps(start, end))
+
+    def get_bidirectional_dijkstra_steps(self, start, end):
+        return collect_steps(self.iter_bidirectional_dijkstra_steps(start, end))
+
+    def get_mst_steps(self, algo="kruskal", start_node=None):
+        return collect_steps(self.iter_mst_steps(algo, start_node))
+
+    def iter_dfs_steps(self, start_node):
+        # Iterative DFS with an explicit stack (no recursion limit on deep graphs).
+        # Each stack entry is [u, k]: k is the next neighbor slot of u to check,
+        # so the steps and visiting order are the same as the recursive version.
+        labels = self.G.labels
+        offsets, targets = self.G.adj_offsets, self.G.adj_targets
+        visited = [False] * len(labels)
+        traversal_order = [] 
+        if start_node is not None: #  เริ่มต้นกระบวนการทั้งหมด จากจุดเริ่มต้น
+            s = self.G.index[start_node]
+            visited[s] = True #  ประทับตราว่า "ถึงโหนด s แล้วนะ" ลงในสมุดบันทึก visited
+            traversal_order.append(start_node) #  เพิ่ม s เข้าไปในลิสต์สรุปผล
+            yield ("node", start_node, f"Visit Node {start_node}") 
+            stack = [[s, offsets[s]]]
+            while stack:
+                top = stack[-1]
+                u, k = top
+                end = offsets[u + 1]
+                while k < end and visited[targets[k]]: #  ข้ามเพื่อนบ้านที่เคยไปหาแล้ว
+                    k += 1
+                if k == end: #  เพื่อนบ้านของ u ครบแล้ว ถอยกลับ (backtrack)
+                    stack.pop()
+                    continue
+                v = targets[k]
+                top[1] = k + 1 #  กลับมาที่ u เมื่อไหร่ให้เช็กเพื่อนคนถัดไป
+                yield ("edge", (labels[u], labels[v]), f"Explore Edge {labels[u]}-{labels[v]}") #  บันทึก Step: บอกระบบกราฟว่า "กำลังจะวิ่งผ่านเส้น u->v" (เส้นจะไฮไลต์)
+                visited[v] = True
+                traversal_order.append(labels[v])
+                yield ("node", labels[v], f"Visit Node {labels[v]}") 
+                stack.append([v, offsets[v]]) #  กระโดดไปที่ v ต่อ
+        return (traversal_order,)
+
+    def iter_bfs_steps(self, start_node):
+        labels = self.G.labels
+        offsets, targets = self.G.adj_offsets, self.G.adj_targets
+        visited = [False] * len(labels)
+        traversal_order = []
+        s = self.G.index[start_node]
+        queue = deque([s]) #สร้างคิว และใส่จุดเริ่มต้นเข้าไปเป็นคนแรก
+        visited[s] = True # ประทับตราทันทีว่าจุดเริ่มต้น "จองแล้ว" (กันคนอื่นใส่ซ้ำเข้าคิว)
+        yield ("node", start_node, f"Start at {start_node}") 
+        
+        while queue: #วนลูป "ตราบใดที่ในคิวยังมีโหนดเหลืออยู่" (ถ้าคิวว่างคือจบ)
+            u = queue.popleft() #  ดึงโหนด "คนแรกสุด" ออกจากคิว (First-In, First-Out) มาเป็น u
+            traversal_order.append(labels[u]) #  บันทึกว่าเรา process โหนด u แล้ว
+            for k in range(offsets[u], offsets[u + 1]): # Loop เพื่อนบ้าน: ดูเพื่อน (v) ทุกคนของ u
+                v = targets[k]
+                if not visited[v]: #  ถ้าเพื่อนคนนี้ (v) ยังไม่เคยถูกจอง (ไม่อยู่ใน visited)
+                    visited[v] = True # (Mark visited) เพื่อไม่ให้โหนดอื่นใส่ v เข้าคิวซ้ำ
+                    yield ("edge", (labels[u], labels[v]), f"Discover Edge {labels[u]}-{labels[v]}") 
+                    yield ("node", labels[v], f"Visit Node {labels[v]}") 
+                    queue.append(v) # 15. เอา v ไปต่อท้ายแถวในคิว (รอรอบถัดไป)
+        return (traversal_order,)
+
+    def iter_bfs_level_steps(self, start_node):
+        # Level-synchronous BFS: the whole frontier is expanded at once with
+        # NumPy gathers over the CSR arrays, and each level is logged as a
+        # single ("level", (nodes, edges), msg) step. Within a level nodes keep
+        # first-discovery order, so traversal_order matches get_bfs_steps.
+        labels = self.G.labels
+        offsets, targets = self.G.offsets, self.G.targets
+        s = self.G.index[start_node]
+        visited = np.zeros(len(labels), dtype=bool)
+        visited[s] = True
+        traversal_order = [start_node]
+        yield ("node", start_node, f"Start at {start_node}")
+
+        frontier = np.array([s], dtype=np.int64)
+        depth = 0
+        while frontier.size:
+            starts = offsets[frontier]
+            counts = offsets[frontier + 1] - starts
+            total = int(counts.sum())
+            if total == 0:
+                break
+            # Slot indexes of every neighbor of every frontier node, in order
+            parents = np.repeat(frontier, counts)
+            slots = np.repeat(starts - (np.cumsum(counts) - counts), counts) + np.arange(total)
+            found = targets[slots]
+            fresh = ~visited[found]
+            found, parents = found[fresh], parents[fresh]
+            _, first = np.unique(found, return_index=True)
+            first.sort()
+            frontier, parents = found[first], parents[first]
+            if not frontier.size:
+                break
+            visited[frontier] = True
+            depth += 1
+
+            level_nodes = [labels[v] for v in frontier.tolist()]
+            level_edges = [(labels[u], labels[v]) for u, v in zip(parents.tolist(), frontier.tolist())]
+            traversal_order.extend(level_nodes)
+            yield (
+                "level",
+                (tuple(level_nodes), tuple(level_edges)),
+                f"Level {depth}: discovered {len(level_nodes)} node(s)"
+            )
+        return (traversal_order,)
+
+    def iter_dijkstra_steps(self, start, end):
+        # Dijkstra implementation that logs steps for visualization.
+        # The 4th item of every step is a delta: only the distance entries that
+        # step changed. Use reconstruct_distances() to rebuild the full table.
+        # Heap entries carry the label rank so ties pop in label order.
+        labels, rank = self.G.labels, self.G.rank
+        offsets, targets, weights = self.G.adj_offsets, self.G.adj_targets, self.G.adj_weights
+        s, t = self.G.index[start], self.G.index[end]
+        pq = [(0, rank[s], s)]
+        distances = [float('inf')] * len(labels)
+        distances[s] = 0
+        visited = [False] * len(labels)
+        prev = [None] * len(labels)
+        stats = self.stats = {"settled": 0, "heap_pushes": 1, "heap_pops": 0, "relaxations": 0}
+        
+        yield ("node", start, f"Start at {start}, Dist: 0", {start: 0})
+        
+        while pq:
+            d, _, u = heapq.heappop(pq)
+            stats["heap_pops"] += 1
+            
+            if visited[u]:
+                continue
+            visited[u] = True
+            stats["settled"] += 1
+            yield ("current", labels[u], f"Processing Node {labels[u]} (Dist: {d})", {})
+            
+            if u == t:
+                yield ("finished", labels[u], f"Reached Target {labels[u]}!", {})
+                break
+            
+            for k in range(offsets[u], offsets[u + 1]):
+                v, weight = targets[k], weights[k]
+                yield ("check_edge", (labels[u], labels[v]), f"Check neighbor {labels[v]} via {labels[u]} (Weight: {weight})", {})
+                
+                if distances[u] + weight < distances[v]:
+                    distances[v] = distances[u] + weight
+                    prev[v] = u
+                    heapq.heappush(pq, (distances[v], rank[v], v))
+                    stats["heap_pushes"] += 1
+                    stats["relaxations"] += 1
+                    yield ("update", labels[v], f"Update {labels[v]} Distance: {distances[v]}", {labels[v]: distances[v]})
+        
+        # --- Reconstruct Shortest Path ---
+        path_nodes = []
+        if distances[t] != float('inf'):
+            cur = t
+            while cur is not None:
+                path_nodes.append(labels[cur])
+                if cur == s:
+                    break
+                cur = prev[cur]
+            path_nodes.reverse()
+            
+            if path_nodes and path_nodes[0] == start:
+                yield from self._iter_path_steps(path_nodes)
+        
+        return distances[t], path_nodes
+
+    def shortest_path_tree(self, start):
+        # Full single-source Dijkstra without step logging: (distances, prev)
+        # lists indexed by node id. Same heap order as iter_dijkstra_steps.
+        rank = self.G.rank
+        offsets, targets, weights = self.G.adj_offsets, self.G.adj_targets, self.G.adj_weights
+        n = len(self.G.labels)
+        s = self.G.index[start]
+        distances = [float('inf')] * n
+        distances[s] = 0
+        prev = [None] * n
+        visited = [False] * n
+        pq = [(0, rank[s], s)]
+        while pq:
+            d, _, u = heapq.heappop(pq)
+            if visited[u]:
+                continue
+            visited[u] = True
+            for k in range(offsets[u], offsets[u + 1]):
+                v = targets[k]
+                nd = d + weights[k]
+                if nd < distances[v]:
+                    distances[v] = nd
+                    prev[v] = u
+                    heapq.heappush(pq, (nd, rank[v], v))
+        return distances, prev
+
+    def dfs_order(self, start_node):
+        # Visiting order of iter_dfs_steps without step logging
+        labels = self.G.labels
+        offsets, targets = self.G.adj_offsets, self.G.adj_targets
+        visited = [False] * len(labels)
+        s = self.G.index[start_node]
+        visited[s] = True
+        order = [s]
+        stack = [[s, offsets[s]]]
+        while stack:
+            top = stack[-1]
+            u, k = top
+            end = offsets[u + 1]
+            while k < end and visited[targets[k]]:
+                k += 1
+            if k == end:
+                stack.pop()
+                continue
+            v = targets[k]
+            top[1] = k + 1
+            visited[v] = True
+            order.append(v)
+            stack.append([v, offsets[v]])
+        return [labels[i] for i in order]
+
+    def bfs_order(self, start_node):
+        # Visiting order of iter_bfs_steps without step logging
+        labels = self.G.labels
+        offsets, targets = self.G.adj_offsets, self.G.adj_targets
+        visited = [False] * len(labels)
+        s = self.G.index[start_node]
+        visited[s] = True
+        order = [s]
+        i = 0
+        while i < len(order):
+            u = order[i]
+            i += 1
+            for k in range(offsets[u], offsets[u + 1]):
+                v = targets[k]
+                if not visited[v]:
+                    visited[v] = True
+                    order.append(v)
+        return [labels[i] for i in order]
+
+    def minimum_spanning_tree(self, algo="kruskal", start_node=None):
+        # (weight, edges) of iter_mst_steps("kruskal" / "prim") without step
+        # logging; same edge order and tie-breaking
+        labels = self.G.labels
+        mst_edges = []
+        mst_weight = 0
+        if algo == "kruskal":
+            order = np.argsort(self.G.edge_w, kind="stable")
+            dsu = DisjointSet(len(labels))
+            for a, b, w in zip(self.G.edge_u[order].tolist(), self.G.edge_v[order].tolist(),
+                               self.G.edge_w[order].tolist()):
+                if dsu.union(a, b):
+                    mst_weight += w
+                    mst_edges.append((labels[a], labels[b], w))
+            return mst_weight, mst_edges
+
+        if start_node is None:
+            if not labels:
+                return 0, []
+            start_node = labels[0]
+        offsets, targets, weights = self.G.adj_offsets, self.G.adj_targets, self.G.adj_weights
+        rank, by_rank = self.G.rank, self.G.sorted_ids
+        s = self.G.index[start_node]
+        visited = [False] * len(labels)
+        visited[s] = True
+        num_visited = 1
+        pq = [(weights[k], rank[s], rank[targets[k]]) for k in range(offsets[s], offsets[s + 1])]
+        heapq.heapify(pq)
+        while pq and num_visited < len(labels):
+            w, ru, rv = heapq.heappop(pq)
+            v = by_rank[rv]
+            if visited[v]:
+                continue
+            visited[v] = True
+            num_visited += 1
+            mst_weight += w
+            mst_edges.append((labels[by_rank[ru]], labels[v], w))
+            for k in range(offsets[v], offsets[v + 1]):
+                x = targets[k]
+                if not visited[x]:
+                    heapq.heappush(pq, (weights[k], rank[v], rank[x]))
+        return mst_weight, mst_edges
+
+    def iter_spt_path_steps(self, start, end, tree):
+        # Answer one start-end query from a precomputed shortest_path_tree(start):
+        # only the path walk, O(path length) per target. The steps carry the
+        # distances of the path nodes; the full table is read from the tree.
+        labels = self.G.labels
+        distances, prev = tree
+        s, t = self.G.index[start], self.G.index[end]
+        yield ("node", start, f"Shortest-path tree from {start}", {start: 0})
+
+        path_nodes = []
+        path_dist = {}
+        if distances[t] != float('inf'):
+            yield ("finished", end, f"Reached Target {end}! (Dist: {distances[t]})", {})
+            cur = t
+            while cur is not None:
+                path_nodes.append(labels[cur])
+                path_dist[labels[cur]] = distances[cur]
+                cur = prev[cur] if cur != s else None
+            path_nodes.reverse()
+            yield from self._iter_path_steps(path_nodes, path_dist)
+
+        return distances[t], path_nodes
+
+    @staticmethod
+    def _iter_path_steps(path_nodes, path_dist=None):
+        # Final highlight of a shortest path: its edges, then its nodes.
+        # path_dist (optional) adds each node's distance as the step delta.
+        for u, v in zip(path_nodes, path_nodes[1:]):
+            yield ("edge", (u, v), f"Shortest Path Edge: {u}-{v}", {})
+        for n in path_nodes:
+            yield ("node", n, f"On Shortest Path: {n}", {n: path_dist[n]} if path_dist else {})
+
+    def euclidean_heuristic(self, t):
+        # h(v) = factor * straight-line distance from v to t, where factor is the
+        # smallest weight per unit of length over all edges. Every path then costs
+        # at least factor * its drawn length >= h, so h never overestimates (and is
+        # consistent). Returns zeros (plain Dijkstra) if any position is missing.
+        n = len(self.G.labels)
+        coords = self.G.coords
+        if coords is None or np.isnan(coords).any() or len(self.G.edge_u) == 0:
+            return [0.0] * n, 0.0
+        span = np.hypot(*(coords[self.G.edge_u] - coords[self.G.edge_v]).T)
+        drawn = span > 0
+        if not drawn.any():
+            return [0.0] * n, 0.0
+        factor = max(float(np.min(self.G.edge_w[drawn] / span[drawn])), 0.0)
+        factor *= 1 - 1e-9  # margin so float rounding cannot overestimate
+        return (factor * np.hypot(*(coords - coords[t]).T)).tolist(), factor
+
+    def iter_astar_steps(self, start, end):
+        # A*: Dijkstra ordered by dist + euclidean_heuristic(). Same steps and
+        # distance deltas as iter_dijkstra_steps, but nodes away from the target
+        # are settled later (or never), so fewer nodes are processed.
+        labels, rank = self.G.labels, self.G.rank
+        offsets, targets, weights = self.G.adj_offsets, self.G.adj_targets, self.G.adj_weights
+        s, t = self.G.index[start], self.G.index[end]
+        h, factor = self.euclidean_heuristic(t)
+        pq = [(h[s], h[s], rank[s], s)]  # ties on f go to the node nearer the target
+        distances = [float('inf')] * len(labels)
+        distances[s] = 0
+        visited = [False] * len(labels)
+        prev = [None] * len(labels)
+        stats = self.stats = {"settled": 0, "heuristic_factor": factor, "heap_pushes": 1, "heap_pops": 0, "relaxations": 0}
+
+        yield ("node", start, f"Start at {start}, Dist: 0", {start: 0})
+
+        while pq:
+            f, _, _, u = heapq.heappop(pq)
+            stats["heap_pops"] += 1
+
+            if visited[u]:
+                continue
+            visited[u] = True
+            stats["settled"] += 1
+            yield ("current", labels[u], f"Processing Node {labels[u]} (Dist: {distances[u]}, Estimate: {f:.1f})", {})
+
+            if u == t:
+                yield ("finished", labels[u], f"Reached Target {labels[u]}!", {})
+                break
+
+            for k in range(offsets[u], offsets[u + 1]):
+                v, weight = targets[k], weights[k]
+                yield ("check_edge", (labels[u], labels[v]), f"Check neighbor {labels[v]} via {labels[u]} (Weight: {weight})", {})
+
+                if distances[u] + weight < distances[v]:
+                    distances[v] = distances[u] + weight
+                    prev[v] = u
+                    heapq.heappush(pq, (distances[v] + h[v], h[v], rank[v], v))
+                    stats["heap_pushes"] += 1
+                    stats["relaxations"] += 1
+                    yield ("update", labels[v], f"Update {labels[v]} Distance: {distances[v]} (Estimate: {distances[v] + h[v]:.1f})", {labels[v]: distances[v]})
+
+        path_nodes = []
+        if distances[t] != float('inf'):
+            cur = t
+            while cur is not None:
+                path_nodes.append(labels[cur])
+                cur = prev[cur] if cur != s else None
+            path_nodes.reverse()
+            yield from self._iter_path_steps(path_nodes)
+
+        return distances[t], path_nodes
+
+    def iter_bidirectional_dijkstra_steps(self, start, end):
+        # Two Dijkstra searches, forward from start and backward from end. Each
+        # round settles one node on the side whose queue head is smaller; mu is
+        # the best start-end distance seen where the frontiers touch. Once the two
+        # queue heads add up to mu or more no shorter path can exist.
+        # The distance deltas follow the forward search only; the final path steps
+        # fill in the distances of the path nodes reached from the end side.
+        labels, rank = self.G.labels, self.G.rank
+        offsets, targets, weights = self.G.adj_offsets, self.G.adj_targets, self.G.adj_weights
+        n = len(labels)
+        s, t = self.G.index[start], self.G.index[end]
+        inf = float('inf')
+        dist = ([inf] * n, [inf] * n)
+        dist[0][s] = dist[1][t] = 0
+        prev = ([None] * n, [None] * n)
+        visited = ([False] * n, [False] * n)
+        pq = ([(0, rank[s], s)], [(0, rank[t], t)])
+        side_name = ("forward", "backward")
+        # meet = (a, b): the edge joining the forward node a and the backward node b
+        mu, meet = (0, (s, s)) if s == t else (inf, None)
+        stats = self.stats = {"settled": 0, "heap_pushes": 2, "heap_pops": 0, "relaxations": 0}
+
+        yield ("node", start, f"Start at {start}, Dist: 0", {start: 0})
+        if s != t:
+            yield ("node", end, f"Start backward search at {end}, Dist: 0", {})
+
+        while True:
+            for side in (0, 1):
+                while pq[side] and visited[side][pq[side][0][2]]:
+                    heapq.heappop(pq[side])
+                    stats["heap_pops"] += 1
+            if not pq[0] or not pq[1] or pq[0][0][0] + pq[1][0][0] >= mu:
+                break
+            side = 0 if pq[0][0][0] <= pq[1][0][0] else 1
+            d, _, u = heapq.heappop(pq[side])
+            stats["heap_pops"] += 1
+            visited[side][u] = True
+            stats["settled"] += 1
+            own, other = dist[side], dist[1 - side]
+            yield ("current", labels[u], f"Processing Node {labels[u]} ({side_name[side]}, Dist: {d})", {})
+
+            for k in range(offsets[u], offsets[u + 1]):
+                v, weight = targets[k], weights[k]
+                yield ("check_edge", (labels[u], labels[v]), f"Check neighbor {labels[v]} via {labels[u]} ({side_name[side]}, Weight: {weight})", {})
+
+                if d + weight < own[v]:
+                    own[v] = d + weight
+                    prev[side][v] = u
+                    heapq.heappush(pq[side], (own[v], rank[v], v))
+                    stats["heap_pushes"] += 1
+                    stats["relaxations"] += 1
+                    if side == 0:
+                        yield ("update", labels[v], f"Update {labels[v]} Distance: {own[v]}", {labels[v]: own[v]})
+                    else:
+                        yield ("update", labels[v], f"Update {labels[v]} Distance to {end}: {own[v]}", {})
+                if d + weight + other[v] < mu:
+                    mu = d + weight + other[v]
+                    meet = (u, v) if side == 0 else (v, u)
+
+        path_nodes = []
+        if meet is not None:
+            a, b = meet
+            yield ("finished", labels[a], f"Searches met at {labels[a]}-{labels[b]}! (Dist: {mu})", {})
+            forward = []
+            cur = a
+            while cur is not None:
+                forward.append(cur)
+                cur = prev[0][cur] if cur != s else None
+            backward = []
+            cur = b if b != a else None
+            while cur is not None:
+                backward.append(cur)
+                cur = prev[1][cur] if cur != t else None
+            path = forward[::-1] + backward
+            path_nodes = [labels[i] for i in path]
+            path_dist = {labels[i]: dist[0][i] for i in forward}
+            path_dist.update({labels[i]: mu - dist[1][i] for i in backward})
+            yield from self._iter_path_steps(path_nodes, path_dist)
+
+        return mu, path_nodes
+
+    @staticmethod
+    def reconstruct_distances(steps, step_idx, nodes):
+        # Rebuild the full distance table as it was after steps[step_idx]
+        # by replaying the per-step deltas on top of an all-infinity table.
+        distances = {node: float('inf') for node in nodes}
+        for i in range(step_idx + 1):
+            step = steps[i]
+            if len(step) > 3:
+                distances.update(step[3])
+        return distances
+
+    def iter_mst_steps(self, algo="kruskal", start_node=None):
+        mst_edges = []
+        labels = self.G.labels
+        
+        if algo == "kruskal":
+            # Stable NumPy argsort over the weight array (ties keep edge order)
+            order = np.argsort(self.G.edge_w, kind="stable") #นำทุกเส้นมาเรียงจากน้อยไปมาก
+            edges = zip(
+                self.G.edge_u[order].tolist(),
+                self.G.edge_v[order].tolist(),
+                self.G.edge_w[order].tolist()
+            )
+            dsu = DisjointSet(len(labels)) #การกำหนดค่าเริ่มต้นให้แต่ละโหนดเป็นเซตอิสระ
+            # each union() call is two finds; "unions" counts the merges
+            stats = self.stats = {"union_calls": 0, "unions": 0}
+            
+            mst_weight = 0
+            for a, b, w in edges:
+                u, v = labels[a], labels[b]
+                yield ("check_edge", (u, v), f"Checking Edge {u}-{v} (W: {w})") ##visual
+                stats["union_calls"] += 1
+                if dsu.union(a, b):
+                    stats["unions"] += 1
+                    mst_weight += w #บวกน้ำหนัก
+                    mst_edges.append((u, v, w)) #เส้นที่ถูกเลือกจริง
+                    yield ("add_edge", (u, v), f"Added Edge {u}-{v} to MST") #visual
+                    yield ("node", u, "")
+                    yield ("node", v, "")
+                else:
+                    yield ("skip", (u, v), f"Skipped {u}-{v} (Cycle detected)") #visual
+            return mst_weight, mst_edges
+            
+        elif algo == "prim":
+            # Manual Prim Implementation for Step Visualization
+            if start_node is None: #ถ้าไม่ได้เลือกโหนด strat ให้เลือกตัวแรก
+                if self.G.number_of_nodes() > 0:
+                    start_node = labels[0]
+                else:
+                    return 0, []
+
+            offsets, targets, weights = self.G.adj_offsets, self.G.adj_targets, self.G.adj_weights
+            rank, by_rank = self.G.rank, self.G.sorted_ids
+            s = self.G.index[start_node]
+            visited = [False] * len(labels) #เอาstart โหนดเข้า visted 
+            visited[s] = True
+            num_visited = 1
+            yield ("node", start_node, f"Start Prim at {start_node}") # visual
+            
+            # PQ stores (weight, rank[u], rank[v]) where u is in MST, v is candidate
+            pq = [] #เก็บเส้นที่รอดำเนินการ
+            stats = self.stats = {"heap_pushes": 0, "heap_pops": 0, "heap_peak": 0}
+            for k in range(offsets[s], offsets[s + 1]): #วนลูปดูโหนดที่เชื่อมกับ startโหนด
+                v, w = targets[k], weights[k] #ดึงค่าน้ำหนัดที่เส้นเชื่อมนั้น
+                heapq.heappush(pq, (w, rank[s], rank[v]))#เอาเข้า pq เรียงโดยดุจาก w ที่น้อยที่สุด
+                stats["heap_pushes"] += 1
+                stats["heap_peak"] = max(stats["heap_peak"], len(pq))
+                yield ("check_edge", (start_node, labels[v]), f"Add potential edge {start_node}-{labels[v]} (W: {w})") #บันทึกประวัติการเพิ่มเส้นเชื่อมทางเลือก visual
+            
+            mst_weight = 0
+            
+            while pq and num_visited < len(labels):
+                w, ru, rv = heapq.heappop(pq)
+                stats["heap_pops"] += 1
+                u, v = by_rank[ru], by_rank[rv]
+                
+                if visited[v]:
+                    # Edge goes to already visited node -> Skip (Cycle)
+                    continue
+                
+                # Add v to MST
+                visited[v] = True
+                num_visited += 1
+                mst_weight += w
+                mst_edges.append((labels[u], labels[v], w))
+                
+                yield ("add_edge", (labels[u], labels[v]), f"Select Edge {labels[u]}-{labels[v]} (W: {w})")
+                yield ("node", labels[v], f"Visit Node {labels[v]}")
+                
+                # Add neighbors of v to PQ
+                for k in range(offsets[v], offsets[v + 1]):
+                    neighbor = targets[k]
+                    if not visited[neighbor]:
+                        new_w = weights[k]
+                        heapq.heappush(pq, (new_w, rank[v], rank[neighbor]))
+                        stats["heap_pushes"] += 1
+                        stats["heap_peak"] = max(stats["heap_peak"], len(pq))
+                        yield ("check_edge", (labels[v], labels[neighbor]), f"Add potential edge {labels[v]}-{labels[neighbor]} (W: {new_w})")
+            
+            return mst_weight, mst_edges
+
+        elif algo == "prim_eager":
+            # Eager Prim: an indexed heap keeps one entry per non-tree node,
+            # keyed by its lightest known edge into the tree (decrease-key),
+            # so the heap never holds more than V entries.
+            if start_node is None:
+                if self.G.number_of_nodes() > 0:
+                    start_node = labels[0]
+                else:
+                    return 0, []
+
+            offsets, targets, weights = self.G.adj_offsets, self.G.adj_targets, self.G.adj_weights
+            s = self.G.index[start_node]
+            in_tree = [False] * len(labels)
+            edge_to = [None] * len(labels)  # tree endpoint of the best edge to each node
+            pq = IndexedMinPQ(len(labels), self.G.rank)
+            stats = self.stats = {"heap_pushes": 0, "heap_pops": 0, "heap_peak": 0, "decrease_keys": 0}
+            mst_weight = 0
+
+            pq.push(s, 0)
+            stats["heap_pushes"] += 1
+            stats["heap_peak"] = 1
+            while pq:
+                v, w = pq.pop()
+                stats["heap_pops"] += 1
+                in_tree[v] = True
+                if edge_to[v] is None:
+                    yield ("node", labels[v], f"Start Prim at {labels[v]}")
+                else:
+                    u = edge_to[v]
+                    mst_weight += w
+                    mst_edges.append((labels[u], labels[v], w))
+                    yield ("add_edge", (labels[u], labels[v]), f"Select Edge {labels[u]}-{labels[v]} (W: {w})")
+                    yield ("node", labels[v], f"Visit Node {labels[v]}")
+
+                for k in range(offsets[v], offsets[v + 1]):
+                    x, new_w = targets[k], weights[k]
+                    if in_tree[x]:
+                        continue
+                    if x not in pq:
+                        edge_to[x] = v
+                        pq.push(x, new_w)
+                        stats["heap_pushes"] += 1
+                        stats["heap_peak"] = max(stats["heap_peak"], len(pq))
+                        yield ("key_update", (labels[v], labels[x]), f"Set key of {labels[x]} = {new_w} via {labels[v]}")
+                    elif new_w < pq.keys[x]:
+                        old_w = pq.keys[x]
+                        edge_to[x] = v
+                        pq.decrease_key(x, new_w)
+                        stats["decrease_keys"] += 1
+                        yield ("key_update", (labels[v], labels[x]), f"Decrease key of {labels[x]}: {old_w} -> {new_w} via {labels[v]}")
+
+            return mst_weight, mst_edges
+
+    # --- Dynamic updates after a single edge edit ---
+    # self.G is the graph after the edit: edge u-v was added with weight w
+    # (old_w None) or reweighted from old_w to w. The previous result is
+    # repaired instead of recomputed, and the short trace shows only the
+    # part that changed.
+
+    def iter_mst_update_steps(self, mst_edges, u, v, w, old_w=None):
+        # Cycle replacement on an MST / spanning forest given as (u, v, w)
+        # label tuples. A new or lighter non-tree edge replaces the heaviest
+        # edge on the tree path between its ends if that edge is heavier; a
+        # heavier tree edge is swapped for the lightest edge across the cut
+        # it leaves. Returns (mst_weight, mst_edges) like iter_mst_steps.
+        stats = self.stats = {"tree_nodes_searched": 0, "cut_edges_checked": 0}
+        tree_adj = {}
+        position = {}  # frozenset({a, b}) -> index in mst_edges
+        for k, (a, b, x) in enumerate(mst_edges):
+            tree_adj.setdefault(a, []).append((b, x))
+            tree_adj.setdefault(b, []).append((a, x))
+            position[frozenset((a, b))] = k
+        edges = list(mst_edges)
+        in_tree = frozenset((u, v)) in position
+        removed = None  # tree edge leaving the MST
+        added = None  # edge joining the MST
+
+        if in_tree and w <= old_w:
+            edges[position[frozenset((u, v))]] = edges[position[frozenset((u, v))]][:2] + (w,)
+            note = f"Tree edge {u}-{v} got lighter ({old_w} -> {w}): the MST keeps it"
+        elif in_tree:
+            # Split the tree at u-v and look for a lighter edge across the cut
+            k = position[frozenset((u, v))]
+            side = self._tree_side(tree_adj, u, (u, v))
+            rest = self._tree_side(tree_adj, v, (u, v))
+            stats["tree_nodes_searched"] = len(side) + len(rest)
+            best = self._lightest_cut_edge(side, rest, stats)
+            if best is not None and best[2] < w:
+                removed, added = edges[k], best
+                edges[k] = best
+                note = f"Tree edge {u}-{v} got heavier ({old_w} -> {w}): {best[0]}-{best[1]} (W: {best[2]}) is lighter across the cut"
+            else:
+                edges[k] = edges[k][:2] + (w,)
+                note = f"Tree edge {u}-{v} got heavier ({old_w} -> {w}) but is still the lightest across the cut"
+        elif old_w is not None and w >= old_w:
+            note = f"Non-tree edge {u}-{v} got heavier ({old_w} -> {w}): the MST is unchanged"
+        else:
+            path = self._tree_path(tree_adj, u, v, stats)
+            if path is None:
+                added = (u, v, w)
+                edges.append(added)
+                note = f"Edge {u}-{v} (W: {w}) joins two trees"
+            else:
+                heaviest = max(path, key=lambda e: e[2])
+                if heaviest[2] > w:
+                    removed, added = edges[position[frozenset(heaviest[:2])]], (u, v, w)
+                    edges[position[frozenset(heaviest[:2])]] = added
+                    note = f"Edge {u}-{v} (W: {w}) replaces {heaviest[0]}-{heaviest[1]} (W: {heaviest[2]}), the heaviest on its cycle"
+                else:
+                    note = f"Edge {u}-{v} (W: {w}) is not lighter than any edge on its cycle: the MST is unchanged"
+
+        kept = [e for e in edges if e is not added]
+        tree_nodes = list(dict.fromkeys(n for a, b, _ in kept for n in (a, b)))
+        yield ("level", (tuple(tree_nodes), tuple((a, b) for a, b, _ in kept)),
+               f"MST before the edit ({len(kept)} unchanged edge(s))")
+        yield ("check_edge", (u, v), f"Edited edge {u}-{v} (W: {w})")
+        if removed is not None:
+            yield ("check_edge", removed[:2], f"Remove {removed[0]}-{removed[1]} (W: {removed[2]}) from MST")
+            yield ("skip", removed[:2], f"Removed {removed[0]}-{removed[1]}")
+        if added is not None:
+            yield ("add_edge", added[:2], f"Added Edge {added[0]}-{added[1]} to MST")
+            yield ("node", added[0], "")
+            yield ("node", added[1], "")
+        yield ("skip", (u, v), note)
+        return sum(x for _, _, x in edges), edges
+
+    @staticmethod
+    def _tree_side(tree_adj, root, cut):
+        # Nodes reachable from root in the tree without crossing edge `cut`
+        seen = {root}
+        stack = [root]
+        while stack:
+            a = stack.pop()
+            for b, _ in tree_adj.get(a, ()):
+                if b not in seen and {a, b} != set(cut):
+                    seen.add(b)
+                    stack.append(b)
+        return seen
+
+    @staticmethod
+    def _tree_path(tree_adj, u, v, stats):
+        # Tree edges (a, b, w) on the path u..v, or None if u and v are in
+        # different trees
+        parent = {u: None}
+        queue = deque([u])
+        while queue and v not in parent:
+            a = queue.popleft()
+            stats["tree_nodes_searched"] += 1
+            for b, x in tree_adj.get(a, ()):
+                if b not in parent:
+                    parent[b] = (a, x)
+                    queue.append(b)
+        if v not in parent:
+            return None
+        path = []
+        cur = v
+        while parent[cur] is not None:
+            a, x = parent[cur]
+            path.append((a, cur, x))
+            cur = a
+        return path
+
+    def _lightest_cut_edge(self, side, rest, stats):
+        # Lightest graph edge with one end in `side` and the other in `rest`
+        # (first in edge order on ties), as (u, v, w) labels
+        G = self.G
+        mark = np.zeros(len(G.labels), dtype=np.int8)
+        mark[[G.index[n] for n in side]] = 1
+        mark[[G.index[n] for n in rest]] = 2
+        across = (mark[G.edge_u] * mark[G.edge_v]) == 2
+        stats["cut_edges_checked"] = int(across.sum())
+        if not across.any():
+            return None
+        candidates = np.flatnonzero(across)
+        k = candidates[np.argmin(G.edge_w[candidates])]
+        return (G.labels[int(G.edge_u[k])], G.labels[int(G.edge_v[k])], G.edge_w[k].item())
+
+    def iter_spt_update_steps(self, tree, start, end, u, v, w, old_w=None):
+        # Repair a shortest-path tree from `start` ((distances, prev) by node
+        # id of self.G, see remap_tree) after the edit. A new or lighter edge
+        # lowers distances from its ends outward; a heavier tree edge resets
+        # the subtree below it and refills it from its unaffected neighbors.
+        # Only nodes whose distance changes are visited. The repaired tree is
+        # left in self.tree; returns (distance to end, path) like the others.
+        labels = self.G.labels
+        offsets, targets, weights = self.G.adj_offsets, self.G.adj_targets, self.G.adj_weights
+        inf = float('inf')
+        distances, prev = list(tree[0]), list(tree[1])
+        s, t = self.G.index[start], self.G.index[end]
+        a, b = self.G.index[u], self.G.index[v]
+        stats = self.stats = {"affected": 0, "heap_pushes": 0, "heap_pops": 0, "relaxations": 0}
+
+        yield ("node", start, f"Shortest-path tree from {start} before the edit", {start: 0})
+        yield ("check_edge", (u, v), f"Edited edge {u}-{v} (W: {w})" + (f", was {old_w}" if old_w is not None else ""), {})
+
+        pq = []
+        if old_w is not None and w > old_w and (prev[b] == a or prev[a] == b):
+            # A tree edge got heavier: the subtree below it is reset, then
+            # each of its nodes is seeded from its best neighbor outside it
+            child = b if prev[b] == a else a
+            children = {}
+            for x, p in enumerate(prev):
+                if p is not None:
+                    children.setdefault(p, []).append(x)
+            candidates = [child]
+            for x in candidates:
+                candidates.extend(children.get(x, ()))
+            for x in candidates:
+                distances[x] = inf
+                prev[x] = None
+            for x in candidates:
+                for k in range(offsets[x], offsets[x + 1]):
+                    y = targets[k]
+                    stats["relaxations"] += 1
+                    if distances[y] + weights[k] < distances[x]:
+                        distances[x] = distances[y] + weights[k]
+                        prev[x] = y
+                if distances[x] != inf:
+                    heapq.heappush(pq, (distances[x], x))
+                    stats["heap_pushes"] += 1
+        else:
+            # A new or lighter edge (or a heavier non-tree edge, which changes
+            # nothing): distances can only go down, starting at its ends
+            candidates = []
+            for x, y in ((a, b), (b, a)):
+                if distances[x] + w < distances[y]:
+                    distances[y] = distances[x] + w
+                    prev[y] = x
+                    heapq.heappush(pq, (distances[y], y))
+                    stats["heap_pushes"] += 1
+
+        # Dijkstra over the affected region only
+        while pq:
+            d, x = heapq.heappop(pq)
+            stats["heap_pops"] += 1
+            if d != distances[x]:
+                continue
+            candidates.append(x)
+            for k in range(offsets[x], offsets[x + 1]):
+                y = targets[k]
+                if d + weights[k] < distances[y]:
+                    distances[y] = d + weights[k]
+                    prev[y] = x
+                    heapq.heappush(pq, (distances[y], y))
+                    stats["heap_pushes"] += 1
+                    stats["relaxations"] += 1
+
+        updates = [x for x in dict.fromkeys(candidates) if distances[x] != tree[0][x]]
+        stats["affected"] = len(updates)
+        for x in updates:
+            yield ("update", labels[x], f"Update {labels[x]} Distance: {distances[x]}", {labels[x]: distances[x]})
+
+        self.tree = (distances, prev)
+        path_nodes = []
+        if distances[t] != inf:
+            yield ("finished", end, f"Reached Target {end}! (Dist: {distances[t]})", {})
+            cur = t
+            while cur is not None:
+                path_nodes.append(labels[cur])
+                cur = prev[cur] if cur != s else None
+            path_nodes.reverse()
+            yield from self._iter_path_steps(path_nodes)
+        return distances[t], path_nodes
+
+class _ReplayState:
+    # Highlighted nodes/edges, current node and distances, changed by
+    # change-log entries (step index, kind, item, old, new)
+    def __init__(self):
+        self.highlight_nodes = set()
+        self.trail_edges = set()  # edges highlighted for good
+        self.current_node = None
+        self.distances = {}  # only entries below infinity
+
+    def _apply(self, entry):
+        _, kind, item, old, new = entry
+        if kind == "n":
+            self.highlight_nodes.add(item)
+        elif kind == "e":
+            self.trail_edges.add(item)
+        elif kind == "c":
+            self.current_node = new
+        else:
+            self.distances[item] = new
+
+    def _revert(self, entry):
+        _, kind, item, old, new = entry
+        if kind == "n":
+            self.highlight_nodes.discard(item)
+        elif kind == "e":
+            self.trail_edges.discard(item)
+        elif kind == "c":
+            self.current_node = old
+        elif old is None:
+            del self.distances[item]
+        else:
+            self.distances[item] = old
+
+class ReplayLog(_ReplayState):
+    # Change log of one trace, shared by every StepReplayer on it (see
+    # replay_log): the first time a step is reached, the state changes it
+    # makes are appended as (step index, kind, item, old, new). Its own state
+    # is the one after the last recorded step.
+    # Recording only ever adds nodes and edges, so the highlighted set at any
+    # log position is a prefix of the order they were added in; distances
+    # are the last value logged per node. The log is also kept in that form
+    # (one list per kind plus the log positions), so the state at any step
+    # can be rebuilt with a few list slices (state_at): each step is its own
+    # checkpoint, with no full-state copies kept.
+    # The log also holds the StepReplayer of each viewer ("cursor"), so a
+    # session keeps only the trace key, its step and a cursor id, and an
+    # evicted trace takes its cursors with it.
+    NODE_TYPES = ("node", "update", "finished")
+    EDGE_TYPES = ("edge", "add_edge")
+    CURSORS_MAX = 8
+
+    def __init__(self, steps):
+        super().__init__()
+        self.steps = steps
+        self.entries = []
+        self.step_end = array("q")  # log position right after each recorded step
+        # the log by kind: items (values) in log order and their positions
+        self._nodes, self._node_pos = [], array("q")
+        self._edges, self._edge_pos = [], array("q")
+        self._dist_nodes, self._dist_values, self._dist_pos = [], [], array("q")
+        self._currents, self._current_pos = [], array("q")
+        self._cursors = OrderedDict()  # owner -> StepReplayer, least recent first
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        # Number of recorded steps
+        return len(self.step_end)
+
+    def record_to(self, stop):
+        # Record steps up to `stop` (inclusive). step_end grows last, so other
+        # threads only ever read fully recorded steps.
+        if stop < len(self.step_end):
+            return
+        with self._lock:
+            for i in range(len(self.step_end), stop + 1):
+                self._record(i)
+
+    def _record(self, i):
+        step = self.steps[i]
+        s_type, val = step[0], step[1]
+        new_nodes = new_edges = ()
+        if s_type in self.NODE_TYPES or s_type == "current":
+            new_nodes = (val,)
+        elif s_type in self.EDGE_TYPES:
+            new_edges = (val,)
+        elif s_type == "level":
+            new_nodes, new_edges = val
+
+        entries = []
+        for n in new_nodes:
+            if n not in self.highlight_nodes:
+                entries.append((i, "n", n, None, None))
+        for e in new_edges:
+            if e not in self.trail_edges:
+                entries.append((i, "e", e, None, None))
+        if s_type == "current" and val != self.current_node:
+            entries.append((i, "c", None, self.current_node, val))
+        if len(step) > 3:
+            for n, d in step[3].items():
+                old = self.distances.get(n)
+                if old != d:
+                    entries.append((i, "d", n, old, d))
+
+        for pos, entry in enumerate(entries, len(self.entries)):
+            self._apply(entry)
+            kind = entry[1]
+            if kind == "n":
+                self._nodes.append(entry[2])
+                self._node_pos.append(pos)
+            elif kind == "e":
+                self._edges.append(entry[2])
+                self._edge_pos.append(pos)
+            elif kind == "c":
+                self._currents.append(entry[4])
+                self._current_pos.append(pos)
+            else:
+                self._dist_nodes.append(entry[2])
+                self._dist_values.append(entry[4])
+                self._dist_pos.append(pos)
+        self.entries.extend(entries)
+        self.step_end.append(len(self.entries))
+
+    def cursor(self, owner):
+        # The StepReplayer of `owner` on this trace, kept between calls so
+        # moving one step only applies that step's changes
+        with self._lock:
+            replay = self._cursors.get(owner)
+            if replay is None:
+                replay = StepReplayer(self.steps, self)
+                self._cursors[owner] = replay
+                if len(self._cursors) > self.CURSORS_MAX:
+                    self._cursors.popitem(last=False)
+            self._cursors.move_to_end(owner)
+            return replay
+
+    def state_at(self, goal):
+        # (nodes, edges, distances, current node) with entries [0, goal) applied
+        n = bisect.bisect_left(self._node_pos, goal)
+        e = bisect.bisect_left(self._edge_pos, goal)
+        d = bisect.bisect_left(self._dist_pos, goal)
+        c = bisect.bisect_left(self._current_pos, goal)
+        return (set(self._nodes[:n]), set(self._edges[:e]), dict(zip(self._dist_nodes[:d], self._dist_values[:d])),
+                self._currents[c - 1] if c else None)
+
+    def state_size(self, goal):
+        # Items state_at(goal) copies
+        return (bisect.bisect_left(self._node_pos, goal) + bisect.bisect_left(self._edge_pos, goal)
+                + bisect.bisect_left(self._dist_pos, goal))
+
+    def nbytes(self):
+        # Entries (5-tuples of shared objects), the per-kind lists, the state
+        # after the last recorded step and the cursors' states
+        size = sys.getsizeof(self.entries) + len(self.entries) * sys.getsizeof((0, "n", None, None, None))
+        parts = [self.step_end, self._nodes, self._node_pos, self._edges, self._edge_pos, self._dist_nodes,
+                 self._dist_values, self._dist_pos, self._currents, self._current_pos]
+        with self._lock:
+            cursors = list(self._cursors.values())
+        for state in [self] + cursors:
+            parts += [state.highlight_nodes, state.trail_edges, state.distances]
+        return size + sum(sys.getsizeof(part) for part in parts)
+
+_replay_logs_lock = threading.Lock()
+
+def replay_log(steps):
+    # The ReplayLog of a trace, created on first use and kept on the trace
+    # object itself, so it lives (and is evicted) with the trace. A plain
+    # list gets an unshared log.
+    with _replay_logs_lock:
+        log = getattr(steps, "replay_log", None)
+        if log is None:
+            log = ReplayLog(steps)
+            try:
+                steps.replay_log = log
+            except AttributeError:
+                pass
+        return log
+
+class StepReplayer(_ReplayState):
+    # Visualization state (highlighted nodes/edges, current node, distances)
+    # of one step of a trace. The trace's shared ReplayLog records each step
+    # once; moving to a step applies or reverts the log entries in between,
+    # so Next/Prev cost O(changes of one step), or, when that is cheaper,
+    # rebuilds the state right at the target with ReplayLog.state_at.
+    # ReplayLog.cursor() keeps one per viewer on the trace itself.
+    PROBE_TYPES = ("check_edge", "key_update")  # edge lit only on its own step
+    REBUILD_RATIO = 3  # a rebuilt item costs about 1/3 of an applied entry
+
+    def __init__(self, steps, log=None):
+        super().__init__()
+        self.steps = steps
+        self.log = replay_log(steps) if log is None else log
+        self.idx = -1
+        self.check_edge = None  # edge highlighted only while on its step
+        self._pos = 0  # log entries [0, _pos) are applied
+
+    @property
+    def log_position(self):
+        return self._pos
+
+    def changes_between(self, pos_a, pos_b):
+        # Change-log entries between two log positions (in either order)
+        lo, hi = min(pos_a, pos_b), max(pos_a, pos_b)
+        return self.log.entries[lo:hi]
+
+    @property
+    def highlight_edges(self):
+        if self.check_edge is None:
+            return self.trail_edges
+        return self.trail_edges | {self.check_edge}
+
+    def distance_table(self, nodes):
+        return {n: self.distances.get(n, float('inf')) for n in nodes}
+
+    def seek(self, target):
+        if hasattr(self.steps, "ensure"):
+            self.steps.ensure(target + 1)
+        target = max(-1, min(target, len(self.steps) - 1))
+        log = self.log
+        log.record_to(target)
+
+        entries = log.entries
+        goal = log.step_end[target] if target >= 0 else 0
+        if log.state_size(goal) // self.REBUILD_RATIO < abs(goal - self._pos):
+            self.highlight_nodes, self.trail_edges, self.distances, self.current_node = log.state_at(goal)
+            self._pos = goal
+        while self._pos > goal:
+            self._pos -= 1
+            self._revert(entries[self._pos])
+        while self._pos < goal:
+            self._apply(entries[self._pos])
+            self._pos += 1
+        self.idx = target
+
+        self.check_edge = None
+        if target >= 0 and self.steps[target][0] in self.PROBE_TYPES:
+            self.check_edge = self.steps[target][1]
+
+class BoundedLRUCache:
+    # Thread-safe LRU mapping bounded by the estimated size of its values.
+    # `sizeof(value)` gives the size in bytes; the least recently used
+    # entries are evicted once the total goes over max_bytes.
+    def __init__(self, max_bytes, sizeof):
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.total_bytes = 0
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+
+    def put(self, key, value):
+        size = self.sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self.total_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self.total_bytes += size
+            # Always keep the newest entry, even if it alone is over the limit
+            while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+                _, (_, old_size) = self._entries.popitem(last=False)
+                self.total_bytes -= old_size
+
+    def refresh(self, key):
+        # Re-measure an entry whose value has grown since it was put
+        with self._lock:
+            if key not in self._entries:
+                return
+            value = self._entries[key][0]
+        self.put(key, value)
+
+    def __len__(self):
+        return len(self._entries)
+
+def _level_bytes(value, sample):
+    # The (nodes, edges) tuples of a "level" step plus the (u, v) tuple of
+    # every edge, measured on up to `sample` edges. The labels themselves are
+    # the graph's own objects.
+    nodes, edges = value
+    size = sys.getsizeof(nodes) + sys.getsizeof(edges)
+    if edges:
+        stride = max(1, len(edges) // sample)
+        picked = edges[::stride]
+        size += sum(sys.getsizeof(e) for e in picked) * len(edges) // len(picked)
+    return size
+
+def estimate_trace_bytes(steps, sample=1000):
+    # Approximate memory of a step list: measure up to `sample` evenly spaced
+    # steps (tuple + its items, one level deep, plus the node and edge tuples
+    # nested in "level" steps) and scale to the full length.
+    # Columnar traces (trace_format.CompactTrace) report their own size.
+    # The trace's shared ReplayLog, if it has one, is counted too.
+    log = getattr(steps, "replay_log", None)
+    log_bytes = log.nbytes() if log is not None else 0
+    if hasattr(steps, "nbytes"):
+        return steps.nbytes + log_bytes
+    if not steps:
+        return sys.getsizeof(steps) + log_bytes
+    stride = max(1, len(steps) // sample)
+    measured = 0
+    count = 0
+    for i in range(0, len(steps), stride):
+        step = steps[i]
+        measured += sys.getsizeof(step) + sum(sys.getsizeof(item) for item in step)
+        if step[0] == "level":
+            measured += _level_bytes(step[1], sample)
+        count += 1
+    return sys.getsizeof(steps) + measured * len(steps) // count + log_bytes
+
+def estimate_tree_bytes(tree):
+    # (distances, prev) lists of a shortest-path tree: list slots plus one
+    # number object per reachable node
+    distances, prev = tree
+    return sys.getsizeof(distances) + sys.getsizeof(prev) + 32 * len(distances)
+
+def remap_tree(tree, labels, G):
+    # A shortest-path tree of the graph with node labels `labels`, re-indexed
+    # by the node ids of G (an edited copy: nodes may have been added).
+    # New nodes start unreachable.
+    distances, prev = tree
+    n = len(G.labels)
+    if G.labels[:len(labels)] == labels:
+        extra = n - len(labels)
+        return list(distances) + [float('inf')] * extra, list(prev) + [None] * extra
+    new_id = [G.index[label] for label in labels]
+    new_distances, new_prev = [float('inf')] * n, [None] * n
+    for i, j in enumerate(new_id):
+        new_distances[j] = distances[i]
+        new_prev[j] = None if prev[i] is None else new_id[prev[i]]
+    return new_distances, new_prev
+
+class PerfLog:
+    # Wall-clock timers and named values for profiling one session. Each
+    # timer keeps calls / total / last / max seconds; the most recent timings
+    # are also kept as events (oldest dropped first) for offline analysis.
+    def __init__(self, max_events=2000):
+        self.timers = {}  # name -> [calls, total, last, max]
+        self.values = {}  # name -> latest value (counters, sizes)
+        self.events = deque(maxlen=max_events)  # (wall clock, name, seconds)
+
+    @contextmanager
+    def timer(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - started)
+
+    def add_time(self, name, seconds):
+        t = self.timers.get(name)
+        if t is None:
+            t = self.timers[name] = [0, 0.0, 0.0, 0.0]
+        t[0] += 1
+        t[1] += seconds
+        t[2] = seconds
+        t[3] = max(t[3], seconds)
+        self.events.append((time.time(), name, seconds))
+
+    def set(self, name, value):
+        self.values[name] = value
+
+    def timer_rows(self):
+        # [(name, calls, last ms, mean ms, max ms, total ms)] by total time
+        rows = [
+            (name, calls, last * 1000, total / calls * 1000, most * 1000, total * 1000)
+            for name, (calls, total, last, most) in self.timers.items()
+        ]
+        return sorted(rows, key=lambda r: -r[5])
+
+    def to_dict(self):
+        return {
+            "timers": {
+                name: {"calls": calls, "total_s": total, "last_s": last, "max_s": most}
+                for name, (calls, total, last, most) in self.timers.items()
+            },
+            "values": dict(self.values),
+            "events": [{"time": t, "name": name, "seconds": sec} for t, name, sec in self.events],
+        }
+
+    def reset(self):
+        self.timers.clear()
+        self.values.clear()
+        self.events.clear()
+
+# --------------------------
+# 2. Algorithm Registry
+# --------------------------
+
+# Algorithm names, as listed in the UI and accepted by the CLI
+ALGORITHMS = (
+    "DFS", "BFS", "BFS (Level-Synchronous)", "Dijkstra", "Dijkstra (Shortest-Path Tree)", "A* (Euclidean)",
+    "Dijkstra (Bidirectional)", "MST (Kruskal)", "MST (Prim)", "MST (Prim, Eager)"
+)
+
+# Point-to-point modes: need an End Node and show the distance table
+SHORTEST_PATH_ALGOS = ("Dijkstra", "Dijkstra (Shortest-Path Tree)", "A* (Euclidean)", "Dijkstra (Bidirectional)")
+
+def format_traversal(order):
+    return f"**Traversal Order:**\n{' -> '.join(map(str, order))}"
+
+def format_shortest_path(dist, path):
+    if dist == float('inf'):
+        return f"**Target unreachable!** (Dist: ∞)"
+    return f"**Shortest Path:** {' -> '.join(map(str, path))}\n\n**Total Distance:** {dist}"
+
+def format_mst(weight, mst_edges):
+    edge_str = ", ".join([f"({u}-{v})" for u, v, w in mst_edges])
+    return f"**Total MST Weight:** {weight}\n\n**Edges:** {edge_str}"
+
+def format_heap_stats(stats):
+    text = f"\n\n**Heap:** peak size {stats.get('heap_peak', 0)}, {stats.get('heap_pushes', 0)} pushes, {stats.get('heap_pops', 0)} pops"
+    if "decrease_keys" in stats:
+        text += f", {stats['decrease_keys']} decrease-keys"
+    return text
+
+def format_search_stats(stats):
+    text = f"\n\n**Settled:** {stats.get('settled', 0)} node(s)"
+    if stats.get("heuristic_factor") == 0:
+        text += " (no positions: heuristic is 0, same as Dijkstra)"
+    return text
+
+def algorithm_steps(G, algo_choice, start_node, end_node, load_tree=None, algo=None):
+    # (step generator, summarize) for one ALGORITHMS entry. load_tree(G, start)
+    # supplies shortest-path trees; by default each one is computed afresh.
+    # algo: the GraphAlgorithms to run on (its .stats fill in as steps are made)
+    if algo is None:
+        algo = GraphAlgorithms(G)
+    if load_tree is None:
+        load_tree = lambda G, start_node: algo.shortest_path_tree(start_node)
+    
+    if algo_choice == "DFS" and start_node is not None:
+        return (algo.iter_dfs_steps(start_node), format_traversal)
+        
+    elif algo_choice == "BFS" and start_node is not None:
+        return (algo.iter_bfs_steps(start_node), format_traversal)
+        
+    elif algo_choice == "BFS (Level-Synchronous)" and start_node is not None:
+        return (algo.iter_bfs_level_steps(start_node), format_traversal)
+        
+    elif algo_choice == "Dijkstra" and start_node is not None and end_node is not None:
+        return (algo.iter_dijkstra_steps(start_node, end_node),
+                lambda dist, path: format_shortest_path(dist, path) + format_search_stats(algo.stats))
+        
+    elif algo_choice == "Dijkstra (Shortest-Path Tree)" and start_node is not None and end_node is not None:
+        return (algo.iter_spt_path_steps(start_node, end_node, load_tree(G, start_node)),
+                format_shortest_path)
+        
+    elif algo_choice == "A* (Euclidean)" and start_node is not None and end_node is not None:
+        return (algo.iter_astar_steps(start_node, end_node),
+                lambda dist, path: format_shortest_path(dist, path) + format_search_stats(algo.stats))
+        
+    elif algo_choice == "Dijkstra (Bidirectional)" and start_node is not None and end_node is not None:
+        return (algo.iter_bidirectional_dijkstra_steps(start_node, end_node),
+                lambda dist, path: format_shortest_path(dist, path) + format_search_stats(algo.stats))
+            
+    elif algo_choice == "MST (Kruskal)":
+        return (algo.iter_mst_steps("kruskal"), format_mst)
+        
+    elif algo_choice == "MST (Prim)":
+        # FIX: Pass start_node to manual Prim
+        return (algo.iter_mst_steps("prim", start_node=start_node),
+                lambda weight, mst_edges: format_mst(weight, mst_edges) + format_heap_stats(algo.stats))
+        
+    elif algo_choice == "MST (Prim, Eager)":
+        return (algo.iter_mst_steps("prim_eager", start_node=start_node),
+                lambda weight, mst_edges: format_mst(weight, mst_edges) + format_heap_stats(algo.stats))
+    
+    return iter(()), None
+
+# Algorithms whose finished result can be repaired after an edge edit
+INCREMENTAL_ALGOS = ("MST (Kruskal)", "MST (Prim)", "MST (Prim, Eager)", "Dijkstra (Shortest-Path Tree)")
+
+def update_steps(G, algo_choice, start_node, end_node, previous, edit, tree=None, algo=None):
+    # (step generator, summarize) that repairs `previous`, the result of a
+    # finished trace on the graph before the edit, instead of rerunning.
+    # G is the edited graph, edit = (u, v, w, old_w) with old_w None for a
+    # new edge, tree the old shortest-path tree already remapped to G.
+    # Returns (iter(()), None) when the edit needs a full run instead.
+    if algo is None:
+        algo = GraphAlgorithms(G)
+    u, v, w, old_w = edit
+    if u == v:
+        return iter(()), None
+
+    if algo_choice == "MST (Kruskal)":
+        return algo.iter_mst_update_steps(previous[1], u, v, w, old_w), format_mst
+
+    elif algo_choice in ("MST (Prim)", "MST (Prim, Eager)"):
+        # Prim only spans the start node's component. Cycle replacement keeps
+        # it exact while the edge stays inside that tree, or hangs a new
+        # leaf (a node whose only edge is this one) onto it.
+        tree_nodes = {start_node}.union(*({a, b} for a, b, _ in previous[1]))
+        inside = [n in tree_nodes for n in (u, v)]
+        if not any(inside):
+            return iter(()), None
+        if not all(inside):
+            leaf = G.index[v if inside[0] else u]
+            if G.adj_offsets[leaf + 1] - G.adj_offsets[leaf] != 1:
+                return iter(()), None
+        return algo.iter_mst_update_steps(previous[1], u, v, w, old_w), format_mst
+
+    elif algo_choice == "Dijkstra (Shortest-Path Tree)" and tree is not None:
+        return algo.iter_spt_update_steps(tree, start_node, end_node, u, v, w, old_w), format_shortest_path
+
+    return iter(()), None
+
+def start_algorithm(G, algo_choice, start_node, end_node, load_tree=None):
+    # Returns a LazyTrace: nothing runs until its steps are read
+    algo = GraphAlgorithms(G)
+    step_iter, summarize = algorithm_steps(G, algo_choice, start_node, end_node, load_tree, algo)
+    return LazyTrace(step_iter, summarize, stats=lambda: algo.stats)
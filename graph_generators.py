@@ -0,0 +1,136 @@
+# Synthetic test graphs of any size, built straight from NumPy arrays (no
+# per-edge Python work), so graphs with millions of edges take seconds.
+# The same parameters and seed always give the same graph.
+#
+#   grid_graph        rows x cols lattice, random weights 1..9
+#   geometric_graph   random points, an edge between every pair closer than
+#                     the radius that gives about `degree` neighbors per node
+#   road_graph        jittered lattice with missing streets and some diagonal
+#                     shortcuts (still planar); weight = length x road speed
+#   scale_free_graph  preferential attachment (Barabasi-Albert), no positions
+#
+# Nodes are labeled "0", "1", ... (strings, like imported edge lists) and all
+# but the scale-free graph carry positions, in screen units, as G.coords.
+import numpy as np
+
+from graph_engine import CSRGraph
+from layout import NODE_SPACING
+
+def _graph(n, u, v, w, coords=None):
+    G = CSRGraph.from_id_edges([str(i) for i in range(n)], u, v, w)
+    if coords is not None:
+        G.coords = np.asarray(coords, dtype=np.float64)
+    return G
+
+def _lattice(rows, cols):
+    # Right and down neighbor pairs of a rows x cols lattice (row-major ids)
+    ids = np.arange(rows * cols, dtype=np.int64).reshape(rows, cols)
+    u = np.concatenate((ids[:, :-1].ravel(), ids[:-1, :].ravel()))
+    v = np.concatenate((ids[:, 1:].ravel(), ids[1:, :].ravel()))
+    return ids, u, v
+
+def _length_weights(coords, u, v, factor=1.0):
+    # Integer weights proportional to drawn length (NODE_SPACING -> 10), so
+    # the A* straight-line heuristic stays meaningful
+    length = np.hypot(*(coords[u] - coords[v]).T) * factor
+    return np.maximum(1, np.rint(length * 10 / NODE_SPACING)).astype(np.int64)
+
+def grid_graph(rows=30, cols=30, seed=0):
+    rng = np.random.default_rng(seed)
+    ids, u, v = _lattice(rows, cols)
+    y, x = np.divmod(np.arange(rows * cols), cols)
+    coords = np.column_stack((x, y)) * float(NODE_SPACING)
+    return _graph(rows * cols, u, v, rng.integers(1, 10, len(u)), coords)
+
+def geometric_graph(nodes=1000, degree=6, seed=0):
+    # Points uniform in a square sized for NODE_SPACING per node. Pairs are
+    # found by binning the points into radius-sized cells and comparing each
+    # cell with itself and four of its neighbors (each pair once).
+    rng = np.random.default_rng(seed)
+    side = NODE_SPACING * np.sqrt(nodes)
+    coords = rng.random((nodes, 2)) * side
+    radius = side * np.sqrt(degree / (np.pi * max(nodes - 1, 1)))
+    cells = max(1, int(side // radius))
+    cx = np.minimum((coords[:, 0] / side * cells).astype(np.int64), cells - 1)
+    cy = np.minimum((coords[:, 1] / side * cells).astype(np.int64), cells - 1)
+    cell = cy * cells + cx
+    order = np.argsort(cell, kind="stable")
+    counts = np.bincount(cell, minlength=cells * cells)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    us, vs = [], []
+    for dx, dy in ((0, 0), (1, 0), (-1, 1), (0, 1), (1, 1)):
+        nx_, ny_ = cx + dx, cy + dy
+        ok = (nx_ >= 0) & (nx_ < cells) & (ny_ < cells)
+        a = np.flatnonzero(ok)
+        other = ny_[a] * cells + nx_[a]
+        k = counts[other]
+        # every point a paired with every point in its neighbor cell
+        a_rep = np.repeat(a, k)
+        within = np.arange(k.sum()) - np.repeat(np.cumsum(k) - k, k)
+        b = order[np.repeat(starts[other], k) + within]
+        keep = np.hypot(*(coords[a_rep] - coords[b]).T) <= radius
+        if dx == 0 and dy == 0:
+            keep &= a_rep < b
+        us.append(a_rep[keep])
+        vs.append(b[keep])
+    u, v = np.concatenate(us), np.concatenate(vs)
+    return _graph(nodes, u, v, _length_weights(coords, u, v), coords)
+
+def road_graph(rows=30, cols=30, seed=0, keep_street=0.9, diagonal=0.2):
+    # Each street of the lattice stays with probability keep_street; each
+    # block gets one diagonal (random direction) with probability diagonal.
+    # Jitter is under a quarter block, so no two streets cross.
+    rng = np.random.default_rng(seed)
+    ids, u, v = _lattice(rows, cols)
+    y, x = np.divmod(np.arange(rows * cols), cols)
+    coords = (np.column_stack((x, y)) + rng.uniform(-0.2, 0.2, (rows * cols, 2))) * NODE_SPACING
+    streets = rng.random(len(u)) < keep_street
+    u, v = u[streets], v[streets]
+    blocks = rng.random((rows - 1) * (cols - 1)) < diagonal if rows > 1 and cols > 1 else np.zeros(0, bool)
+    flip = rng.random(len(blocks)) < 0.5
+    top_left = ids[:-1, :-1].ravel()
+    du = np.where(flip, top_left + 1, top_left)[blocks]
+    dv = np.where(flip, top_left + cols, top_left + cols + 1)[blocks]
+    u, v = np.concatenate((u, du)), np.concatenate((v, dv))
+    # speed factor per road: 1 (highway) .. 2 (side street)
+    w = _length_weights(coords, u, v, rng.uniform(1.0, 2.0, len(u)))
+    return _graph(rows * cols, u, v, w, coords)
+
+def scale_free_graph(nodes=1000, edges_per_node=3, seed=0):
+    # Batagelj-Brandes: edge e is (ends[2e], ends[2e+1]); the new node is
+    # ends[2e] and its partner copies a uniformly random earlier entry
+    # ends[r], r < 2e, which picks nodes in proportion to their degree.
+    # Copies of copies are resolved by pointer jumping instead of a loop
+    # over the edges. Repeated edges are merged, self-loops dropped.
+    rng = np.random.default_rng(seed)
+    k = max(1, min(edges_per_node, nodes - 1))
+    if nodes < 2:
+        return _graph(nodes, np.zeros(0, np.int64), np.zeros(0, np.int64), np.zeros(0, np.int64))
+    # seed star: nodes 1..k joined to node 0
+    new = np.concatenate((np.arange(1, k + 1), np.repeat(np.arange(k + 1, nodes), k))).astype(np.int64)
+    m = len(new)
+    e = np.arange(k, m)
+    source = np.zeros(m, dtype=np.int64)  # ends[2e+1] for e < k is node 0
+    pointer = (rng.random(m - k) * (2 * e)).astype(np.int64)
+    while True:
+        odd = (pointer % 2 == 1) & (pointer >= 2 * k)
+        if not odd.any():
+            break
+        pointer[odd] = pointer[(pointer[odd] - 1) // 2 - k]
+    source[k:] = np.where(pointer % 2 == 0, new[pointer // 2], 0)
+    keep = new != source
+    w = rng.integers(1, 10, m)
+    return _graph(nodes, new[keep], source[keep], w[keep])
+
+# name -> (function, default parameters); every function also takes `seed`
+GENERATORS = {
+    "Grid": (grid_graph, {"rows": 30, "cols": 30}),
+    "Random Geometric": (geometric_graph, {"nodes": 1000, "degree": 6}),
+    "Road Network": (road_graph, {"rows": 30, "cols": 30}),
+    "Scale-Free": (scale_free_graph, {"nodes": 1000, "edges_per_node": 3}),
+}
+
+def generate(name, seed=0, **params):
+    fn, defaults = GENERATORS[name]
+    return fn(**{**defaults, **params}, seed=seed)
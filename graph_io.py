@@ -0,0 +1,148 @@
+# Bulk graph import from edge-list / CSV text.
+#
+# One edge per line: "u v", "u v w", "u,v,w", "u;v;w" or tab separated.
+# The weight defaults to 1. Blank lines and lines starting with "#" or "%"
+# are skipped, as is a first line that is a header (e.g. "source,target,weight").
+# Pass header=True / False when the file is known to have one or not; by
+# default the first line is only taken as a header when the line after it
+# shows that it cannot be an edge (see _is_header), so a headerless file
+# whose first edge is "u v" or "from to" keeps that edge.
+# Lines are parsed in chunks and fed to a GraphBuilder, so node ids come from
+# a hash index and repeated edges collapse into one (the last weight wins).
+import io
+import json
+import re
+
+from graph_engine import GraphBuilder
+
+CHUNK_BYTES = 1 << 20  # about 1 MB of lines per parsed chunk
+
+HEADER_WORDS = {"source", "target", "from", "to", "u", "v", "src", "dst", "node1", "node2", "weight", "w"}
+
+_SPLIT = re.compile(r"[,;\s]+")
+
+def parse_weight(token):
+    try:
+        return int(token)
+    except ValueError:
+        return float(token)
+
+def _is_number(token):
+    try:
+        parse_weight(token)
+    except ValueError:
+        return False
+    return True
+
+def _is_header(tokens, next_tokens, header=None):
+    # tokens: the first data line, next_tokens: the one after it (None at the
+    # end of the file). A weight column that is not a number can only be a
+    # header. Otherwise only a row of header words ("u v", "from,to") counts,
+    # and only when the next line names its nodes by number; with word labels
+    # on both lines it is read as an edge.
+    if header is not None:
+        return header
+    if len(tokens) >= 3 and not _is_number(tokens[2]):
+        return True
+    if next_tokens is None or not all(t.lower() in HEADER_WORDS for t in tokens):
+        return False
+    return all(_is_number(t) for t in next_tokens[:2])
+
+def _check_row(tokens, line_no, line):
+    if len(tokens) < 2:
+        raise ValueError(f"line {line_no}: expected 'u v [weight]', got {line!r}")
+
+def _split_line(line, sep):
+    tokens = line.split(sep)
+    if sep is not None:
+        tokens = [t.strip() for t in tokens]
+    if len(tokens) < 2 or "" in tokens[:3]:
+        tokens = [t for t in _SPLIT.split(line) if t]
+    return tokens
+
+def iter_edge_chunks(stream, chunk_bytes=CHUNK_BYTES, header=None):
+    # Yields (us, vs, weights) column lists for the lines of a text or binary
+    # stream. The separator is taken from the first data line; lines that do
+    # not split cleanly with it fall back to the general pattern. The first
+    # data line is held back until the next one decides if it is a header.
+    if not isinstance(stream, io.TextIOBase):
+        stream = io.TextIOWrapper(stream, encoding="utf-8", errors="replace")
+    line_no = 0
+    sep = False  # not detected yet
+    first = None  # (tokens, line_no, line) of the first data line, while undecided
+    while True:
+        lines = stream.readlines(chunk_bytes)
+        us, vs, ws = [], [], []
+        for line in lines:
+            line_no += 1
+            line = line.strip()
+            if not line or line[0] in "#%":
+                continue
+            if sep is False:
+                sep = next((c for c in ",;\t" if c in line), None)
+                first = (_split_line(line, sep), line_no, line)
+                continue
+            tokens = _split_line(line, sep)
+            if first is not None:
+                if not _is_header(first[0], tokens, header):
+                    _check_row(*first)
+                    us.append(first[0][0])
+                    vs.append(first[0][1])
+                    ws.append(first[0][2] if len(first[0]) > 2 else 1)
+                first = None
+            if len(tokens) < 2:
+                _check_row(tokens, line_no, line)
+            us.append(tokens[0])
+            vs.append(tokens[1])
+            ws.append(tokens[2] if len(tokens) > 2 else 1)
+        if not lines:
+            if first is None or _is_header(first[0], None, header):
+                return
+            _check_row(*first)
+            tokens = first[0]
+            first = None
+            us, vs, ws = [tokens[0]], [tokens[1]], [tokens[2] if len(tokens) > 2 else 1]
+        try:
+            ws = list(map(int, ws))
+        except ValueError:
+            ws = [_parse_line_weight(w, line_no) for w in ws]
+        yield us, vs, ws
+
+def _parse_line_weight(token, line_no):
+    if isinstance(token, int):
+        return token
+    try:
+        return parse_weight(token)
+    except ValueError:
+        raise ValueError(f"weight {token!r} is not a number (in the lines before line {line_no})") from None
+
+def read_edge_list(stream, builder=None, chunk_bytes=CHUNK_BYTES, header=None):
+    # Parse a whole edge list into a CSRGraph. Pass a builder that already
+    # holds a graph (GraphBuilder + add_nodes / add_edges) to merge into it.
+    if builder is None:
+        builder = GraphBuilder()
+    for us, vs, ws in iter_edge_chunks(stream, chunk_bytes, header):
+        builder.add_edge_columns(us, vs, ws)
+    return builder.build()
+
+def read_edge_text(text, builder=None, header=None):
+    return read_edge_list(io.StringIO(text), builder, header=header)
+
+def graph_from_data(data):
+    # Graph JSON as used by the CLI: {"nodes": [...], "edges": [[u, v, w], ...]
+    # or [{"u", "v", "w"}, ...], "pos": {node: [x, y]}} ("pos" optional)
+    builder = GraphBuilder()
+    builder.add_nodes(data.get("nodes", []))
+    builder.add_edges((e["u"], e["v"], e["w"]) if isinstance(e, dict) else tuple(e) for e in data.get("edges", []))
+    G = builder.build()
+    pos = data.get("pos")
+    G.set_positions({n: tuple(xy) for n, xy in pos.items()} if pos else None)
+    return G
+
+def load_graph_file(path, header=None):
+    # A .json graph file, or any other file as an edge list / CSV
+    if path.endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            return graph_from_data(json.load(f))
+    with open(path, "rb") as f:
+        return read_edge_list(f, header=header)
@@ -0,0 +1,115 @@
+# Server-side node layout for graphs without fixed positions (Custom and
+# bulk-imported graphs). Positions are computed once per graph with NumPy
+# and drawn with physics off, so the browser runs no force simulation and
+# the same graph always gets the same picture.
+#
+#   - every graph: spectral layout, two leading non-trivial eigenvectors of
+#     the normalized adjacency found by block power iteration on the CSR arrays
+#   - up to FORCE_MAX_NODES nodes: then refined by a Fruchterman-Reingold
+#     force layout with all pairwise repulsions as (n, n) arrays
+import numpy as np
+
+FORCE_MAX_NODES = 1000  # (n, n) float arrays above this get too big / slow
+NODE_SPACING = 150      # screen units per node (testcases use 2*SCALE = 400 between neighbors)
+
+def force_layout(G, iterations=60, pos=None, seed=0):
+    # Returns (n, 2) positions around the unit square (before fit_to_screen).
+    # pos: optional starting positions, e.g. a spectral layout.
+    n = G.number_of_nodes()
+    if pos is None:
+        pos = np.random.default_rng(seed).random((n, 2))
+    if n < 2:
+        return pos
+    x, y = (_unit(c).astype(np.float32) for c in pos.T)
+    k2 = np.float32(1.0 / n)  # squared ideal distance between nodes
+    k = np.sqrt(k2)
+    u, v = G.edge_u, G.edge_v
+    temperature = 0.1
+    cooling = temperature / (iterations + 1)
+    for _ in range(iterations):
+        dx = x[:, None] - x[None, :]
+        dy = y[:, None] - y[None, :]
+        # repulsion k^2 / d between every pair (the diagonal has dx = dy = 0)
+        w = dx * dx
+        w += dy * dy
+        np.maximum(w, 1e-6, out=w)
+        np.divide(k2, w, out=w)
+        fx = (dx * w).sum(axis=1)
+        fy = (dy * w).sum(axis=1)
+        # attraction d^2 / k along each edge
+        ex, ey = x[u] - x[v], y[u] - y[v]
+        pull = np.sqrt(ex * ex + ey * ey) / k
+        fx += np.bincount(v, ex * pull, minlength=n) - np.bincount(u, ex * pull, minlength=n)
+        fy += np.bincount(v, ey * pull, minlength=n) - np.bincount(u, ey * pull, minlength=n)
+        # move each node at most `temperature`
+        length = np.maximum(np.sqrt(fx * fx + fy * fy), 1e-9)
+        step = np.minimum(length, temperature) / length
+        x += (fx * step).astype(np.float32)
+        y += (fy * step).astype(np.float32)
+        temperature -= cooling
+    return np.column_stack((x, y)).astype(np.float64)
+
+def _unit(c):
+    # Rescale one coordinate column to [0, 1]
+    span = c.max() - c.min()
+    return (c - c.min()) / span if span > 0 else np.zeros_like(c)
+
+def spectral_layout(G, iterations=100, seed=0):
+    # Power iteration on the lazy walk (I + D^-1/2 A D^-1/2) / 2, keeping two
+    # vectors orthogonal to the trivial eigenvector sqrt(d). Edge weights are
+    # ignored. A small all-to-all term (tau / n) keeps disconnected pieces
+    # from collapsing onto single points.
+    n = G.number_of_nodes()
+    if n < 3:
+        return np.random.default_rng(seed).random((n, 2))
+    sources = np.repeat(np.arange(n), np.diff(G.offsets))
+    targets = G.targets
+    degree = np.diff(G.offsets).astype(np.float64)
+    tau = max(degree.mean(), 1.0) * 0.1
+    scale = 1.0 / np.sqrt(degree + tau)
+    trivial = np.sqrt(degree + tau)
+    trivial /= np.linalg.norm(trivial)
+
+    x = np.random.default_rng(seed).standard_normal((n, 2))
+    for _ in range(iterations):
+        y = x * scale[:, None]
+        ay = np.empty_like(y)
+        for axis in (0, 1):
+            ay[:, axis] = np.bincount(sources, y[targets, axis], minlength=n)
+        ay += (tau / n) * y.sum(axis=0)
+        x = (x + ay * scale[:, None]) / 2
+        x -= np.outer(trivial, trivial @ x)
+        x, _ = np.linalg.qr(x)
+    # eigenvectors of the normalized matrix -> node coordinates
+    return x * scale[:, None]
+
+def fit_to_screen(G, pos):
+    # Center and scale so the median edge is NODE_SPACING units long
+    # (without edges: spread the nodes over about NODE_SPACING * sqrt(n))
+    if len(pos) == 0:
+        return pos
+    pos = pos - pos.mean(axis=0)
+    if G.number_of_edges():
+        length = np.median(np.sqrt(((pos[G.edge_u] - pos[G.edge_v]) ** 2).sum(axis=1)))
+        target = NODE_SPACING
+    else:
+        length = np.abs(pos).max()
+        target = NODE_SPACING * np.sqrt(len(pos)) / 2
+    return pos * (target / length) if length > 0 else pos
+
+def compute_layout(G, seed=0):
+    # (n, 2) screen coordinates for the nodes of a CSRGraph, in id order.
+    # The force layout starts from the spectral one, so it needs fewer rounds.
+    pos = spectral_layout(G, seed=seed)
+    if G.number_of_nodes() <= FORCE_MAX_NODES:
+        pos = force_layout(G, pos=pos, seed=seed)
+    return fit_to_screen(G, pos)
+
+def layout_positions(G, seed=0):
+    # {label: (x, y)} in the same form as a testcase "pos"
+    coords = np.round(compute_layout(G, seed), 1).tolist()
+    return {n: (x, y) for n, (x, y) in zip(G.labels, coords)}
+
+def estimate_layout_bytes(pos):
+    # dict slot + (x, y) tuple + two floats per node
+    return 200 * len(pos) + 256
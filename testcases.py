@@ -0,0 +1,381 @@
+# Built-in example graphs: nodes, weighted edges and fixed screen positions
+# (scaled by SCALE) for each testcase shown in the "Load Testcase" menu.
+#
+# The menu also lists, through the registry at the end of this file, graph
+# files found on disk ("File: ...") and the synthetic generators of
+# graph_generators ("Generator: ..."). Those are only read / built when a
+# testcase is loaded.
+import os
+
+from graph_generators import GENERATORS, generate
+from graph_io import graph_from_data, load_graph_file
+
+SCALE = 200 
+
+TESTCASES = {
+    "DFS/BFS: 3x3 Grid": {
+        "nodes": ["a", "b", "c", "d", "e", "f", "g", "h", "i"],
+        "edges": [
+            # แนวนอน
+            ("a", "b", 1), ("b", "c", 1),
+            ("h", "i", 1), ("i", "d", 1),
+            ("g", "f", 1), ("f", "e", 1),
+            # แนวตั้ง
+            ("a", "h", 1), ("h", "g", 1),
+            ("b", "i", 1), ("i", "f", 1),
+            ("c", "d", 1), ("d", "e", 1)
+        ],
+        "pos": {
+            # แถวบน
+            "a": (-2*SCALE, -2*SCALE), "b": (0, -2*SCALE), "c": (2*SCALE, -2*SCALE),
+            # แถวกลาง
+            "h": (-2*SCALE, 0),        "i": (0, 0),        "d": (2*SCALE, 0),
+            # แถวล่าง
+            "g": (-2*SCALE, 2*SCALE),  "f": (0, 2*SCALE),  "e": (2*SCALE, 2*SCALE)
+        }
+    },
+    "DFS/BFS: Hexagon/Grid": {
+        "nodes": ["a", "b", "c", "d", "e", "f", "g"],
+        "edges": [
+            ("a", "b", 1), ("a", "f", 1),
+            ("b", "c", 1), ("b", "g", 1), ("b", "f", 1),
+            ("c", "d", 1), ("c", "g", 1), ("c", "e", 1),
+            ("d", "e", 1),
+            ("e", "f", 1), ("e", "g", 1),
+            ("f", "g", 1)
+        ],
+        "pos": {
+            "a": (-2*SCALE, 0), "b": (-1*SCALE, -1*SCALE), "f": (-1*SCALE, 1*SCALE),
+            "g": (0, 0),
+            "c": (1*SCALE, -1*SCALE), "e": (1*SCALE, 1*SCALE), "d": (2*SCALE, 0)
+        }
+    },
+    "DFS/BFS: Pentagon Star": {
+        "nodes": ["A", "B", "C", "D", "E"],
+        "edges": [
+            ("A", "B", 1), ("A", "C", 1), ("A", "D", 1), ("A", "E", 1),
+            ("B", "C", 1), ("B", "D", 1), ("B", "E", 1),
+            ("C", "D", 1), ("C", "E", 1),
+            ("D", "E", 1)
+        ],
+        "pos": {
+            "A": (0, -2*SCALE), "B": (1.9*SCALE, -0.6*SCALE), "C": (1.2*SCALE, 1.5*SCALE),
+            "D": (-1.2*SCALE, 1.5*SCALE), "E": (-1.9*SCALE, -0.6*SCALE)
+        }
+    },
+    "DFS/BFS: Composite (Square + Rect)": {
+        "nodes": ["a", "b", "c", "d", "e", "f", "g", "h", "i", "j", "k"],
+        "edges": [
+            ("a", "b", 1), ("b", "c", 1), ("c", "d", 1), ("d", "a", 1), ("b", "d", 1), 
+            ("c", "e", 1), ("c", "g", 1), ("e", "f", 1), ("f", "g", 1), ("e", "g", 1), 
+            ("g", "j", 1), ("j", "i", 1), ("i", "h", 1), ("h", "g", 1), 
+            ("g", "k", 1), ("j", "k", 1), ("i", "k", 1), ("h", "k", 1)  
+        ],
+        "pos": {
+            "a": (-3*SCALE, -1*SCALE), "b": (-1*SCALE, -1*SCALE), 
+            "d": (-3*SCALE, 1*SCALE), "c": (-1*SCALE, 1*SCALE),
+            "e": (-1*SCALE, 3*SCALE), "f": (1*SCALE, 3*SCALE), "g": (1*SCALE, 1*SCALE),
+            "j": (1*SCALE, -1*SCALE), "i": (3*SCALE, -1*SCALE), "h": (3*SCALE, 1*SCALE),
+            "k": (2*SCALE, 0)
+        }
+    },
+      "DFS/BFS: Start A to K": {
+        "nodes": ["A", "B", "C", "D", "E", "F", "G", "H", "I", "J", "K"],
+        "edges": [
+            # --- แก้ไขเส้นเชื่อมให้ตรงภาพซ้ายเป๊ะๆ ---
+            ("A", "B", 3), ("A", "C", 4), ("A", "F", 5), # A ไป F (ไม่ใช่ D)
+            
+            ("B", "D", 6), ("B", "J", 8),
+            ("C", "F", 3),
+            
+            ("D", "E", 3), ("D", "G", 5), ("D", "H", 6),
+            ("E", "G", 4),
+            
+            ("F", "H", 8), ("F", "K", 7),
+            
+            ("G", "J", 8), ("G", "I", 2),
+            ("H", "I", 7),
+            
+            ("I", "J", 6),
+            ("J", "K", 8)
+        ],
+        "pos": {
+            # ยอด A (กลางบน)
+            "A": (0.5*SCALE, -3.0*SCALE),
+            
+            # ปีกซ้าย (B และ J เฉียงออกไปทางซ้าย)
+            "B": (-2.5*SCALE, -1.5*SCALE), 
+            "J": (-2.8*SCALE, 3.0*SCALE),
+            
+            # ปีกขวา (C, F, K เฉียงออกไปทางขวา)
+            "C": (3.0*SCALE, -1.5*SCALE),
+            "F": (3.5*SCALE, 0.5*SCALE),   # F ขยับออกขวาให้เส้น A->F เฉียงสวยๆ
+            "K": (3.5*SCALE, 3.0*SCALE),
+            
+            # โซนกลาง (D, E)
+            "D": (0.2*SCALE, -0.5*SCALE),  # D อยู่ต่ำกว่า B นิดหน่อย
+            "E": (-1.5*SCALE, 0.2*SCALE),  # E อยู่ซ้าย D
+            
+            # โซนล่างใน (G, H, I)
+            "G": (-0.8*SCALE, 1.8*SCALE),  # G อยู่ระหว่าง E กับ I
+            "H": (1.8*SCALE, 1.5*SCALE),   # H อยู่ขวา
+            "I": (0.8*SCALE, 2.5*SCALE)    # I อยู่เหนือเส้น J-K นิดนึง
+        }
+    },
+    "Dijkstra: Start a to e": {
+        "nodes": ["a", "b", "c", "d", "e"],
+        "edges": [
+            ("a", "b", 4), ("a", "c", 2),
+            ("b", "c", 1), ("b", "d", 5),
+            ("c", "d", 8), ("c", "e", 10),
+            ("d", "e", 2)
+        ],
+        "pos": {
+            "a": (-2*SCALE, 0),
+            "b": (0, 1*SCALE), "c": (0, -1*SCALE),
+            "d": (2*SCALE, 1*SCALE), "e": (2*SCALE, -1*SCALE)
+        }
+    },
+    "Dijkstra: Start a to d": {
+        "nodes": ["a", "b", "c", "d", "e"],
+        "edges": [
+            ("a", "b", 6), ("a", "c", 7), ("a", "e", 5),
+            ("b", "c", 2),
+            ("c", "e", 1), ("c", "d", 3),
+            ("e", "d", 2)
+        ],
+        "pos": {
+            "b": (0, -2.5*SCALE),          
+            "a": (-2.5*SCALE, 0),          
+            "c": (2.5*SCALE, 0),           
+            "e": (-1.5*SCALE, 2.5*SCALE),  
+            "d": (1.5*SCALE, 2.5*SCALE)    
+        }
+    },
+    "Dijkstra: Start a to f": {
+        "nodes": ["a", "b", "c", "d", "e", "f"],
+        "edges": [
+            ("a", "b", 10), ("a", "c", 5),
+            ("b", "c", 3), ("b", "d", 2),
+            ("c", "e", 9),
+            ("d", "e", 4), ("d", "f", 6),
+            ("e", "f", 7)
+        ],
+        "pos": {
+            "a": (-3*SCALE, 0),            
+            "b": (-1*SCALE, -2*SCALE),     
+            "c": (-1*SCALE, 2*SCALE),      
+            "d": (1*SCALE, -0.5*SCALE),    
+            "f": (3*SCALE, -0.5*SCALE),    
+            "e": (3*SCALE, 2*SCALE)        
+        }
+    },
+    "Dijkstra: Weighted Shortest Path": {
+        "nodes": ["S", "A", "B", "C", "D", "E", "F", "T"],
+        "edges": [
+            ("S", "A", 2), ("S", "B", 5), ("S", "C", 3),
+            ("A", "B", 2), ("A", "D", 6),
+            ("B", "D", 3), ("B", "E", 3), ("B", "C", 2), ("B", "F", 6),
+            ("C", "F", 7),
+            ("D", "E", 3), ("D", "T", 6),
+            ("E", "F", 3), ("E", "T", 2),
+            ("F", "T", 4)
+        ],
+        "pos": {
+            "S": (-3*SCALE, 0),
+            "A": (-1*SCALE, -2*SCALE), "B": (-1*SCALE, 0), "C": (-1*SCALE, 2*SCALE),
+            "D": (1*SCALE, -2*SCALE), "E": (1*SCALE, 0), "F": (1*SCALE, 2*SCALE),
+            "T": (3*SCALE, 0)
+        }
+    },
+    "MST: Hexagon & Center": {
+        "nodes": ["a", "b", "c", "d", "e", "f", "g"],
+        "edges": [
+            # รอบนอก
+            ("a", "b", 2), ("b", "c", 3), ("c", "d", 5),
+            ("d", "e", 4), ("e", "f", 2), ("f", "a", 3),
+            # เส้นผ่าศูนย์กลางแนวตั้ง
+            ("b", "f", 4), ("c", "e", 3),
+            # จุดศูนย์กลาง g
+            ("g", "b", 3), ("g", "c", 4), ("g", "e", 3), ("g", "f", 5)
+        ],
+        "pos": {
+            "g": (0, 0),                # กลาง
+            "a": (-3*SCALE, 0),         # ซ้ายสุด
+            "d": (3*SCALE, 0),          # ขวาสุด
+            "b": (-1.5*SCALE, -2*SCALE), # บนซ้าย
+            "c": (1.5*SCALE, -2*SCALE),  # บนขวา
+            "f": (-1.5*SCALE, 2*SCALE),  # ล่างซ้าย
+            "e": (1.5*SCALE, 2*SCALE)    # ล่างขวา
+        }
+    },
+    "MST: Pentagon Star": {
+        "nodes": ["a", "b", "c", "d", "e"],
+        "edges": [
+            # รอบนอก
+            ("a", "b", 3), ("b", "c", 5), ("c", "d", 5),
+            ("d", "e", 6), ("e", "a", 4),
+            # ดาวภายใน (Star)
+            ("b", "e", 8), ("b", "d", 11),
+            ("c", "a", 4), ("c", "e", 8),
+            ("d", "a", 9)
+        ],
+        "pos": {
+            # c: ยอดบนสุด (ในรูปเขียน b แต่แก้เป็น c)
+            "c": (0, -2.5*SCALE),           
+            
+            # b: ปีกซ้าย
+            "b": (-2.5*SCALE, -0.8*SCALE), 
+            
+            # d: ปีกขวา
+            "d": (2.5*SCALE, -0.8*SCALE),   
+            
+            # a: ล่างซ้าย
+            "a": (-1.5*SCALE, 2.5*SCALE),   
+            
+            # e: ล่างขวา
+            "e": (1.5*SCALE, 2.5*SCALE)     
+        }
+    },
+    "MST: Rectangle & Cross": {
+        "nodes": ["a", "b", "c", "d", "e"], # d คือ D ในรูป
+        "edges": [
+            # กรอบสี่เหลี่ยม
+            ("a", "b", 1), # บน
+            ("b", "c", 2), # ขวา
+            ("c", "d", 3), # ล่าง
+            ("d", "a", 2), # ซ้าย
+            # เส้นทแยงมุมเข้าหา e
+            ("a", "e", 3), 
+            ("b", "e", 2),
+            ("c", "e", 4),
+            ("d", "e", 1)
+        ],
+        "pos": {
+            "e": (0, 0),               # e: จุดกึ่งกลาง
+            
+            "a": (-2*SCALE, -1.5*SCALE), # a: บนซ้าย
+            "b": (2*SCALE, -1.5*SCALE),  # b: บนขวา
+            
+            "d": (-2*SCALE, 1.5*SCALE),  # D: ล่างซ้าย
+            "c": (2*SCALE, 1.5*SCALE)    # c: ล่างขวา
+        }
+    },
+    "MST: House Shape": {
+        "nodes": ["a", "b", "c", "d", "e"],
+        "edges": [
+            # หลังคา
+            ("a", "b", 1), ("a", "e", 2),
+            # คานขวาง
+            ("b", "e", 3),
+            # กำแพง/พื้น
+            ("b", "c", 3), ("c", "d", 3), ("d", "e", 1),
+            # เส้นกากบาทภายใน
+            ("b", "d", 4), 
+            ("c", "e", 2)
+        ],
+        "pos": {
+            "a": (0, -3*SCALE),          # a: ยอดหลังคา
+            
+            "b": (-2*SCALE, -1*SCALE),   # b: มุมหลังคาซ้าย
+            "e": (2*SCALE, -1*SCALE),    # e: มุมหลังคาขวา
+            
+            "c": (-2*SCALE, 2*SCALE),    # c: ฐานซ้าย
+            "d": (2*SCALE, 2*SCALE)      # d: ฐานขวา
+        }
+    },
+    "MST: Complex Bridge": {
+        "nodes": ["L", "A1", "A2", "A3", "B1", "B2", "B3", "C1", "C2", "C3", "R"],
+        "edges": [
+            # --- ซ้ายสุด (L) ---
+            ("L", "A1", 1), ("L", "A2", 2), ("L", "A3", 3),
+
+            # --- แถวตั้ง 1 (A) ---
+            ("A1", "A2", 3), ("A2", "A3", 5),
+
+            # --- เชื่อม A ไป B ---
+            ("A1", "B1", 4), # บน-บน
+            ("A2", "B2", 2), # กลาง-กลาง
+            ("A3", "B3", 5), # ล่าง-ล่าง
+            ("A1", "B2", 5), # ทแยงลง (บนไปกลาง)
+            ("A3", "B2", 4), # ทแยงขึ้น (ล่างไปกลาง)
+
+            # --- แถวตั้ง 2 (B) ---
+            ("B1", "B2", 3), ("B2", "B3", 3),
+
+            # --- เชื่อม B ไป C ---
+            ("B1", "C1", 4), # บน-บน
+            ("B2", "C2", 3), # กลาง-กลาง
+            ("B3", "C3", 4), # ล่าง-ล่าง
+            ("B2", "C1", 2), # ทแยงลง (บนไปกลาง)
+            
+            # >>> บรรทัดนี้ครับที่น่าจะหายไปในรอบก่อน <<<
+            ("B2", "C3", 2), # ทแยงลง (กลางไปล่าง) 
+            # >>>>>>>>>>>>>>>><<<<<<<<<<<<<<<<<
+
+            # --- แถวตั้ง 3 (C) ---
+            ("C1", "C2", 5), ("C2", "C3", 4),
+
+            # --- ขวาสุด (R) ---
+            ("C1", "R", 4), ("C2", "R", 3), ("C3", "R", 4)
+        ],
+        "pos": {
+            # ใช้สเกลกว้าง เพื่อให้เห็นเส้นชัดเจน
+            "L": (-4.5*SCALE, 0),
+
+            "A1": (-2.5*SCALE, -1.5*SCALE), "A2": (-2.5*SCALE, 0), "A3": (-2.5*SCALE, 1.5*SCALE),
+
+            "B1": (0, -1.5*SCALE),          "B2": (0, 0),          "B3": (0, 1.5*SCALE),
+
+            "C1": (2.5*SCALE, -1.5*SCALE),  "C2": (2.5*SCALE, 0),  "C3": (2.5*SCALE, 1.5*SCALE),
+
+            "R": (4.5*SCALE, 0)
+        }
+    }
+}
+
+# --------------------------
+# Registry: built-in testcases, graph files on disk and generators
+# --------------------------
+
+TESTCASE_DIR_ENV = "GRAPH_TESTCASE_DIR"  # folder of graph files (default: ./graphs)
+GRAPH_FILE_TYPES = (".json", ".txt", ".csv", ".tsv", ".edges")
+FILE_PREFIX = "File: "
+GENERATOR_PREFIX = "Generator: "
+
+def testcase_dir():
+    return os.environ.get(TESTCASE_DIR_ENV) or os.path.join(os.path.dirname(os.path.abspath(__file__)), "graphs")
+
+def graph_files(folder=None):
+    # {"File: name": path} for the graph files in the folder (only the
+    # directory listing is read, not the files)
+    try:
+        entries = sorted(os.scandir(folder or testcase_dir()), key=lambda e: e.name)
+    except OSError:
+        return {}
+    return {FILE_PREFIX + e.name: e.path for e in entries
+            if e.is_file() and e.name.lower().endswith(GRAPH_FILE_TYPES)}
+
+def testcase_names(folder=None):
+    return list(TESTCASES) + list(graph_files(folder)) + [GENERATOR_PREFIX + name for name in GENERATORS]
+
+def generator_params(name):
+    # Default parameters of a "Generator: ..." testcase (plus "seed"), or None
+    if not name.startswith(GENERATOR_PREFIX):
+        return None
+    return {**GENERATORS[name[len(GENERATOR_PREFIX):]][1], "seed": 0}
+
+def load_testcase(name, folder=None, **params):
+    # CSRGraph for a registry name. params only apply to generators.
+    if name in TESTCASES:
+        return graph_from_data(TESTCASES[name])
+    defaults = generator_params(name)
+    if defaults is not None:
+        unknown = set(params) - set(defaults)
+        if unknown:
+            raise ValueError(f"unknown parameter(s) for {name}: {', '.join(sorted(unknown))}")
+        return generate(name[len(GENERATOR_PREFIX):], **params)
+    path = graph_files(folder).get(name)
+    if path is None:
+        raise ValueError(f"unknown testcase: {name}")
+    return load_graph_file(path)
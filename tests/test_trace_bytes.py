@@ -0,0 +1,69 @@
+# estimate_trace_bytes() against tracemalloc, for traces covering every step
+# kind. The trace caches are bounded by this estimate, so it has to stay
+# within a small factor of the memory the steps really take.
+#
+#   python -m pytest tests
+import gc
+import os
+import sys
+import tracemalloc
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from graph_engine import estimate_trace_bytes, replay_log, start_algorithm
+from graph_generators import generate
+
+# algorithm -> step kinds its trace has to contain
+CASES = {
+    "DFS": {"node", "edge"},
+    "BFS (Level-Synchronous)": {"node", "level"},
+    "Dijkstra": {"node", "current", "check_edge", "update", "finished", "edge"},
+    "MST (Kruskal)": {"check_edge", "add_edge", "node", "skip"},
+    "MST (Prim, Eager)": {"node", "add_edge", "key_update"},
+}
+
+@pytest.fixture(scope="module")
+def grid():
+    return generate("Grid", rows=120, cols=120, seed=1)
+
+def traced_trace(G, algo):
+    # (finished trace, bytes still allocated by it)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        trace = start_algorithm(G, algo, G.labels[0], G.labels[-1])
+        trace.drain()
+        trace.result = None  # count the steps, not the result lists
+        gc.collect()
+        traced = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return trace, traced
+
+@pytest.mark.parametrize("algo", list(CASES))
+def test_estimate_matches_tracemalloc(grid, algo):
+    trace, traced = traced_trace(grid, algo)
+    kinds = {step[0] for step in trace}
+    assert CASES[algo] <= kinds
+    estimate = estimate_trace_bytes(trace)
+    assert traced / 2 <= estimate <= traced * 2, (algo, estimate, traced)
+
+@pytest.mark.parametrize("algo", ["BFS (Level-Synchronous)", "Dijkstra"])
+def test_estimate_counts_replay_log(grid, algo):
+    # The shared replay log (and its cursors) lives on the trace, so the
+    # cache has to count it once steps have been replayed
+    trace = start_algorithm(grid, algo, grid.labels[0], grid.labels[-1])
+    trace.drain()
+    trace.result = None
+    before = estimate_trace_bytes(trace)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        replay_log(trace).cursor("viewer").seek(len(trace) - 1)
+        gc.collect()
+        traced = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    added = estimate_trace_bytes(trace) - before
+    assert traced / 2 <= added <= traced * 2, (algo, added, traced)
@@ -0,0 +1,367 @@
+# Compact columnar step traces, saved as a folder of .npy files + meta.json.
+#
+# One row per step:
+#   types  int8   index into meta["types"] ("node", "check_edge", ...)
+#   a, b   int32  node ids of the step value: (a, -1) for a node, (a, b) for
+#                 an edge, (level index, -1) for a "level" step
+#   msg    int32  template id (>= 0) or -(raw message index) - 1
+# Messages are rebuilt on access from a template such as
+# "Check neighbor {b} via {a} (Weight: {0})" plus the numbers of that step
+# (arg_offsets / args). A message that does not round-trip exactly through
+# its template is kept verbatim in meta["raw_messages"].
+# Distance deltas live in their own table (delta_step, delta_node,
+# delta_value) and "level" steps in CSR-style level tables.
+# The graph itself is stored alongside, so a trace folder can be replayed
+# on its own.
+import json
+import os
+import re
+
+import numpy as np
+
+from graph_engine import CSRGraph, start_algorithm
+
+TRACE_FORMAT_VERSION = 1
+
+ARRAYS = (
+    "types", "a", "b", "msg", "arg_offsets", "args",
+    "delta_step", "delta_node", "delta_value",
+    "level_node_offsets", "level_nodes", "level_edge_offsets", "level_edges",
+    "graph_offsets", "graph_targets", "graph_weights",
+)
+
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?:e[+-]?\d+)?(?![\w.])")
+
+def _label_spans(text, words):
+    # (start, end, key) of each whole-word occurrence of the words, left to right
+    spans = []
+    for key, word in words:
+        if not word:
+            continue
+        i = text.find(word)
+        while i >= 0:
+            j = i + len(word)
+            before = text[i - 1] if i > 0 else " "
+            after = text[j] if j < len(text) else " "
+            if not (before.isalnum() or before in "_.") and not (after.isalnum() or after in "_."):
+                spans.append((i, j, key))
+            i = text.find(word, i + 1)
+    spans.sort(key=lambda span: (span[0], -span[1]))
+    kept, end = [], 0
+    for span in spans:
+        if span[0] >= end:
+            kept.append(span)
+            end = span[1]
+    return kept
+
+def encode_message(message, a_label=None, b_label=None):
+    # (template, kinds, args) or None if the message does not round-trip.
+    # kinds has one letter per numeric arg: "d" for int, "f" for float.
+    words = [("a", None if a_label is None else str(a_label)),
+             ("b", None if b_label is None else str(b_label))]
+    parts, args, kinds = [], [], []
+
+    def literal(text):
+        out, pos = [], 0
+        for m in _NUMBER.finditer(text):
+            out.append(text[pos:m.start()].replace("{", "{{").replace("}", "}}"))
+            token = m.group(0)
+            is_int = "." not in token and "e" not in token
+            args.append(float(int(token) if is_int else float(token)))
+            kinds.append("d" if is_int else "f")
+            out.append("{%d}" % (len(args) - 1))
+            pos = m.end()
+        out.append(text[pos:].replace("{", "{{").replace("}", "}}"))
+        return "".join(out)
+
+    pos = 0
+    for start, end, key in _label_spans(message, words):
+        parts.append(literal(message[pos:start]))
+        parts.append("{" + key + "}")
+        pos = end
+    parts.append(literal(message[pos:]))
+    template = "".join(parts)
+    kinds = "".join(kinds)
+    if render_message(template, kinds, args, a_label, b_label) != message:
+        return None
+    return template, kinds, args
+
+def render_message(template, kinds, args, a_label=None, b_label=None):
+    values = [int(v) if k == "d" else float(v) for k, v in zip(kinds, args)]
+    return template.format(*values, a=a_label, b=b_label)
+
+def _to_json_label(label):
+    return list(label) if isinstance(label, tuple) else label
+
+def _from_json(value):
+    # JSON has no tuples: nested lists (labels, edges) come back as tuples
+    return tuple(_from_json(v) for v in value) if isinstance(value, list) else value
+
+class CompactTrace:
+    # Read side of the format. Behaves like a finished LazyTrace: len(),
+    # steps[i] (decoded on access), complete / result / summary / elapsed /
+    # stats(), so StepReplayer and the UI can use either one.
+    def __init__(self, arrays, meta):
+        for name in ARRAYS:
+            setattr(self, name, arrays[name])
+        self.meta = meta
+        self.labels = [_from_json(label) for label in meta["labels"]]
+        self.type_names = meta["types"]
+        self.templates = meta["templates"]
+        self.raw_messages = meta["raw_messages"]
+        self.step_len = meta["step_len"]
+        self.delta_int = meta["delta_int"]
+        self.algorithm = meta.get("algorithm")
+        self.start = _from_json(meta.get("start"))
+        self.end = _from_json(meta.get("end"))
+        self.result = _from_json(meta.get("result"))
+        if isinstance(self.result, tuple):
+            # Top-level lists of the result (orders, paths, edge lists) stay lists
+            self.result = tuple(list(r) if isinstance(r, tuple) else r for r in self.result)
+        self.summary = meta.get("summary", "")
+        self.elapsed = meta.get("elapsed", 0.0)
+        self.complete = True
+        self.nbytes = sum(int(getattr(self, name).nbytes) for name in ARRAYS)
+        self._cached_block = None
+
+    # --- LazyTrace interface ---
+    def stats(self):
+        return dict(self.meta.get("stats") or {})
+
+    def __len__(self):
+        return len(self.types)
+
+    def ensure(self, count):
+        return len(self)
+
+    def drain(self):
+        return self
+
+    def start_background_fill(self, chunk=5000, on_complete=None):
+        if on_complete is not None:
+            on_complete()
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        block = self._block(i // self.BLOCK)
+        j = i - block["first"]
+        labels = self.labels
+        s_type = self.type_names[block["types"][j]]
+        a, b = block["a"][j], block["b"][j]
+        a_label = b_label = None
+        if s_type == "level":
+            value = self.level(a)
+        elif b >= 0:
+            a_label, b_label = labels[a], labels[b]
+            value = (a_label, b_label)
+        else:
+            value = a_label = labels[a] if a >= 0 else None
+
+        m = block["msg"][j]
+        if m < 0:
+            message = self.raw_messages[-m - 1]
+        else:
+            template, kinds = self.templates[m]
+            lo, hi = block["arg_offsets"][j], block["arg_offsets"][j + 1]
+            message = render_message(template, kinds, block["args"][lo:hi], a_label, b_label)
+
+        step = (s_type, value, message)
+        if self.step_len > 3:
+            lo, hi = block["delta_offsets"][j], block["delta_offsets"][j + 1]
+            step += ({labels[n]: d for n, d in zip(block["delta_node"][lo:hi], block["delta_value"][lo:hi])},)
+        return step
+
+    BLOCK = 4096  # steps decoded together into plain lists
+
+    def _block(self, k):
+        # Columns of steps [k * BLOCK, (k + 1) * BLOCK) as Python lists; the
+        # last block is kept, so sequential reads (replay, playback) are cheap.
+        if self._cached_block is not None and self._cached_block["k"] == k:
+            return self._cached_block
+        first = k * self.BLOCK
+        last = min(first + self.BLOCK, len(self))
+        arg_offsets = np.asarray(self.arg_offsets[first:last + 1])
+        block = {
+            "k": k,
+            "first": first,
+            "types": self.types[first:last].tolist(),
+            "a": self.a[first:last].tolist(),
+            "b": self.b[first:last].tolist(),
+            "msg": self.msg[first:last].tolist(),
+            "arg_offsets": (arg_offsets - arg_offsets[0]).tolist(),
+            "args": self.args[arg_offsets[0]:arg_offsets[-1]].tolist(),
+        }
+        if self.step_len > 3:
+            bounds = np.searchsorted(self.delta_step, np.arange(first, last + 1))
+            values = self.delta_value[bounds[0]:bounds[-1]].tolist()
+            if self.delta_int:
+                values = [v if v == float("inf") else int(v) for v in values]
+            block["delta_offsets"] = (bounds - bounds[0]).tolist()
+            block["delta_node"] = self.delta_node[bounds[0]:bounds[-1]].tolist()
+            block["delta_value"] = values
+        self._cached_block = block
+        return block
+
+    def level(self, k):
+        labels = self.labels
+        nodes = self.level_nodes[self.level_node_offsets[k]:self.level_node_offsets[k + 1]].tolist()
+        edges = self.level_edges[self.level_edge_offsets[k]:self.level_edge_offsets[k + 1]].tolist()
+        return tuple(labels[n] for n in nodes), tuple((labels[u], labels[v]) for u, v in edges)
+
+    def graph(self):
+        # The CSRGraph the trace was recorded on (labels, adjacency, positions)
+        G = CSRGraph(self.labels, np.asarray(self.graph_offsets), np.asarray(self.graph_targets),
+                     np.asarray(self.graph_weights))
+        coords = self.meta.get("coords")
+        if coords is not None:
+            G.coords = np.array(coords, dtype=np.float64).reshape(-1, 2)
+        return G
+
+    # --- Encoding / files ---
+    @classmethod
+    def from_steps(cls, steps, G, algorithm=None, start=None, end=None, result=None, summary="", elapsed=0.0, stats=None):
+        index = G.index
+        n = len(steps)
+        types = np.zeros(n, dtype=np.int8)
+        col_a = np.full(n, -1, dtype=np.int32)
+        col_b = np.full(n, -1, dtype=np.int32)
+        msg = np.zeros(n, dtype=np.int32)
+        arg_offsets = np.zeros(n + 1, dtype=np.int64)
+        args = []
+        type_code, type_names = {}, []
+        template_code, templates, raw_messages = {}, [], []
+        delta_step, delta_node, delta_value = [], [], []
+        delta_int = True
+        level_node_offsets, level_nodes = [0], []
+        level_edge_offsets, level_edges = [0], []
+        step_len = 3
+
+        for i, step in enumerate(steps):
+            s_type, value = step[0], step[1]
+            if s_type not in type_code:
+                if len(type_names) == 127:
+                    raise ValueError("too many step types for an int8 code")
+                type_code[s_type] = len(type_names)
+                type_names.append(s_type)
+            types[i] = type_code[s_type]
+
+            a_label = b_label = None
+            if s_type == "level":
+                col_a[i] = len(level_node_offsets) - 1
+                level_nodes.extend(index[x] for x in value[0])
+                level_edges.extend((index[u], index[v]) for u, v in value[1])
+                level_node_offsets.append(len(level_nodes))
+                level_edge_offsets.append(len(level_edges))
+            elif value is None:
+                pass
+            elif value in index:
+                col_a[i] = index[value]
+                a_label = value
+            elif isinstance(value, tuple) and len(value) == 2 and value[0] in index and value[1] in index:
+                col_a[i], col_b[i] = index[value[0]], index[value[1]]
+                a_label, b_label = value
+            else:
+                raise ValueError(f"step {i}: value {value!r} is not a node or an edge of the graph")
+
+            message = step[2] if len(step) > 2 else ""
+            encoded = encode_message(message, a_label, b_label)
+            if encoded is None:
+                raw_messages.append(message)
+                msg[i] = -len(raw_messages)
+            else:
+                template, kinds, values = encoded
+                key = (template, kinds)
+                if key not in template_code:
+                    template_code[key] = len(templates)
+                    templates.append([template, kinds])
+                msg[i] = template_code[key]
+                args.extend(values)
+            arg_offsets[i + 1] = len(args)
+
+            if len(step) > 3:
+                step_len = 4
+                for node, d in step[3].items():
+                    delta_step.append(i)
+                    delta_node.append(index[node])
+                    delta_value.append(float(d))
+                    if not isinstance(d, int) and d != float("inf"):
+                        delta_int = False
+
+        arrays = {
+            "types": types, "a": col_a, "b": col_b, "msg": msg,
+            "arg_offsets": arg_offsets, "args": np.array(args, dtype=np.float64),
+            "delta_step": np.array(delta_step, dtype=np.int32),
+            "delta_node": np.array(delta_node, dtype=np.int32),
+            "delta_value": np.array(delta_value, dtype=np.float64),
+            "level_node_offsets": np.array(level_node_offsets, dtype=np.int64),
+            "level_nodes": np.array(level_nodes, dtype=np.int32),
+            "level_edge_offsets": np.array(level_edge_offsets, dtype=np.int64),
+            "level_edges": np.array(level_edges, dtype=np.int32).reshape(-1, 2),
+            "graph_offsets": G.offsets, "graph_targets": G.targets, "graph_weights": G.weights,
+        }
+        meta = {
+            "version": TRACE_FORMAT_VERSION,
+            "graph": G.fingerprint(),
+            "labels": [_to_json_label(label) for label in G.labels],
+            "coords": None if G.coords is None else G.coords.tolist(),
+            "types": type_names,
+            "templates": templates,
+            "raw_messages": raw_messages,
+            "step_len": step_len,
+            "delta_int": delta_int,
+            "algorithm": algorithm,
+            "start": _to_json_label(start),
+            "end": _to_json_label(end),
+            "result": result,
+            "summary": summary,
+            "elapsed": elapsed,
+            "stats": stats or {},
+        }
+        return cls(arrays, meta)
+
+    @classmethod
+    def from_trace(cls, trace, G, algorithm=None, start=None, end=None):
+        # Encode a LazyTrace (finishing it first)
+        trace.drain()
+        return cls.from_steps(trace, G, algorithm, start, end, trace.result, trace.summary, trace.elapsed,
+                              trace.stats())
+
+    def columns(self):
+        # (arrays, meta) without the graph columns: what a worker process
+        # sends back (see record_trace); the receiver adds its own graph
+        return {name: getattr(self, name) for name in ARRAYS if not name.startswith("graph_")}, self.meta
+
+    @classmethod
+    def from_columns(cls, arrays, meta, G):
+        return cls({**arrays, "graph_offsets": G.offsets, "graph_targets": G.targets,
+                    "graph_weights": G.weights}, meta)
+
+    def save(self, path):
+        os.makedirs(path, exist_ok=True)
+        for name in ARRAYS:
+            np.save(os.path.join(path, name + ".npy"), np.asarray(getattr(self, name)))
+        with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(self.meta, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        # mmap=True maps the columns read-only instead of reading them in
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != TRACE_FORMAT_VERSION:
+            raise ValueError(f"unsupported trace format version: {meta.get('version')}")
+        mode = "r" if mmap else None
+        arrays = {name: np.load(os.path.join(path, name + ".npy"), mmap_mode=mode) for name in ARRAYS}
+        return cls(arrays, meta)
+
+def record_trace(labels, offsets, targets, weights, coords, algorithm, start, end):
+    # Run one algorithm to the end on the graph given by its arrays and return
+    # CompactTrace.columns(). Module level, so a process pool can run it: only
+    # the graph arrays go to the worker and only the trace columns come back.
+    G = CSRGraph(labels, offsets, targets, weights)
+    G.coords = coords
+    trace = CompactTrace.from_trace(start_algorithm(G, algorithm, start, end), G, algorithm, start, end)
+    return trace.columns()